@@ -5,6 +5,8 @@ import os
 import sys
 import subprocess
 import shutil
+import statistics
+import time
 
 print("=" * 60)
 print("  Hash Table Simulator - Build Script")
@@ -27,24 +29,55 @@ if os.path.exists("dist"):
     shutil.rmtree("dist")
     print("✅ Cleaned dist directory")
 
-# Build GUI version
+# Optional packages the executables work without. Bundling them (NumPy,
+# used by the heatmap when installed) only makes every launch slower.
+EXCLUDES = ["numpy"]
+exclude_args = [arg for module in EXCLUDES for arg in ("--exclude-module", module)]
+
+GUI_EXE = os.path.join("dist", "HashTableSimulator", "HashTableSimulator.exe" if os.name == "nt" else "HashTableSimulator")
+COLD_START_RUNS = 5
+
+
+def measure_cold_start(exe, runs=COLD_START_RUNS):
+    """Launch exe --startup-check runs times; return the wall-clock seconds of each launch."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([exe, "--startup-check"], check=True, timeout=60)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# Build GUI version. One folder instead of one file: a one-file executable
+# unpacks Python, Tcl/Tk and every module to a temp directory on each launch.
 print("\n📦 Building GUI version...")
 gui_cmd = [
     "pyinstaller",
-    "--onefile",
+    "--onedir",
     "--windowed",
     "--name", "HashTableSimulator",
     "--add-data", "utils.py;.",
     "--add-data", "hash_table.py;.",
+    *exclude_args,
     "gui_simulator.py"
 ]
 
 try:
     subprocess.check_call(gui_cmd)
-    print("✅ GUI executable created: dist/HashTableSimulator.exe")
+    print(f"✅ GUI executable created: {GUI_EXE}")
 except Exception as e:
     print(f"❌ Error building GUI: {e}")
 
+# Cold start: from launch until every panel is built (needs a display)
+if os.path.exists(GUI_EXE):
+    print(f"\n⏱️  Measuring GUI cold start ({COLD_START_RUNS} launches)...")
+    try:
+        times = measure_cold_start(GUI_EXE)
+        print(f"✅ Cold start: median {statistics.median(times) * 1000:.0f} ms, "
+              f"first launch {times[0] * 1000:.0f} ms")
+    except Exception as e:
+        print(f"⚠️  Could not measure cold start: {e}")
+
 # Build Console version
 print("\n📦 Building Console version...")
 console_cmd = [
@@ -53,6 +86,7 @@ console_cmd = [
     "--name", "HashTableSimulator-Console",
     "--add-data", "utils.py;.",
     "--add-data", "hash_table.py;.",
+    *exclude_args,
     "console_simulator.py"
 ]
 
@@ -68,8 +102,11 @@ dist_folder = "dist/HashTableSimulator-v1.0"
 os.makedirs(dist_folder, exist_ok=True)
 
 # Copy files
+if os.path.isdir("dist/HashTableSimulator"):
+    shutil.copytree("dist/HashTableSimulator", os.path.join(dist_folder, "HashTableSimulator"), dirs_exist_ok=True)
+    print("✅ Copied dist/HashTableSimulator/")
+
 files_to_copy = [
-    "dist/HashTableSimulator.exe",
     "dist/HashTableSimulator-Console.exe",
     "README.md",
     "QUICKSTART.md"
@@ -17,13 +17,303 @@ Date: October 25, 2025
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
+import os
+import queue
+import sys
+import threading
 import time
+from collections import deque
 from typing import Optional
 from hash_table import HashTable
+from renderer import TableRenderer
+from replay import Timeline, PROBE, COLLISION, PLACED
 from utils import normalize_key, hash1 as h1_fn, hash2 as h2_fn
 
 
+class AnimationScheduler:
+    """
+    Plays GUI animations from the Tk event loop instead of blocking it.
+    
+    An animation is a generator: each step updates widgets and then yields how
+    many milliseconds to wait before the next step. Waits are root.after()
+    callbacks, so the window keeps handling input during an animation. Steps
+    yielding 0 run back to back in one callback and are painted together.
+    Queued animations play one after another.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self._queue = deque()   # (key, generator) waiting to play
+        self._current = None    # (key, generator) playing
+        self._after_id = None
+        self._ticking = False
+        self._skipping = False
+    
+    @property
+    def busy(self):
+        """True while an animation is playing or queued."""
+        return self._current is not None or bool(self._queue)
+    
+    def play(self, animation, key=None):
+        """
+        Queue an animation.
+        
+        Args:
+            animation: Generator yielding millisecond delays
+            key: Optional name; a queued or playing animation with the same key
+                is dropped first, so repeated requests coalesce into the latest
+        """
+        if key is not None:
+            self._discard(key)
+        self._queue.append((key, animation))
+        self._wake()
+    
+    def then(self, callback):
+        """Queue a plain call to run once the animations queued before it are done."""
+        def call():
+            callback()
+            yield 0
+        self.play(call())
+    
+    def skip(self):
+        """Run every queued animation to its end now, without waiting."""
+        if not self.busy:
+            return
+        self._skipping = True
+        if not self._ticking:
+            self._cancel_after()
+            self._tick()
+    
+    def cancel(self):
+        """Stop the playing animation and drop the queued ones."""
+        self._cancel_after()
+        pending = list(self._queue)
+        if self._current is not None:
+            pending.insert(0, self._current)
+        self._queue.clear()
+        self._current = None
+        self._skipping = False
+        for _, animation in pending:
+            animation.close()
+    
+    def _discard(self, key):
+        for entry in [entry for entry in self._queue if entry[0] == key]:
+            self._queue.remove(entry)
+            entry[1].close()
+        if self._current is not None and self._current[0] == key:
+            current, self._current = self._current, None
+            current[1].close()
+            if not self._ticking:
+                self._cancel_after()
+    
+    def _cancel_after(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+    
+    def _wake(self):
+        if self._after_id is None and not self._ticking:
+            self._after_id = self.root.after_idle(self._tick)
+    
+    def _tick(self):
+        self._after_id = None
+        self._ticking = True
+        try:
+            while True:
+                if self._current is None:
+                    if not self._queue:
+                        self._skipping = False
+                        return
+                    self._current = self._queue.popleft()
+                try:
+                    delay = next(self._current[1])
+                except StopIteration:
+                    self._current = None
+                    continue
+                except Exception:
+                    self._current = None
+                    raise
+                if delay and not self._skipping:
+                    self._after_id = self.root.after(delay, self._tick)
+                    return
+        finally:
+            self._ticking = False
+            if self._after_id is None and self.busy:
+                # An animation failed; keep the rest of the queue going
+                self._after_id = self.root.after_idle(self._tick)
+
+
+class BackgroundWorker:
+    """
+    Runs long table operations (bulk inserts, resize, file import) off the Tk
+    thread, one job at a time.
+    
+    The job runs on a daemon thread and reports through a thread-safe queue
+    that the Tk thread drains every POLL_MS via root.after(), so callbacks -
+    and with them all widget updates - run on the Tk thread only.
+    """
+    
+    POLL_MS = 50
+    
+    def __init__(self, root):
+        self.root = root
+        self._events = queue.Queue()
+        self._callbacks = None  # (on_done, on_progress, on_error) of the running job
+    
+    @property
+    def busy(self):
+        """True from submit() until the job's result has been delivered."""
+        return self._callbacks is not None
+    
+    def submit(self, job, on_done, on_progress=None, on_error=None):
+        """
+        Start job(progress) on a worker thread.
+        
+        The job may call progress(done, total) from the worker thread. On the
+        Tk thread, on_progress(done, total) then runs with the latest values,
+        and finally on_done(result) or on_error(exception).
+        
+        Returns:
+            bool: False (and nothing is started) while another job is running
+        """
+        if self.busy:
+            return False
+        self._callbacks = (on_done, on_progress, on_error)
+        threading.Thread(target=self._run, args=(job,), name="gui-worker", daemon=True).start()
+        self.root.after(self.POLL_MS, self._poll)
+        return True
+    
+    def _run(self, job):
+        def progress(done, total):
+            self._events.put(("progress", (done, total)))
+        try:
+            self._events.put(("done", job(progress)))
+        except Exception as error:
+            self._events.put(("error", error))
+    
+    def _poll(self):
+        on_done, on_progress, on_error = self._callbacks
+        latest = None
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                # Only the newest progress is worth showing
+                latest = value
+                continue
+            self._callbacks = None
+            if kind == "done":
+                on_done(value)
+            elif on_error is not None:
+                on_error(value)
+            else:
+                raise value
+            return
+        if latest is not None and on_progress is not None:
+            on_progress(*latest)
+        self.root.after(self.POLL_MS, self._poll)
+
+
+class TextLogger:
+    """
+    Buffered, bounded writer for a Tk Text log panel.
+    
+    write() only appends to a list; one root.after() callback per FLUSH_MS
+    inserts everything written since the last flush with a single insert()
+    and see(). The widget keeps at most max_lines lines: once it grows
+    TRIM_SLACK lines past that, the oldest lines are deleted in one go, so
+    trimming stays cheap per message. With spill_path set, every message is
+    also appended to that file, which keeps the full history.
+    
+    text may be None until the panel is built (attach()); messages written
+    before then are kept and shown once it is attached.
+    """
+    
+    FLUSH_MS = 16
+    TRIM_SLACK = 500
+    
+    def __init__(self, root, text, max_lines=5_000, spill_path=None):
+        self.root = root
+        self.text = text
+        self.max_lines = max_lines
+        self._pending = []
+        self._flush_id = None
+        self._lines = 0
+        self._spill = open(spill_path, "a", encoding="utf-8") if spill_path else None
+        if text is not None:
+            self.attach(text)
+    
+    def attach(self, text):
+        """Start writing to text, showing anything written so far."""
+        self.text = text
+        # Lines in the widget, counted as written rather than asked of Tk
+        self._lines = int(text.index("end-1c").split(".")[0])
+        if self._pending:
+            self.flush()
+    
+    def write(self, message):
+        """Queue message (newlines included) for the next flush."""
+        self._pending.append(message)
+        if self._spill is not None:
+            self._spill.write(message)
+        if self._flush_id is None and self.text is not None:
+            self._flush_id = self.root.after(self.FLUSH_MS, self.flush)
+    
+    def flush(self):
+        """Insert queued messages now and trim the oldest lines if needed."""
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        if not self._pending or self.text is None:
+            return
+        chunk = "".join(self._pending)
+        self._pending.clear()
+        self.text.insert(tk.END, chunk)
+        self._lines += chunk.count("\n")
+        if self._lines > self.max_lines + self.TRIM_SLACK:
+            excess = self._lines - self.max_lines
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._lines -= excess
+        self.text.see(tk.END)
+        if self._spill is not None:
+            self._spill.flush()
+    
+    def clear(self):
+        """Empty the panel (the spill file is kept)."""
+        if self._flush_id is not None:
+            self.root.after_cancel(self._flush_id)
+            self._flush_id = None
+        self._pending.clear()
+        if self.text is not None:
+            self.text.delete("1.0", tk.END)
+        self._lines = 1
+    
+    def contents(self):
+        """Text currently in the panel, including messages not yet flushed."""
+        self.flush()
+        if self.text is None:
+            return "".join(self._pending)
+        return self.text.get("1.0", tk.END)
+    
+    def close(self):
+        """Flush and close the spill file."""
+        self.flush()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+def parse_key(text):
+    """Convert a key typed or read as text to int where possible."""
+    try:
+        return int(text)
+    except ValueError:
+        return text  # Keep as string
+
+
 class HashTableGUI:
     """
     Graphical User Interface for Hash Table Simulation.
@@ -32,14 +322,35 @@ class HashTableGUI:
     with support for multiple collision handling strategies.
     """
     
-    # Color scheme
-    COLOR_EMPTY = "#FFFFFF"
-    COLOR_FILLED = "#4CAF50"
-    COLOR_COLLISION = "#FF9800"
+    # Color scheme (bucket colors come from the bucket view renderer)
+    COLOR_EMPTY = TableRenderer.COLOR_EMPTY
+    COLOR_FILLED = TableRenderer.COLOR_FILLED
+    COLOR_COLLISION = TableRenderer.COLOR_COLLISION
     COLOR_HIGHLIGHT = "#FF5722"
     COLOR_SEARCH_FOUND = "#2196F3"
-    COLOR_BORDER = "#333333"
-    COLOR_TEXT = "#000000"
+    COLOR_BORDER = TableRenderer.COLOR_BORDER
+    COLOR_TEXT = TableRenderer.COLOR_TEXT
+    
+    MAX_TABLE_SIZE = 1_000_000
+    # Inserting more keys than this at once skips the step-by-step animation
+    ANIMATE_MAX_KEYS = 10
+    # Bulk inserts on the worker report progress every this many keys
+    PROGRESS_EVERY = 5_000
+    # Show All Keys lists at most this many keys
+    SHOW_KEYS_MAX = 200
+    # Canvas views: detailed buckets, or a heatmap of one metric (see heatmap.py)
+    VIEW_MODES = {
+        "Buckets": None,
+        "Heatmap: occupancy": "occupancy",
+        "Heatmap: chain length": "chain",
+        "Heatmap: probe distance": "probe",
+    }
+    # Heatmaps of tables this large are rendered on the worker thread
+    HEATMAP_WORKER_MIN = 200_000
+    # Lines kept in the Collision Steps panel (oldest are dropped)
+    LOG_MAX_LINES = 5_000
+    # Stepper Auto Run speeds: multiplier of the animation delay (None: jump to the end)
+    REPLAY_SPEEDS = {"0.5x": 0.5, "1x": 1, "2x": 2, "4x": 4, "8x": 8, "Instant": None}
     
     def __init__(self, root):
         """
@@ -57,6 +368,32 @@ class HashTableGUI:
         self.hash_table: Optional[HashTable] = None
         self.animation_delay = 300  # milliseconds
         
+        # Bucket view redraws on scroll are batched (on_canvas_scrolled)
+        self._viewport_pending = None
+        self._heatmap = None
+        # What each stats panel widget currently shows (update_stats_visualization)
+        self._stats_shown = {}
+        
+        # Step-by-step animations run from Tk callbacks (see AnimationScheduler)
+        self.animator = AnimationScheduler(root)
+        # Bulk loads and rehashing run on a worker thread (see BackgroundWorker)
+        self.worker = BackgroundWorker(root)
+        # Collision Steps output; set HASHTABLE_GUI_LOG to a file path to keep
+        # the full history there. The panel is attached once it is built.
+        self.logger = TextLogger(
+            root,
+            None,
+            max_lines=self.LOG_MAX_LINES,
+            spill_path=os.environ.get("HASHTABLE_GUI_LOG")
+        )
+        # Recorded steps of the last insert (see step_once / seek_timeline)
+        self.timeline = Timeline()
+        
+        # The pseudocode, steps and stats panels are built after the first
+        # frame is shown (or earlier, on first use): see build_secondary_panels
+        self.secondary_panels_ready = False
+        self._startup_callbacks = []
+        
         # Setup GUI components
         self.setup_ui()
         
@@ -89,12 +426,44 @@ class HashTableGUI:
         # Canvas for visualization (Left) — show table below control panel like before
         self.setup_canvas(content_frame)
 
-        # Right side: Pseudocode and Collision Steps panels
-        self.setup_right_panels(content_frame)
+        # Right side: Pseudocode and Collision Steps panels, filled in later
+        self.right_frame = tk.Frame(content_frame, bg="#fdfdfd")
+        self.right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=5)
+        self.root.bind("<Map>", self.on_first_map, add="+")
         
         # Status bar (Bottom)
         self.setup_status_bar(main_container)
     
+    def on_first_map(self, event):
+        """Build the secondary panels once the window is on screen."""
+        if event.widget is self.root and not self.secondary_panels_ready:
+            # Idle callbacks queued before this one paint the first frame
+            self.root.after_idle(self.build_secondary_panels)
+    
+    def build_secondary_panels(self):
+        """
+        Build the pseudocode, steps and statistics panels (once).
+        
+        Called after the first frame is shown, and by anything that needs the
+        panels before then, so startup only waits for the control panel and
+        the canvas.
+        """
+        if self.secondary_panels_ready:
+            return
+        self.secondary_panels_ready = True
+        self.setup_right_panels(self.right_frame)
+        self.update_stats_visualization()
+        for callback in self._startup_callbacks:
+            self.root.after_idle(callback)
+        self._startup_callbacks.clear()
+    
+    def after_startup(self, callback):
+        """Run callback once every panel has been built."""
+        if self.secondary_panels_ready:
+            self.root.after_idle(callback)
+        else:
+            self._startup_callbacks.append(callback)
+    
     def setup_control_panel(self, parent):
         """Set up the control panel with input fields and buttons."""
         control_frame = tk.LabelFrame(
@@ -224,6 +593,18 @@ class HashTableGUI:
             pady=5
         ).pack(side=tk.LEFT, padx=5)
         
+        tk.Button(
+            button_frame,
+            text="📂 Import Keys",
+            command=self.import_keys,
+            bg="#00796B",
+            fg="white",
+            font=("Arial", 10, "bold"),
+            width=12,
+            padx=5,
+            pady=5
+        ).pack(side=tk.LEFT, padx=5)
+        
         # Row 3: Advanced operations
         adv_frame = tk.Frame(left_controls, bg="#ffffff")
         adv_frame.pack(fill=tk.X, pady=2)
@@ -302,6 +683,29 @@ class HashTableGUI:
         )
         canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
         
+        # View selector: detailed buckets or a heatmap of the whole table
+        toolbar = tk.Frame(canvas_frame, bg="#ffffff")
+        toolbar.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(toolbar, text="View:", font=("Arial", 10), bg="#ffffff").pack(side=tk.LEFT, padx=5)
+        self.view_var = tk.StringVar(value="Buckets")
+        view_combo = ttk.Combobox(
+            toolbar,
+            textvariable=self.view_var,
+            values=list(self.VIEW_MODES),
+            state="readonly",
+            width=24,
+            font=("Arial", 10)
+        )
+        view_combo.pack(side=tk.LEFT, padx=5)
+        view_combo.bind("<<ComboboxSelected>>", lambda e: self.draw_hash_table())
+        tk.Label(
+            toolbar,
+            text="(click the heatmap to zoom into a bucket)",
+            font=("Arial", 8, "italic"),
+            bg="#ffffff",
+            fg="#666666"
+        ).pack(side=tk.LEFT, padx=5)
+        
         # Canvas with scrollbar
         canvas_container = tk.Frame(canvas_frame, bg="#ffffff")
         canvas_container.pack(fill=tk.BOTH, expand=True)
@@ -312,16 +716,30 @@ class HashTableGUI:
             highlightthickness=0
         )
         
-        scrollbar = tk.Scrollbar(canvas_container, orient=tk.VERTICAL, command=self.canvas.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas_scrollbar = tk.Scrollbar(canvas_container, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Only buckets near the visible area exist as canvas items, so any
+        # change of view (scrollbar, wheel, resize) renders the new viewport
+        self.canvas.configure(yscrollcommand=self.on_canvas_scrolled)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<MouseWheel>", lambda e: self.canvas.yview_scroll(-1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+        
+        # The bucket view is drawn by a TableRenderer with the canvas as its backend
+        self.renderer = TableRenderer(self.canvas)
+    
+    def on_canvas_scrolled(self, first, last):
+        """Canvas yscrollcommand: move the scrollbar and re-render the viewport once idle."""
+        self.canvas_scrollbar.set(first, last)
+        if self._viewport_pending is None:
+            self._viewport_pending = self.root.after_idle(self.render_viewport)
     
-    def setup_right_panels(self, parent):
+    def setup_right_panels(self, right_frame):
         """Set up pseudocode panel and collision steps panel."""
-        right_frame = tk.Frame(parent, bg="#fdfdfd")
-        right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=5)
+        from tkinter import scrolledtext
 
         # Pseudocode Panel
         pseudo_frame = tk.LabelFrame(
@@ -362,6 +780,34 @@ class HashTableGUI:
         self.auto_btn.pack(side=tk.LEFT, padx=3)
         tk.Button(controls, text="Reset Steps", command=self.clear_steps, bg="#FF9800", fg="white", width=12, font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
         tk.Button(controls, text="Copy Log", command=self.copy_steps, bg="#607D8B", fg="white", width=10, font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
+        tk.Button(controls, text="Skip", command=self.skip_animations, bg="#795548", fg="white", width=6, font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
+        tk.Button(controls, text="Cancel", command=self.cancel_animations, bg="#f44336", fg="white", width=6, font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
+
+        # Replay of the last recorded insert: step back, scrub, speed, export
+        replay = tk.Frame(pseudo_frame, bg="#ffffff")
+        replay.pack(fill=tk.X, pady=(6, 0))
+        tk.Button(replay, text="◀ Back", command=self.step_back, bg="#4CAF50", fg="white", width=7, font=("Arial", 9, "bold")).pack(side=tk.LEFT, padx=3)
+        self.timeline_scale = tk.Scale(
+            replay,
+            from_=0,
+            to=0,
+            orient=tk.HORIZONTAL,
+            showvalue=True,
+            length=160,
+            bg="#ffffff",
+            highlightthickness=0,
+            command=self.on_timeline_scrub
+        )
+        self.timeline_scale.pack(side=tk.LEFT, padx=3, fill=tk.X, expand=True)
+        self.replay_speed_var = tk.StringVar(value="1x")
+        ttk.Combobox(
+            replay,
+            textvariable=self.replay_speed_var,
+            values=list(self.REPLAY_SPEEDS),
+            state="readonly",
+            width=7
+        ).pack(side=tk.LEFT, padx=3)
+        tk.Button(replay, text="Export", command=self.export_timeline, bg="#607D8B", fg="white", width=7, font=("Arial", 9)).pack(side=tk.LEFT, padx=3)
 
         # Collision Steps Panel
         steps_frame = tk.LabelFrame(
@@ -390,11 +836,17 @@ class HashTableGUI:
         self.steps_text.insert(tk.END, "• Insert a key to see step-by-step execution\n")
         self.steps_text.insert(tk.END, "• Use 'Step' button to advance manually\n")
         self.steps_text.insert(tk.END, "• Use 'Auto Run' for automatic stepping\n")
+        self.steps_text.insert(tk.END, "• Use '◀ Back' or drag the timeline to replay\n")
         self.steps_text.insert(tk.END, "• Adjust animation speed with the slider above\n")
+        
+        # Everything logged so far (and from now on) goes through the logger
+        self.logger.attach(self.steps_text)
 
-        # Internal step state
-        self._current_steps = []
-        self._current_step_index = 0
+        # Live statistics under the steps log
+        self.setup_stats_panel(right_frame)
+        
+        # Steps may have been recorded before the panel existed
+        self.timeline_scale.configure(to=len(self.timeline))
     
     def setup_status_bar(self, parent):
         """Set up the status bar."""
@@ -422,6 +874,9 @@ class HashTableGUI:
             padx=10
         )
         self.info_label.pack(side=tk.RIGHT)
+        
+        # Shown only while a background job runs
+        self.progress_bar = ttk.Progressbar(status_frame, length=160, mode="determinate")
 
     def draw_inline_header(self):
         """Draw the compact header summary inside the inline canvas (in Control Panel)."""
@@ -484,54 +939,83 @@ class HashTableGUI:
             highlightbackground="#e0e0e0"
         )
         self.stats_canvas.pack(fill=tk.BOTH, expand=True)
-        
-        # Initialize stats display
-        self.update_stats_visualization()
     
     def update_stats_visualization(self):
-        """Draw creative statistics visualization with gauges and charts."""
-        self.stats_canvas.delete("all")
+        """
+        Refresh the statistics panel from the table's O(1) counters.
         
-        if not self.hash_table:
-            # Welcome state - show getting started message
-            self.draw_stats_welcome()
+        Each widget is redrawn only when the value it displays changes (load
+        factor to two decimals, counts, performance band), so calling this
+        after every operation costs the same for any table size.
+        """
+        if not self.secondary_panels_ready:
             return
+        c = self.stats_canvas
         
-        # Get statistics
-        size = self.hash_table.size
-        count = self.hash_table.count
-        load_factor = self.hash_table.get_load_factor()
-        mode = self.hash_table.mode
-        collisions = len(self.hash_table.collision_log) if hasattr(self.hash_table, 'collision_log') else 0
+        if not self.hash_table:
+            if self._stats_shown.get("view") != "welcome":
+                # Welcome state - show getting started message
+                c.delete("all")
+                self.draw_stats_welcome()
+                self._stats_shown = {"view": "welcome"}
+            return
         
-        # Background gradient
-        for i in range(0, 180, 3):
-            color_val = 248 - int(i * 0.1)
-            color = f"#{color_val:02x}{color_val:02x}{253:02x}"
-            self.stats_canvas.create_rectangle(0, i, 400, i+3, fill=color, outline="")
+        if self._stats_shown.get("view") != "table":
+            c.delete("all")
+            # Background gradient
+            for i in range(0, 180, 3):
+                color_val = 248 - int(i * 0.1)
+                color = f"#{color_val:02x}{color_val:02x}{253:02x}"
+                c.create_rectangle(0, i, 400, i+3, fill=color, outline="")
+            self._stats_shown = {"view": "table"}
+        
+        # Get statistics (all O(1) counters)
+        table = self.hash_table
+        size = table.size
+        count = table.count
+        load_factor = table.get_load_factor()
+        mode = table.mode
+        collisions = table.collision_count
+        if mode == 'chaining':
+            detail = f"Longest chain: {table.longest_chain}  •  Buckets used: {table.used_buckets}/{size}"
+        else:
+            detail = f"Tombstones: {table.tombstones}"
         
-        # Title with mode icon
         mode_icons = {
             'chaining': '🔗',
             'linear': '➡️',
             'quadratic': '📐',
             'double': '🔁'
         }
-        icon = mode_icons.get(mode, '🔐')
-        self.stats_canvas.create_text(
-            200, 20,
-            text=f"{icon} {mode.upper()} MODE",
-            font=("Arial", 14, "bold"),
-            fill="#1a237e"
-        )
-        
-        # Row 1: Load Factor Gauge (left) + Elements Counter (right)
-        self.draw_circular_gauge(60, 80, 40, load_factor, "Load Factor")
-        self.draw_element_counter(180, 60, count, size)
-        
-        # Row 2: Collision Meter (left) + Performance Indicator (right)
-        self.draw_collision_meter(60, 145, collisions)
-        self.draw_performance_indicator(200, 140, load_factor, collisions)
+        widgets = [
+            # Title with mode icon
+            ("title", mode, lambda: c.create_text(
+                200, 20,
+                text=f"{mode_icons.get(mode, '🔐')} {mode.upper()} MODE",
+                font=("Arial", 14, "bold"),
+                fill="#1a237e",
+                tags="title"
+            )),
+            ("detail", detail, lambda: c.create_text(
+                200, 37,
+                text=detail,
+                font=("Arial", 8),
+                fill="#455a64",
+                tags="detail"
+            )),
+            # Row 1: Load Factor Gauge (left) + Elements Counter (right)
+            ("gauge", f"{load_factor:.2f}", lambda: self.draw_circular_gauge(60, 80, 40, load_factor, "Load Factor")),
+            ("counter", (count, size), lambda: self.draw_element_counter(180, 60, count, size)),
+            # Row 2: Collision Meter (left) + Performance Indicator (right)
+            ("collisions", collisions, lambda: self.draw_collision_meter(60, 145, collisions)),
+            ("performance", self.performance_status(load_factor, collisions),
+             lambda: self.draw_performance_indicator(200, 140, load_factor, collisions)),
+        ]
+        for tag, shown, draw in widgets:
+            if self._stats_shown.get(tag) != shown:
+                c.delete(tag)
+                draw()
+                self._stats_shown[tag] = shown
         
     def draw_stats_welcome(self):
         """Draw welcome message when no table exists."""
@@ -565,7 +1049,7 @@ class HashTableGUI:
             fill="#1565c0"
         )
     
-    def draw_circular_gauge(self, cx, cy, radius, value, label):
+    def draw_circular_gauge(self, cx, cy, radius, value, label, tag="gauge"):
         """Draw a circular gauge for load factor."""
         # Background circle
         self.stats_canvas.create_oval(
@@ -573,7 +1057,8 @@ class HashTableGUI:
             cx + radius, cy + radius,
             fill="#e0e0e0",
             outline="#9e9e9e",
-            width=2
+            width=2,
+            tags=tag
         )
         
         # Filled arc based on value
@@ -593,7 +1078,8 @@ class HashTableGUI:
                 start=90,
                 extent=extent,
                 fill=fill_color,
-                outline=""
+                outline="",
+                tags=tag
             )
         
         # Center circle (white)
@@ -602,7 +1088,8 @@ class HashTableGUI:
             cx - inner_r, cy - inner_r,
             cx + inner_r, cy + inner_r,
             fill="#ffffff",
-            outline=""
+            outline="",
+            tags=tag
         )
         
         # Value text
@@ -610,7 +1097,8 @@ class HashTableGUI:
             cx, cy - 5,
             text=f"{value:.2f}",
             font=("Arial", 14, "bold"),
-            fill="#212121"
+            fill="#212121",
+            tags=tag
         )
         
         # Label
@@ -618,10 +1106,11 @@ class HashTableGUI:
             cx, cy + 55,
             text=label,
             font=("Arial", 9, "bold"),
-            fill="#424242"
+            fill="#424242",
+            tags=tag
         )
     
-    def draw_element_counter(self, x, y, count, size):
+    def draw_element_counter(self, x, y, count, size, tag="counter"):
         """Draw element counter with animated bars."""
         # Box background
         self.stats_canvas.create_rectangle(
@@ -629,14 +1118,16 @@ class HashTableGUI:
             x + 80, y + 60,
             fill="#ffffff",
             outline="#2196F3",
-            width=2
+            width=2,
+            tags=tag
         )
         
         # Icon
         self.stats_canvas.create_text(
             x - 50, y + 15,
             text="📦",
-            font=("Arial", 20)
+            font=("Arial", 20),
+            tags=tag
         )
         
         # Count
@@ -644,7 +1135,8 @@ class HashTableGUI:
             x + 20, y + 15,
             text=f"{count} / {size}",
             font=("Arial", 16, "bold"),
-            fill="#1976d2"
+            fill="#1976d2",
+            tags=tag
         )
         
         # Progress bar
@@ -658,7 +1150,8 @@ class HashTableGUI:
             bar_x + bar_width, bar_y + 12,
             fill="#e3f2fd",
             outline="#90caf9",
-            width=1
+            width=1,
+            tags=tag
         )
         
         # Filled bar
@@ -670,7 +1163,8 @@ class HashTableGUI:
                     bar_x, bar_y,
                     bar_x + fill_width, bar_y + 12,
                     fill=fill_color,
-                    outline=""
+                    outline="",
+                    tags=tag
                 )
         
         # Percentage text
@@ -679,17 +1173,19 @@ class HashTableGUI:
             x, bar_y + 6,
             text=f"{percentage:.0f}%",
             font=("Arial", 8, "bold"),
-            fill="#ffffff" if percentage > 30 else "#424242"
+            fill="#ffffff" if percentage > 30 else "#424242",
+            tags=tag
         )
     
-    def draw_collision_meter(self, x, y, collisions):
+    def draw_collision_meter(self, x, y, collisions, tag="collisions"):
         """Draw collision counter with visual indicator."""
         # Label
         self.stats_canvas.create_text(
             x, y - 10,
             text="💥 Collisions",
             font=("Arial", 9, "bold"),
-            fill="#424242"
+            fill="#424242",
+            tags=tag
         )
         
         # Meter background
@@ -700,7 +1196,8 @@ class HashTableGUI:
             x + meter_width/2, y + meter_height,
             fill="#fff3e0",
             outline="#ff9800",
-            width=2
+            width=2,
+            tags=tag
         )
         
         # Collision count
@@ -708,7 +1205,8 @@ class HashTableGUI:
             x, y + meter_height/2,
             text=f"{collisions}",
             font=("Arial", 12, "bold"),
-            fill="#e65100"
+            fill="#e65100",
+            tags=tag
         )
         
         # Visual bars
@@ -720,28 +1218,30 @@ class HashTableGUI:
                 bar_x, y - 25,
                 bar_x + 8, y - 25 + bar_height,
                 fill="#ff5722",
-                outline=""
+                outline="",
+                tags=tag
             )
     
-    def draw_performance_indicator(self, x, y, load_factor, collisions):
-        """Draw performance status indicator."""
-        # Determine performance status
+    @staticmethod
+    def performance_status(load_factor, collisions):
+        """Performance band shown by the stats panel."""
         if load_factor < 0.5 and collisions < 3:
-            status = "EXCELLENT"
-            color = "#4CAF50"
-            emoji = "⚡"
-        elif load_factor < 0.7 and collisions < 10:
-            status = "GOOD"
-            color = "#8BC34A"
-            emoji = "✅"
-        elif load_factor < 0.85:
-            status = "MODERATE"
-            color = "#FFC107"
-            emoji = "⚠️"
-        else:
-            status = "CRITICAL"
-            color = "#F44336"
-            emoji = "🔥"
+            return "EXCELLENT"
+        if load_factor < 0.7 and collisions < 10:
+            return "GOOD"
+        if load_factor < 0.85:
+            return "MODERATE"
+        return "CRITICAL"
+    
+    def draw_performance_indicator(self, x, y, load_factor, collisions, tag="performance"):
+        """Draw performance status indicator."""
+        status = self.performance_status(load_factor, collisions)
+        color, emoji = {
+            "EXCELLENT": ("#4CAF50", "⚡"),
+            "GOOD": ("#8BC34A", "✅"),
+            "MODERATE": ("#FFC107", "⚠️"),
+            "CRITICAL": ("#F44336", "🔥"),
+        }[status]
         
         # Box
         self.stats_canvas.create_rectangle(
@@ -749,7 +1249,8 @@ class HashTableGUI:
             x + 90, y + 35,
             fill=color,
             outline="",
-            width=0
+            width=0,
+            tags=tag
         )
         
         # Inner glow effect
@@ -758,7 +1259,8 @@ class HashTableGUI:
             x + 88, y + 33,
             fill=color,
             outline="#ffffff",
-            width=2
+            width=2,
+            tags=tag
         )
         
         # Status text
@@ -766,7 +1268,8 @@ class HashTableGUI:
             x - 30, y + 17,
             text=f"{emoji} {status}",
             font=("Arial", 11, "bold"),
-            fill="#ffffff"
+            fill="#ffffff",
+            tags=tag
         )
         
         # Animated pulse dots
@@ -778,15 +1281,20 @@ class HashTableGUI:
                 dot_x - dot_size, dot_y - dot_size,
                 dot_x + dot_size, dot_y + dot_size,
                 fill="#ffffff",
-                outline=""
+                outline="",
+                tags=tag
             )
     
     def create_hash_table(self):
         """Create a new hash table with specified parameters."""
+        if self.worker_busy():
+            return
+        # Finish any running animation first so operations apply in order
+        self.animator.skip()
         try:
             size = int(self.size_var.get())
-            if size < 1 or size > 100:
-                messagebox.showerror("Invalid Size", "Table size must be between 1 and 100")
+            if size < 1 or size > self.MAX_TABLE_SIZE:
+                messagebox.showerror("Invalid Size", f"Table size must be between 1 and {self.MAX_TABLE_SIZE:,}")
                 return
             
             mode = self.mode_var.get()
@@ -801,6 +1309,9 @@ class HashTableGUI:
     
     def clear_table(self):
         """Clear all elements from the hash table."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if self.hash_table:
             self.hash_table.clear()
             self.append_compact_log("Table cleared")
@@ -809,6 +1320,9 @@ class HashTableGUI:
     
     def insert_key(self):
         """Insert key(s) into the hash table."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if not self.hash_table:
             messagebox.showwarning("No Table", "Please create a hash table first")
             return
@@ -822,23 +1336,118 @@ class HashTableGUI:
         keys = [k.strip() for k in key_input.split(',')]
         
         # Try to convert to integers if possible
-        parsed_keys = []
-        for k in keys:
-            try:
-                parsed_keys.append(int(k))
-            except ValueError:
-                parsed_keys.append(k)  # Keep as string
+        parsed_keys = [parse_key(k) for k in keys]
+        
+        self.key_var.set("")
+        if len(parsed_keys) > self.ANIMATE_MAX_KEYS:
+            # Too many keys to watch one by one: insert on the worker, draw once
+            self.insert_keys_directly(parsed_keys)
+            return
         
         # Insert each key with visualization, pseudocode, and steps
         for key in parsed_keys:
             self.run_insert_with_pseudocode(key)
         
-        self.draw_hash_table()
-        self.key_var.set("")
-        self.update_status(f"Inserted {len(parsed_keys)} key(s)")
+        self.animator.then(self.draw_hash_table)
+        self.animator.then(lambda: self.update_status(f"Inserted {len(parsed_keys)} key(s)"))
+    
+    def insert_keys_directly(self, keys):
+        """Insert keys on the worker thread without animation, logging a single summary line."""
+        table = self.hash_table
+        
+        def done(inserted):
+            self.append_compact_log(f"➕ Inserted {inserted} of {len(keys)} key(s) without animation")
+            self.draw_hash_table()
+            self.update_status(f"Inserted {len(keys)} key(s)")
+        
+        self.run_in_background(f"Inserting {len(keys):,} keys",
+                               lambda progress: self._bulk_insert(table, keys, progress), done)
+    
+    def _bulk_insert(self, table, keys, progress):
+        """Worker job: insert keys into table, reporting progress; returns how many were new."""
+        inserted = 0
+        for n, key in enumerate(keys, 1):
+            success, _, _, _ = table.insert(key)
+            inserted += success
+            if n % self.PROGRESS_EVERY == 0:
+                progress(n, len(keys))
+        return inserted
+    
+    def import_keys(self):
+        """Insert keys from a text file (separated by commas, spaces or newlines) on the worker thread."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
+        if not self.hash_table:
+            messagebox.showwarning("No Table", "Please create a hash table first")
+            return
+        
+        from tkinter import filedialog
+        path = filedialog.askopenfilename(
+            title="Import Keys",
+            filetypes=[("Text files", "*.txt *.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        table = self.hash_table
+        
+        def job(progress):
+            with open(path, encoding="utf-8") as f:
+                keys = [parse_key(k) for k in f.read().replace(',', ' ').split()]
+            return self._bulk_insert(table, keys, progress), len(keys)
+        
+        def done(result):
+            inserted, total = result
+            self.append_compact_log(f"📂 Imported {inserted} of {total} key(s) from {path}")
+            self.draw_hash_table()
+            self.update_status(f"Imported {total} key(s)")
+        
+        self.run_in_background("Importing keys", job, done)
+    
+    def worker_busy(self):
+        """While a background job owns the table, say so and return True."""
+        if self.worker.busy:
+            self.update_status("⏳ Busy: wait for the running operation to finish")
+            return True
+        return False
+    
+    def run_in_background(self, description, job, on_done):
+        """
+        Run job(progress) on the worker thread, showing progress in the status
+        bar. The table must not be touched from the Tk thread meanwhile; on_done
+        (result) runs on the Tk thread once the job has finished.
+        """
+        def finish():
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+        
+        def done(result):
+            finish()
+            on_done(result)
+        
+        def failed(error):
+            finish()
+            self.append_compact_log(f"❌ {description} failed: {error}")
+            self.update_status(f"{description} failed")
+            messagebox.showerror("Operation Failed", str(error))
+        
+        def progress(count, total):
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate", maximum=total, value=count)
+            self.update_status(f"⏳ {description}... {count * 100 // total}%")
+        
+        self.worker.submit(job, done, progress, failed)
+        self.update_status(f"⏳ {description}...")
+        # Indeterminate until the job reports progress (resize never does)
+        self.progress_bar.configure(mode="indeterminate")
+        self.progress_bar.pack(side=tk.RIGHT, padx=10)
+        self.progress_bar.start(15)
     
     def search_key(self):
         """Search for a key in the hash table."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if not self.hash_table:
             messagebox.showwarning("No Table", "Please create a hash table first")
             return
@@ -869,6 +1478,9 @@ class HashTableGUI:
     
     def delete_key(self):
         """Delete a key from the hash table."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if not self.hash_table:
             messagebox.showwarning("No Table", "Please create a hash table first")
             return
@@ -889,7 +1501,7 @@ class HashTableGUI:
         self.append_compact_log(f"🗑️ {message}")
         
         if success:
-            self.draw_hash_table()
+            self.draw_hash_table(changed=[index])
             if index >= 0:
                 self.highlight_bucket(index, self.COLOR_HIGHLIGHT)
         
@@ -899,315 +1511,227 @@ class HashTableGUI:
     
     def show_all_keys(self):
         """Display all keys currently in the hash table."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if not self.hash_table:
             messagebox.showwarning("No Table", "Please create a hash table first")
             return
         
-        keys = self.hash_table.get_all_keys()
+        table = self.hash_table
         
-        if keys:
-            keys_str = ", ".join([str(k) for k in keys])
-            self.append_compact_log(f"📊 All keys: {keys_str}")
-            messagebox.showinfo("All Keys", f"Keys in table:\n{keys_str}")
-        else:
-            self.append_compact_log("📊 Hash table is empty")
-            messagebox.showinfo("All Keys", "Hash table is empty")
+        def job(progress):
+            keys = table.get_all_keys()
+            keys_str = ", ".join([str(k) for k in keys[:self.SHOW_KEYS_MAX]])
+            if len(keys) > self.SHOW_KEYS_MAX:
+                keys_str += f", ... ({len(keys) - self.SHOW_KEYS_MAX:,} more)"
+            return keys_str
+        
+        def done(keys_str):
+            if keys_str:
+                self.append_compact_log(f"📊 All keys: {keys_str}")
+                messagebox.showinfo("All Keys", f"Keys in table:\n{keys_str}")
+            else:
+                self.append_compact_log("📊 Hash table is empty")
+                messagebox.showinfo("All Keys", "Hash table is empty")
+            self.update_status("Ready")
+        
+        self.run_in_background("Collecting keys", job, done)
     
     def resize_table(self):
         """Resize the hash table and rehash all elements."""
+        if self.worker_busy():
+            return
+        self.animator.skip()
         if not self.hash_table:
             messagebox.showwarning("No Table", "Please create a hash table first")
             return
         
         try:
             new_size = int(self.new_size_var.get())
-            if new_size < 1 or new_size > 100:
-                messagebox.showerror("Invalid Size", "New size must be between 1 and 100")
+            if new_size < 1 or new_size > self.MAX_TABLE_SIZE:
+                messagebox.showerror("Invalid Size", f"New size must be between 1 and {self.MAX_TABLE_SIZE:,}")
                 return
-            
-            message = self.hash_table.resize(new_size)
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter a valid number for new size")
+            return
+        
+        def done(message):
             self.append_compact_log(f"🔄 {message}")
             self.update_status(message)
             self.draw_hash_table()
             messagebox.showinfo("Resize Complete", message)
-            
-        except ValueError:
-            messagebox.showerror("Invalid Input", "Please enter a valid number for new size")
+        
+        # Rehashing every key can take seconds on large tables
+        table = self.hash_table
+        self.run_in_background(f"Resizing to {new_size:,} buckets", lambda progress: table.resize(new_size), done)
     
-    def draw_hash_table(self):
-        """Draw the hash table visualization on canvas with creative decorative elements."""
-        self.canvas.delete("all")
+    def draw_hash_table(self, changed=None):
+        """
+        Bring the canvas in line with the hash table.
+        
+        The bucket view is drawn by self.renderer (see renderer.TableRenderer),
+        which keeps canvas items between calls and only restyles buckets whose
+        contents changed.
+        
+        Args:
+            changed: Optional indices of the buckets a mutation touched; when
+                given, only those buckets are compared instead of all drawn ones
+        """
+        if self.worker.busy:
+            # The worker thread owns the table; its job redraws when done
+            return
+        
         # If we have an inline header, refresh it too
         if getattr(self, 'inline_header_enabled', False) and hasattr(self, 'inline_canvas'):
             self.draw_inline_header()
         
         if not self.hash_table:
             # Draw welcome screen when no table exists
+            self.renderer.reset()
+            self.canvas.delete("all")
             self.draw_welcome_screen()
+            self.update_stats_visualization()
             return
         
-        # Calculate dimensions
-        bucket_width = 120
-        bucket_height = 60
-        margin = 20
-        x_offset = 50
-        # If header is drawn inline, start near top; otherwise leave room for header
-        y_start = 30 if getattr(self, 'inline_header_enabled', False) else 150
-        
-        # Get statistics
-        size = self.hash_table.size
-        count = self.hash_table.count
-        load_factor = self.hash_table.get_load_factor()
-        mode = self.hash_table.mode.upper()
-        
-        # ========== DECORATIVE HEADER ==========
-        if not getattr(self, 'inline_header_enabled', False):
-            header_height = 130
-            for i in range(0, header_height, 2):
-                shade = 250 - int(i * 0.3)
-                color = f"#{shade:02x}{shade:02x}{255:02x}"
-                self.canvas.create_rectangle(0, i, 1000, i+2, fill=color, outline=color)
-            self.canvas.create_text(250, 25, text="🔐 HASH TABLE VISUALIZER", font=("Arial", 20, "bold"), fill="#000080", anchor="center")
-            mode_icons = {"CHAINING":"🔗","LINEAR":"➡️","QUADRATIC":"📐","DOUBLE":"🔁"}
-            icon = mode_icons.get(mode, "🔐")
-            self.canvas.create_text(250, 55, text=f"{icon}  Mode: {mode}", font=("Arial", 16, "bold"), fill="#4B0082", anchor="center")
-            stats_y = 90
-            self.canvas.create_text(80, stats_y, text=f"🧮  Size: {size}", font=("Arial", 12, "bold"), fill="#0b5394", anchor="w")
-            self.canvas.create_text(220, stats_y, text=f"⚙️  Elements: {count}", font=("Arial", 12, "bold"), fill="#0b5394", anchor="w")
-            gauge_x, gauge_y, gauge_w, gauge_h = 330, stats_y-10, 150, 20
-            self.canvas.create_rectangle(gauge_x, gauge_y, gauge_x+gauge_w, gauge_y+gauge_h, outline="#777", width=2, fill="#eee")
-            fill_w = int(gauge_w * load_factor) if load_factor <= 1 else gauge_w
-            lf_color = "#4CAF50" if load_factor < 0.5 else ("#FFC107" if load_factor < 0.75 else "#F44336")
-            if fill_w > 0:
-                self.canvas.create_rectangle(gauge_x, gauge_y, gauge_x+fill_w, gauge_y+gauge_h, outline="", fill=lf_color)
-            self.canvas.create_text(gauge_x+gauge_w-15, gauge_y+gauge_h/2, text=f"{load_factor:.2f}", font=("Arial", 11, "bold"), fill="#000", anchor="e")
-            self.canvas.create_text(80, stats_y+25, text=f"✳️  Collisions: {getattr(self.hash_table, 'collision_count', 0) if hasattr(self.hash_table, 'collision_count') else 0}", font=("Arial", 12, "bold"), fill="#6a1b9a", anchor="w")
-            self.canvas.create_text(330, stats_y+25, text=f"🧩  Hash: h(k) = k mod {size}", font=("Arial", 12), fill="#333", anchor="w")
-            
-        
+        metric = self.VIEW_MODES.get(self.view_var.get()) if hasattr(self, 'view_var') else None
+        if metric:
+            self.draw_heatmap(metric, changed)
+            self.update_info_label()
+            self.update_stats_visualization()
+            return
         
+        # The bucket view replaces any heatmap on the canvas
+        self._heatmap = None
+        self.renderer.inline_header = getattr(self, 'inline_header_enabled', False)
+        self.renderer.draw(self.hash_table, changed)
         
-        # ========== BUCKET VISUALIZATION ==========
-        max_chain_length = 1
-        if self.hash_table.mode == 'chaining':
-            for i in range(size):
-                chain_length = len(self.hash_table.get_bucket_contents(i))
-                max_chain_length = max(max_chain_length, chain_length)
+        self.update_info_label()
+        self.update_stats_visualization()
+    
+    def render_viewport(self):
+        """Create items for buckets that scrolled into view and delete those that left it."""
+        self._viewport_pending = None
+        if self.hash_table and self.hash_table is self.renderer.table and not self.worker.busy:
+            self.renderer.render_viewport()
+    
+    def scroll_to_bucket(self, index):
+        """Scroll bucket index into view (centered) if it is not visible, and draw it."""
+        if self.hash_table and self.hash_table is self.renderer.table:
+            self.renderer.scroll_to_bucket(index)
+    
+    def draw_heatmap(self, metric, changed=None):
+        """
+        Show the whole table as one image, one cell per bucket, colored by
+        metric (see heatmap.py). Once drawn, only the cells of changed buckets
+        are repainted; other table changes re-render the image.
+        """
+        # Imported on first use: it loads NumPy when that is installed
+        import heatmap
+        table = self.hash_table
+        state = self._heatmap
+        if state and state["table"] is table and state["size"] == table.size and state["metric"] == metric:
+            if table.version != state["version"] and changed is not None:
+                for i in changed:
+                    if 0 <= i < table.size:
+                        self._paint_heatmap_cell(i)
+                state["version"] = table.version
+            if table.version == state["version"]:
+                return
         
-        # Draw each bucket
-        for i in range(size):
-            y = y_start + i * (bucket_height + margin)
-            
-            # Decorative row background (alternating subtle colors)
-            row_color = "#fafafa" if i % 2 == 0 else "#ffffff"
-            self.canvas.create_rectangle(
-                0, y - 5,
-                520, y + bucket_height + 5,
-                fill=row_color,
-                outline=""
-            )
-            
-            # Bucket index label with icon
-            index_icon = "▶" if i < 10 else "⏩"
-            self.canvas.create_text(
-                x_offset - 35,
-                y + bucket_height // 2,
-                text=f"{index_icon}",
-                font=("Arial", 10),
-                fill="#4a90e2"
-            )
-            
-            self.canvas.create_text(
-                x_offset - 15,
-                y + bucket_height // 2,
-                text=f"{i}",
-                font=("Arial", 12, "bold"),
-                fill=self.COLOR_TEXT
-            )
-            
-            # Get bucket contents
-            contents = self.hash_table.get_bucket_contents(i)
-            
-            if not contents:
-                # Empty bucket with creative styling
-                self.canvas.create_rectangle(
-                    x_offset, y,
-                    x_offset + bucket_width, y + bucket_height,
-                    fill=self.COLOR_EMPTY,
-                    outline=self.COLOR_BORDER,
-                    width=2,
-                    tags=f"bucket_{i}"
-                )
-                
-                # Draw dotted pattern for empty
-                for dx in range(10, bucket_width, 20):
-                    for dy in range(10, bucket_height, 20):
-                        self.canvas.create_oval(
-                            x_offset + dx - 1, y + dy - 1,
-                            x_offset + dx + 1, y + dy + 1,
-                            fill="#e0e0e0",
-                            outline="",
-                            tags=f"bucket_{i}"
-                        )
-                
-                self.canvas.create_text(
-                    x_offset + bucket_width // 2,
-                    y + bucket_height // 2,
-                    text="∅ EMPTY",
-                    font=("Arial", 10, "italic"),
-                    fill="#cccccc",
-                    tags=f"bucket_{i}"
-                )
-            else:
-                # Draw based on mode
-                if self.hash_table.mode == 'chaining':
-                    # Draw chain with arrows
-                    for idx, key in enumerate(contents):
-                        x = x_offset + idx * (bucket_width + 15)
-                        
-                        # Chain link number badge
-                        if idx > 0:
-                            self.canvas.create_oval(
-                                x - 10, y + bucket_height//2 - 10,
-                                x - 10 + 20, y + bucket_height//2 + 10,
-                                fill="#ff9800",
-                                outline="#f57c00",
-                                width=2
-                            )
-                            self.canvas.create_text(
-                                x, y + bucket_height//2,
-                                text=str(idx),
-                                font=("Arial", 9, "bold"),
-                                fill="white"
-                            )
-                        
-                        # Rectangle for key
-                        color = self.COLOR_COLLISION if idx > 0 else self.COLOR_FILLED
-                        self.canvas.create_rectangle(
-                            x, y,
-                            x + bucket_width, y + bucket_height,
-                            fill=color,
-                            outline=self.COLOR_BORDER,
-                            width=2,
-                            tags=f"bucket_{i}"
-                        )
-                        
-                        # Key icon
-                        self.canvas.create_text(
-                            x + 20, y + bucket_height // 2,
-                            text="🔑",
-                            font=("Arial", 12),
-                            tags=f"bucket_{i}"
-                        )
-                        
-                        # Key text
-                        self.canvas.create_text(
-                            x + bucket_width // 2 + 10,
-                            y + bucket_height // 2,
-                            text=str(key),
-                            font=("Arial", 12, "bold"),
-                            fill="white",
-                            tags=f"bucket_{i}"
-                        )
-                        
-                        # Arrow to next
-                        if idx < len(contents) - 1:
-                            arrow_x = x + bucket_width + 7
-                            self.canvas.create_text(
-                                arrow_x,
-                                y + bucket_height // 2,
-                                text="⇨",
-                                font=("Arial", 16, "bold"),
-                                fill=self.COLOR_COLLISION
-                            )
-                else:
-                    # Open addressing - single key with tombstone support
-                    if contents[0] == "TOMBSTONE":
-                        # Tombstone styling
-                        self.canvas.create_rectangle(
-                            x_offset, y,
-                            x_offset + bucket_width, y + bucket_height,
-                            fill="#9e9e9e",
-                            outline=self.COLOR_BORDER,
-                            width=2,
-                            tags=f"bucket_{i}",
-                            stipple="gray50"
-                        )
-                        self.canvas.create_text(
-                            x_offset + bucket_width // 2,
-                            y + bucket_height // 2,
-                            text="🪦 TOMBSTONE",
-                            font=("Arial", 10, "bold"),
-                            fill="white",
-                            tags=f"bucket_{i}"
-                        )
-                    else:
-                        # Regular key
-                        self.canvas.create_rectangle(
-                            x_offset, y,
-                            x_offset + bucket_width, y + bucket_height,
-                            fill=self.COLOR_FILLED,
-                            outline=self.COLOR_BORDER,
-                            width=2,
-                            tags=f"bucket_{i}"
-                        )
-                        
-                        # Key icon
-                        self.canvas.create_text(
-                            x_offset + 20, y + bucket_height // 2,
-                            text="🔑",
-                            font=("Arial", 12),
-                            tags=f"bucket_{i}"
-                        )
-                        
-                        self.canvas.create_text(
-                            x_offset + bucket_width // 2 + 10,
-                            y + bucket_height // 2,
-                            text=str(contents[0]),
-                            font=("Arial", 12, "bold"),
-                            fill="white",
-                            tags=f"bucket_{i}"
-                        )
-        
-        # ========== FOOTER INFO ==========
-        footer_y = y_start + size * (bucket_height + margin) + 20
-        
-        # Tips box
-        self.canvas.create_rectangle(
-            20, footer_y,
-            480, footer_y + 60,
-            fill="#e3f2fd",
-            outline="#2196f3",
-            width=2
-        )
+        # Leaving the bucket view: it is rebuilt when selected again
+        self.renderer.reset()
+        max_width = self.renderer.viewport_width() - 20
+        max_height = self.renderer.viewport_height() - 70
+        version = table.version
         
-        self.canvas.create_text(
-            250, footer_y + 15,
-            text="💡 Quick Tips",
-            font=("Arial", 11, "bold"),
-            fill="#1976d2"
-        )
+        def show(result):
+            if self.VIEW_MODES.get(self.view_var.get()) != metric or self.hash_table is not table:
+                # The view or table changed while rendering
+                self.draw_hash_table()
+                return
+            self._show_heatmap(table, metric, version, *result)
         
-        tips = {
-            "chaining": "Chains can grow indefinitely • No table full condition",
-            "linear": "Sequential probing • Watch for primary clustering",
-            "quadratic": "i² spacing reduces clustering • Best with prime m",
-            "double": "Dual hash functions • Minimal clustering"
+        render = lambda progress: heatmap.render(table, metric, max_width, max_height)
+        if table.size >= self.HEATMAP_WORKER_MIN:
+            self.run_in_background("Rendering heatmap", render, show)
+        else:
+            show(render(None))
+    
+    def _show_heatmap(self, table, metric, version, ppm, columns, cell):
+        """Put a rendered heatmap and its legend on the canvas."""
+        import heatmap
+        self.canvas.delete("all")
+        # The canvas does not keep the image alive; self._heatmap does
+        image = tk.PhotoImage(data=ppm, format="PPM")
+        self.canvas.create_image(10, 10, image=image, anchor="nw")
+        self._heatmap = {
+            "table": table, "size": table.size, "metric": metric, "version": version,
+            "columns": columns, "cell": cell, "image": image,
         }
         
-        tip_text = tips.get(self.hash_table.mode, "Hash table operations")
+        # Legend under the image
+        shown = heatmap.effective_metric(table, metric)
+        if shown == "chain":
+            entries = [(heatmap.EMPTY, "empty"), (heatmap.FILLED, "1 key"),
+                       (heatmap.FILLED + heatmap.SCALE_MAX // 2, f"{heatmap.SCALE_MAX // 2 + 1} keys"),
+                       (heatmap.FILLED + heatmap.SCALE_MAX, f"{heatmap.SCALE_MAX + 1}+ keys")]
+        elif shown == "probe":
+            entries = [(heatmap.EMPTY, "empty"), (heatmap.TOMBSTONE_CODE, "tombstone"), (heatmap.FILLED, "home bucket"),
+                       (heatmap.FILLED + heatmap.SCALE_MAX // 2, f"{heatmap.SCALE_MAX // 2} probes"),
+                       (heatmap.FILLED + heatmap.SCALE_MAX, f"{heatmap.SCALE_MAX}+ probes")]
+        else:
+            entries = [(heatmap.EMPTY, "empty"), (heatmap.FILLED, "filled")]
+            if table.mode != 'chaining':
+                entries.append((heatmap.TOMBSTONE_CODE, "tombstone"))
+        y = 10 + image.height() + 15
+        x = 10
+        for code, label in entries:
+            self.canvas.create_rectangle(x, y - 6, x + 12, y + 6, fill=heatmap.color_of(code), outline=self.COLOR_BORDER)
+            self.canvas.create_text(x + 18, y, text=label, font=("Arial", 9), fill=self.COLOR_TEXT, anchor="w")
+            x += 30 + 7 * len(label)
         self.canvas.create_text(
-            250, footer_y + 40,
-            text=tip_text,
-            font=("Arial", 10),
-            fill="#424242"
+            10, y + 20,
+            text=f"{table.size:,} buckets • {columns} per row • {cell}px per bucket",
+            font=("Arial", 9, "italic"),
+            fill="#666666",
+            anchor="w"
         )
         
-        # Update canvas scroll region
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        
-        # Update info label
-        self.update_info_label()
+        bbox = self.canvas.bbox("all")
+        self.canvas.configure(scrollregion=(0, 0, bbox[2] + 10, bbox[3] + 10))
+        self.canvas.yview_moveto(0)
+    
+    def _paint_heatmap_cell(self, index):
+        """Repaint one bucket's heatmap cell in place."""
+        import heatmap
+        state = self._heatmap
+        columns, cell = state["columns"], state["cell"]
+        x, y = (index % columns) * cell, (index // columns) * cell
+        code = heatmap.bucket_code(self.hash_table, index, state["metric"])
+        state["image"].put(heatmap.color_of(code), to=(x, y, x + cell, y + cell))
+    
+    def on_canvas_click(self, event):
+        """In a heatmap, clicking a cell opens the bucket view at that bucket."""
+        import heatmap
+        state = self._heatmap
+        if not state or self.worker.busy or state["table"] is not self.hash_table:
+            return
+        index = heatmap.cell_index(self.canvas.canvasx(event.x) - 10, self.canvas.canvasy(event.y) - 10,
+                                   state["columns"], state["cell"], state["size"])
+        if index is None:
+            return
+        self.view_var.set("Buckets")
+        self.draw_hash_table()
+        self.scroll_to_bucket(index)
+        self.highlight_bucket(index, self.COLOR_SEARCH_FOUND)
+        self.update_status(f"Bucket {index}: {self.hash_table.get_bucket_contents(index) or 'empty'}")
+    
+    def tint_bucket(self, index, color):
+        """Recolor bucket index for an animation; the next draw_hash_table() restores it."""
+        # Tinting may scroll and draw buckets, which reads the table
+        if self.hash_table is self.renderer.table and not self.worker.busy:
+            self.renderer.tint_bucket(index, color)
     
     def draw_welcome_screen(self):
         """Draw a creative welcome screen when no hash table exists."""
@@ -1295,33 +1819,36 @@ class HashTableGUI:
             fill="#9e9e9e"
         )
     
-    def highlight_bucket(self, index, color):
-        """Highlight a specific bucket with animation."""
+    def highlight_bucket(self, index, color, key=None):
+        """
+        Flash a bucket twice. Returns immediately; the flash is played by the
+        animation scheduler (a new flash with the same key replaces it).
+        """
         if not self.hash_table or index < 0:
             return
-        
+        self.animator.play(self.flash_bucket(index, color), key=key)
+    
+    def flash_bucket(self, index, color):
+        """Animation: flash bucket index in color, then restore its normal look."""
         # Get animation delay
         delay = self.speed_var.get()
         
-        # Flash the bucket
-        for _ in range(2):
-            self.canvas.itemconfig(f"bucket_{index}", fill=color)
-            self.root.update()
-            self.root.after(delay // 2)
-            
-            contents = self.hash_table.get_bucket_contents(index)
-            if contents:
-                self.canvas.itemconfig(f"bucket_{index}", fill=self.COLOR_FILLED)
-            else:
-                self.canvas.itemconfig(f"bucket_{index}", fill=self.COLOR_EMPTY)
-            
-            self.root.update()
-            self.root.after(delay // 2)
+        try:
+            for _ in range(2):
+                self.tint_bucket(index, color)
+                yield delay // 2
+                self._restore_bucket(index)
+                yield delay // 2
+        finally:
+            self._restore_bucket(index)
+    
+    def _restore_bucket(self, index):
+        """Undo tint_bucket() on one bucket."""
+        if self.hash_table is self.renderer.table and not self.worker.busy:
+            self.renderer.restore_bucket(index)
     
     def animate_collision(self, index, key):
         """Animate a collision event."""
-        delay = self.speed_var.get()
-        
         # Draw table
         self.draw_hash_table()
         
@@ -1329,7 +1856,7 @@ class HashTableGUI:
         self.highlight_bucket(index, self.COLOR_COLLISION)
         
         # Redraw to show final state
-        self.draw_hash_table()
+        self.animator.then(self.draw_hash_table)
 
     def animate_open_addressing_collision(self, entry):
         """Animate probing path for open addressing collisions.
@@ -1379,7 +1906,7 @@ class HashTableGUI:
 
         # Finally, emphasize the final placement bucket
         self.highlight_bucket(final_index, self.COLOR_FILLED)
-        self.draw_hash_table()
+        self.animator.then(self.draw_hash_table)
     
     def log(self, message):
         """Back-compat: route log messages to steps panel as compact log."""
@@ -1406,22 +1933,18 @@ class HashTableGUI:
     # ---------- Pseudocode and Steps Utilities ----------
     def append_compact_log(self, message: str):
         """Append a single-line message to the Collision Steps panel with timestamp."""
-        if not hasattr(self, 'steps_text'):
-            return
         timestamp = time.strftime("%H:%M:%S")
-        self.steps_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.steps_text.see(tk.END)
+        self.logger.write(f"[{timestamp}] {message}\n")
 
     def clear_steps(self):
         """Reset the pseudocode execution state."""
-        if hasattr(self, 'steps_text'):
-            self.steps_text.delete(1.0, tk.END)
-            self.steps_text.insert(tk.END, "Execution steps will appear here...\n")
-        if hasattr(self, 'pseudo_text'):
-            self.pseudo_text.tag_remove("hl", 1.0, tk.END)
+        self.build_secondary_panels()
+        self.logger.clear()
+        self.logger.write("Execution steps will appear here...\n")
+        self.pseudo_text.tag_remove("hl", 1.0, tk.END)
         self.var_label.configure(text="Variables: (waiting for operation...)")
-        self._current_steps = []
-        self._current_step_index = 0
+        self.seek_timeline(-1)
+        self.load_timeline([])
         self.auto_running = False
         if hasattr(self, 'auto_btn'):
             self.auto_btn.configure(text="Auto Run")
@@ -1429,7 +1952,7 @@ class HashTableGUI:
 
     def copy_steps(self):
         try:
-            text = self.steps_text.get(1.0, tk.END)
+            text = self.logger.contents()
             self.root.clipboard_clear()
             self.root.clipboard_append(text)
             self.update_status("Steps copied to clipboard")
@@ -1506,207 +2029,6 @@ class HashTableGUI:
         except Exception:
             pass
 
-    def build_insert_steps(self, key):
-        """Build detailed micro-steps for insert operation with proper line mapping."""
-        steps = []
-        mode = self.hash_table.mode
-        m = self.hash_table.size
-        nk_val, nk_exp = normalize_key(key)
-        h1_val, h1_exp = h1_fn(nk_val, m)
-        
-        # Map pseudocode lines to actual execution steps
-        if mode == 'chaining':
-            # Line 1: Compute h1
-            steps.append({
-                "line": 2,
-                "text": f"Computing h1: {h1_exp}",
-                "idx": None,
-                "vars": {"key": key, "key_int": nk_val, "m": m, "h1": h1_val},
-                "highlight_bucket": None
-            })
-            steps.append({
-                "line": 2,
-                "text": f"h1 = {h1_val} (hash bucket)",
-                "idx": h1_val,
-                "vars": {"key": key, "m": m, "h1": h1_val},
-                "highlight_bucket": h1_val
-            })
-            # Line 2: Insert into chain
-            steps.append({
-                "line": 3,
-                "text": f"Inserting key {key} at bucket[{h1_val}]",
-                "idx": h1_val,
-                "vars": {"key": key, "h1": h1_val},
-                "highlight_bucket": h1_val
-            })
-            steps.append({
-                "line": 4,
-                "text": f"✓ Successfully inserted {key}",
-                "idx": h1_val,
-                "vars": {"key": key, "h1": h1_val},
-                "highlight_bucket": h1_val
-            })
-            return steps
-        
-        # Open addressing modes
-        h2_val = None
-        h2_exp = None
-        if mode == 'double':
-            h2_val, h2_exp = h2_fn(nk_val, m)
-        
-        # Get actual probe sequence from collision log
-        probes = 0
-        final_idx = None
-        probe_sequence = []
-        if self.hash_table.collision_log:
-            entry = self.hash_table.collision_log[-1]
-            if entry.get('key') == key and entry.get('final_index') is not None:
-                probes = entry.get('probes', 0)
-                final_idx = entry.get('final_index')
-        
-        # Step 1: Compute h1
-        steps.append({
-            "line": 2,
-            "text": f"Computing h1: {h1_exp}",
-            "idx": None,
-            "vars": {"key": key, "key_int": nk_val, "m": m, "h1": h1_val},
-            "highlight_bucket": None
-        })
-        steps.append({
-            "line": 2,
-            "text": f"h1 = {h1_val}",
-            "idx": h1_val,
-            "vars": {"key": key, "m": m, "h1": h1_val},
-            "highlight_bucket": h1_val
-        })
-        
-        # Step 2: Compute h2 (double hashing only)
-        if mode == 'double':
-            steps.append({
-                "line": 3,
-                "text": f"Computing h2: {h2_exp}",
-                "idx": None,
-                "vars": {"key": key, "m": m, "h1": h1_val, "h2": h2_val},
-                "highlight_bucket": None
-            })
-            steps.append({
-                "line": 3,
-                "text": f"h2 = {h2_val} (step size)",
-                "idx": None,
-                "vars": {"key": key, "m": m, "h1": h1_val, "h2": h2_val},
-                "highlight_bucket": None
-            })
-        
-        # Step 3: Initialize i = 0
-        init_line = 3 if mode != 'double' else 4
-        steps.append({
-            "line": init_line,
-            "text": "Initializing probe counter i = 0",
-            "idx": None,
-            "vars": {"h1": h1_val, "h2": h2_val, "i": 0, "m": m},
-            "highlight_bucket": None
-        })
-        
-        # Step 4: WHILE loop iterations
-        loop_line = 4 if mode != 'double' else 5
-        compute_line = 5 if mode != 'double' else 6
-        check_line = 6 if mode != 'double' else 7
-        place_line = 7 if mode != 'double' else 8
-        break_line = 8 if mode != 'double' else 9
-        incr_line = 9 if mode != 'double' else 10
-        
-        for i in range(probes + 1):
-            # Check loop condition
-            steps.append({
-                "line": loop_line,
-                "text": f"Check: i={i} < m={m}? → True, entering loop",
-                "idx": None,
-                "vars": {"h1": h1_val, "h2": h2_val, "i": i, "m": m},
-                "highlight_bucket": None
-            })
-            
-            # Compute idx
-            if mode == 'linear':
-                idx = (h1_val + i) % m
-                formula = f"({h1_val} + {i}) % {m}"
-            elif mode == 'quadratic':
-                idx = (h1_val + i * i) % m
-                formula = f"({h1_val} + {i}²) % {m} = ({h1_val} + {i*i}) % {m}"
-            else:  # double
-                idx = (h1_val + i * (h2_val or 1)) % m
-                formula = f"({h1_val} + {i}*{h2_val}) % {m} = ({h1_val} + {i*(h2_val or 1)}) % {m}"
-            
-            steps.append({
-                "line": compute_line,
-                "text": f"Computing idx = {formula}",
-                "idx": None,
-                "vars": {"h1": h1_val, "h2": h2_val, "i": i, "idx": idx, "m": m},
-                "highlight_bucket": None
-            })
-            steps.append({
-                "line": compute_line,
-                "text": f"idx = {idx}",
-                "idx": idx,
-                "vars": {"h1": h1_val, "h2": h2_val, "i": i, "idx": idx},
-                "highlight_bucket": idx
-            })
-            
-            # Check if slot is empty/tombstone
-            slot_status = self.hash_table.get_bucket_contents(idx)
-            is_available = (not slot_status) or (slot_status and slot_status[0] == "TOMBSTONE")
-            
-            if is_available or i == probes:
-                steps.append({
-                    "line": check_line,
-                    "text": f"Check slot[{idx}]: {'EMPTY/TOMBSTONE' if is_available else 'Available'} → Can insert!",
-                    "idx": idx,
-                    "vars": {"h1": h1_val, "h2": h2_val, "i": i, "idx": idx},
-                    "highlight_bucket": idx
-                })
-                steps.append({
-                    "line": place_line,
-                    "text": f"Placing key {key} at slot[{idx}]",
-                    "idx": idx,
-                    "vars": {"key": key, "idx": idx},
-                    "highlight_bucket": idx
-                })
-                steps.append({
-                    "line": break_line,
-                    "text": "Breaking out of loop",
-                    "idx": idx,
-                    "vars": {"key": key, "idx": idx},
-                    "highlight_bucket": idx
-                })
-                break
-            else:
-                steps.append({
-                    "line": check_line,
-                    "text": f"Check slot[{idx}]: OCCUPIED → Collision!",
-                    "idx": idx,
-                    "vars": {"h1": h1_val, "h2": h2_val, "i": i, "idx": idx},
-                    "highlight_bucket": idx
-                })
-                steps.append({
-                    "line": incr_line,
-                    "text": f"Incrementing i: {i} + 1 = {i+1}",
-                    "idx": None,
-                    "vars": {"h1": h1_val, "h2": h2_val, "i": i+1},
-                    "highlight_bucket": None
-                })
-        
-        # Final success
-        done_line = 10 if mode != 'double' else 11
-        final_pos = final_idx if final_idx is not None else (idx if 'idx' in locals() else h1_val)
-        steps.append({
-            "line": done_line,
-            "text": f"✓ Insert complete! Key {key} stored at index {final_pos}",
-            "idx": final_pos,
-            "vars": {"key": key, "final_position": final_pos},
-            "highlight_bucket": final_pos
-        })
-        
-        return steps
-
     def highlight_pseudo_lines(self, start_line, end_line=None):
         """Highlight a range of pseudocode lines (e.g., entire loop block)."""
         self.pseudo_text.tag_remove("hl", 1.0, tk.END)
@@ -1717,13 +2039,18 @@ class HashTableGUI:
         end = f"{end_line}.end"
         self.pseudo_text.tag_add("hl", start, end)
         self.pseudo_text.see(start)
-        self.root.update()
 
     def run_insert_with_realtime_pseudocode(self, key):
-        """Execute insert WITH REAL-TIME pseudocode highlighting during insertion."""
+        """
+        Animation: execute insert WITH REAL-TIME pseudocode highlighting during insertion.
+        
+        A generator for AnimationScheduler; it yields the pause (ms) after each
+        step, and the table is only read and modified once playback gets there.
+        """
         if not self.hash_table:
             messagebox.showerror("Error", "Please create a hash table first!")
             return
+        self.build_secondary_panels()
         
         mode = self.hash_table.mode
         m = self.hash_table.size
@@ -1734,45 +2061,41 @@ class HashTableGUI:
         self.draw_hash_table()
         
         # Log start
-        self.steps_text.insert(tk.END, f"\n{'='*50}\n")
-        self.steps_text.insert(tk.END, f"INSERTING KEY: {key} (Mode: {mode}, Size: {m})\n")
-        self.steps_text.insert(tk.END, f"{'='*50}\n")
-        self.steps_text.see(tk.END)
+        self.logger.write(f"\n{'='*50}\n")
+        self.logger.write(f"INSERTING KEY: {key} (Mode: {mode}, Size: {m})\n")
+        self.logger.write(f"{'='*50}\n")
         
         # Highlight FUNCTION header
         self.highlight_pseudo_lines(1)
-        self.root.after(delay)
+        yield delay
         
         # STEP 1: Compute h1
         self.highlight_pseudo_lines(2)
         key_int = int(key) if isinstance(key, (int, str)) and str(key).isdigit() else hash(str(key))
         h1 = key_int % m
-        self.steps_text.insert(tk.END, f"→ Computing h1 = {key_int} % {m} = {h1}\n")
-        self.steps_text.see(tk.END)
+        self.logger.write(f"→ Computing h1 = {key_int} % {m} = {h1}\n")
         self.var_label.configure(text=f"Variables: key={key}, h1={h1}, m={m}")
         
         # Highlight the bucket being checked
         if hasattr(self, 'canvas'):
-            self.canvas.itemconfig(f"bucket_{h1}", fill=self.COLOR_HIGHLIGHT)
-        self.root.update()
-        self.root.after(delay)
+            self.tint_bucket(h1, self.COLOR_HIGHLIGHT)
+        yield delay
         
         if mode == 'chaining':
             # CHAINING: Direct insert
             self.highlight_pseudo_lines(3)
-            self.steps_text.insert(tk.END, f"→ Appending {key} to bucket[{h1}] chain\n")
-            self.steps_text.see(tk.END)
-            self.root.update()
-            self.root.after(delay)
+            self.logger.write(f"→ Appending {key} to bucket[{h1}] chain\n")
+            yield delay
             
-            # Perform actual insertion
-            success, index, collision, message = self.hash_table.insert(key)
-            self.draw_hash_table()
+            # Perform actual insertion, recording its steps for replay
+            steps = []
+            success, index, collision, message = self.hash_table.insert(key, tracer=steps.append)
+            self.load_timeline(steps, f"Insert {key}")
+            self.draw_hash_table(changed=[index])
             
             # Highlight RETURN
             self.highlight_pseudo_lines(4)
-            self.steps_text.insert(tk.END, f"→ {message}\n")
-            self.steps_text.see(tk.END)
+            self.logger.write(f"→ {message}\n")
             self.var_label.configure(text=f"Variables: Success! key={key} at bucket[{h1}]")
             
         else:
@@ -1782,11 +2105,9 @@ class HashTableGUI:
             if mode == 'double':
                 self.highlight_pseudo_lines(3)
                 h2 = 1 + (key_int % (m - 1 if m > 1 else 1))
-                self.steps_text.insert(tk.END, f"→ Computing h2 = 1 + ({key_int} % {m-1}) = {h2}\n")
-                self.steps_text.see(tk.END)
+                self.logger.write(f"→ Computing h2 = 1 + ({key_int} % {m-1}) = {h2}\n")
                 self.var_label.configure(text=f"Variables: key={key}, h1={h1}, h2={h2}, m={m}")
-                self.root.update()
-                self.root.after(delay)
+                yield delay
                 init_line = 4
                 while_line = 5
                 idx_line = 6
@@ -1806,14 +2127,12 @@ class HashTableGUI:
             # Initialize i = 0
             self.highlight_pseudo_lines(init_line)
             i = 0
-            self.steps_text.insert(tk.END, f"→ Initialize probe counter: i = {i}\n")
-            self.steps_text.see(tk.END)
+            self.logger.write(f"→ Initialize probe counter: i = {i}\n")
             var_text = f"Variables: key={key}, h1={h1}"
             if h2: var_text += f", h2={h2}"
             var_text += f", i={i}, m={m}"
             self.var_label.configure(text=var_text)
-            self.root.update()
-            self.root.after(delay)
+            yield delay
             
             # WHILE LOOP - probe until empty slot found
             max_probes = m
@@ -1823,10 +2142,8 @@ class HashTableGUI:
             for probe_num in range(max_probes):
                 # Highlight ENTIRE WHILE LOOP BLOCK (lines while through increment)
                 self.highlight_pseudo_lines(while_line, increment_line)
-                self.steps_text.insert(tk.END, f"\n--- Probe #{probe_num + 1} (i={i}) ---\n")
-                self.steps_text.see(tk.END)
-                self.root.update()
-                self.root.after(delay // 2)
+                self.logger.write(f"\n--- Probe #{probe_num + 1} (i={i}) ---\n")
+                yield delay // 2
                 
                 # Compute idx
                 self.highlight_pseudo_lines(idx_line)
@@ -1841,8 +2158,7 @@ class HashTableGUI:
                     idx = (h1 + i*h2_val) % m
                     formula = f"({h1}+{i}*{h2_val})%{m}"
                 
-                self.steps_text.insert(tk.END, f"→ Compute idx = {formula} = {idx}\n")
-                self.steps_text.see(tk.END)
+                self.logger.write(f"→ Compute idx = {formula} = {idx}\n")
                 var_text = f"Variables: key={key}, h1={h1}"
                 if h2: var_text += f", h2={h2}"
                 var_text += f", i={i}, idx={idx}, m={m}"
@@ -1850,9 +2166,8 @@ class HashTableGUI:
                 
                 # Highlight the bucket being checked
                 if hasattr(self, 'canvas'):
-                    self.canvas.itemconfig(f"bucket_{idx}", fill=self.COLOR_HIGHLIGHT)
-                self.root.update()
-                self.root.after(delay)
+                    self.tint_bucket(idx, self.COLOR_HIGHLIGHT)
+                yield delay
                 
                 # Check slot status
                 slot = self.hash_table.get_bucket_contents(idx)
@@ -1861,88 +2176,122 @@ class HashTableGUI:
                 # Highlight IF condition check
                 self.highlight_pseudo_lines(if_line)
                 if is_available:
-                    self.steps_text.insert(tk.END, f"→ bucket[{idx}] is {'EMPTY' if not slot else 'TOMBSTONE'} ✓ Available!\n")
-                    self.steps_text.see(tk.END)
+                    self.logger.write(f"→ bucket[{idx}] is {'EMPTY' if not slot else 'TOMBSTONE'} ✓ Available!\n")
                     if hasattr(self, 'canvas'):
-                        self.canvas.itemconfig(f"bucket_{idx}", fill=self.COLOR_FILLED)
-                    self.root.update()
-                    self.root.after(delay)
+                        self.tint_bucket(idx, self.COLOR_FILLED)
+                    yield delay
                     
                     # Highlight assignment: bucket[idx] = key
                     self.highlight_pseudo_lines(assign_line)
-                    self.steps_text.insert(tk.END, f"→ Inserting: bucket[{idx}] ← {key}\n")
-                    self.steps_text.see(tk.END)
-                    self.root.update()
-                    self.root.after(delay)
+                    self.logger.write(f"→ Inserting: bucket[{idx}] ← {key}\n")
+                    yield delay
                     
                     # Perform actual insertion (we've been checking, now insert for real)
                     # Since we're controlling the process, directly call insert
-                    success, index, collision, message = self.hash_table.insert(key)
-                    self.draw_hash_table()
+                    steps = []
+                    success, index, collision, message = self.hash_table.insert(key, tracer=steps.append)
+                    self.load_timeline(steps, f"Insert {key}")
+                    self.draw_hash_table(changed=[index])
                     
                     # Highlight RETURN success
                     self.highlight_pseudo_lines(return_line)
-                    self.steps_text.insert(tk.END, f"→ SUCCESS: {message}\n")
-                    self.steps_text.see(tk.END)
+                    self.logger.write(f"→ SUCCESS: {message}\n")
                     self.var_label.configure(text=f"Variables: Inserted! key={key} at bucket[{idx}] after {i+1} probe(s)")
                     found_slot = True
                     final_idx = idx
                     break
                 else:
                     # COLLISION!
-                    self.steps_text.insert(tk.END, f"→ bucket[{idx}] is OCCUPIED ✗ Collision!\n")
-                    self.steps_text.see(tk.END)
+                    self.logger.write(f"→ bucket[{idx}] is OCCUPIED ✗ Collision!\n")
                     if hasattr(self, 'canvas'):
-                        self.canvas.itemconfig(f"bucket_{idx}", fill=self.COLOR_COLLISION)
-                    self.root.update()
-                    self.root.after(delay)
+                        self.tint_bucket(idx, self.COLOR_COLLISION)
+                    yield delay
                     
                     # Highlight increment: i = i + 1
                     self.highlight_pseudo_lines(increment_line)
                     i += 1
-                    self.steps_text.insert(tk.END, f"→ Increment probe counter: i = {i}\n")
-                    self.steps_text.see(tk.END)
+                    self.logger.write(f"→ Increment probe counter: i = {i}\n")
                     var_text = f"Variables: key={key}, h1={h1}"
                     if h2: var_text += f", h2={h2}"
                     var_text += f", i={i}, m={m}"
                     self.var_label.configure(text=var_text)
-                    self.root.update()
-                    self.root.after(delay)
+                    yield delay
             
             if not found_slot:
                 # Table full
                 self.highlight_pseudo_lines(while_line + increment_line - while_line + 1)  # Last line (RETURN table_full)
-                self.steps_text.insert(tk.END, f"→ FAILED: Table is full after {max_probes} probes\n")
-                self.steps_text.see(tk.END)
+                self.logger.write(f"→ FAILED: Table is full after {max_probes} probes\n")
                 messagebox.showwarning("Insert Failed", "Hash table is full!")
         
         # Clear highlight after completion
-        self.root.after(delay * 2)
+        yield delay * 2
         self.pseudo_text.tag_remove("hl", 1.0, tk.END)
         self.update_status(f"Insert complete: {key}")
 
     def run_insert_with_pseudocode(self, key):
-        """Execute insert WITH REAL-TIME pseudocode highlighting - use new method."""
-        self.run_insert_with_realtime_pseudocode(key)
+        """Queue an insert WITH REAL-TIME pseudocode highlighting - use new method."""
+        self.animator.play(self.run_insert_with_realtime_pseudocode(key))
 
+    def load_timeline(self, steps, title=""):
+        """Compile recorded tracer steps into the stepper's replay timeline."""
+        self.timeline = Timeline.compile(steps, title)
+        if hasattr(self, 'timeline_scale'):
+            # Scale value = frames shown (0: before the first step)
+            self.timeline_scale.configure(to=len(self.timeline))
+            self.timeline_scale.set(0)
+    
     def step_once(self):
-        """Execute one step of the pseudocode with detailed visualization."""
-        if self._current_step_index >= len(self._current_steps):
+        """Show the next recorded step."""
+        if self.timeline.at_end:
             self.auto_running = False
             if hasattr(self, 'auto_btn'):
                 self.auto_btn.configure(text="Auto Run")
             self.var_label.configure(text="Variables: Execution complete!")
             return
+        self.seek_timeline(self.timeline.position + 1)
+    
+    def step_back(self):
+        """Show the previous recorded step."""
+        if self.timeline.position >= 0:
+            self.seek_timeline(self.timeline.position - 1)
+    
+    def on_timeline_scrub(self, value):
+        """Timeline scale callback: jump to the dragged-to step."""
+        position = int(float(value)) - 1
+        if position != self.timeline.position:
+            self.seek_timeline(position)
+    
+    def seek_timeline(self, position):
+        """
+        Show recorded step position (-1: before the first step).
         
-        step = self._current_steps[self._current_step_index]
-        self._current_step_index += 1
+        Only the pseudocode line, the variables, one log line and the buckets
+        whose highlight changes are updated, so scrubbing long probe
+        sequences never redraws the table.
+        """
+        timeline = self.timeline
+        if self.worker_busy():
+            # The worker owns the table; keep the scale on the step shown
+            if hasattr(self, 'timeline_scale'):
+                self.timeline_scale.set(timeline.position + 1)
+            return
+        old_bucket, new_bucket = timeline.seek(position)
+        if hasattr(self, 'timeline_scale') and int(self.timeline_scale.get()) != timeline.position + 1:
+            self.timeline_scale.set(timeline.position + 1)
+        
+        if old_bucket is not None and old_bucket != new_bucket:
+            self._restore_bucket(old_bucket)
+        frame = timeline.frame()
+        if frame is None:
+            self.pseudo_text.tag_remove("hl", 1.0, tk.END)
+            self.var_label.configure(text="Variables: (ready to execute...)")
+            return
         
         # Update pseudocode highlight
-        line_no = step.get("line", 1)
-        self.highlight_pseudo_line(line_no)
+        self.highlight_pseudo_line(frame["line"])
         
         # Build detailed variable display
-        vars_dict = step.get("vars", {})
+        vars_dict = frame["vars"]
         if vars_dict:
             var_parts = []
             for k, v in vars_dict.items():
@@ -1956,24 +2305,49 @@ class HashTableGUI:
             vars_text = "Variables: -"
         self.var_label.configure(text=vars_text)
         
-        # Append detailed step text to collision steps panel
-        step_num = self._current_step_index
-        step_text = step.get('text', '')
-        self.steps_text.insert(tk.END, f"[Step {step_num}] {step_text}\n")
-        self.steps_text.see(tk.END)
-        
-        # Visual highlighting on canvas
-        bucket_idx = step.get("highlight_bucket")
-        if bucket_idx is not None and bucket_idx >= 0:
-            self.draw_hash_table()
-            # Use different colors based on context
-            if "✓" in step_text or "complete" in step_text.lower():
-                self.highlight_bucket(bucket_idx, self.COLOR_FILLED)
-            elif "collision" in step_text.lower() or "occupied" in step_text.lower():
-                self.highlight_bucket(bucket_idx, self.COLOR_COLLISION)
-            else:
-                self.highlight_bucket(bucket_idx, self.COLOR_HIGHLIGHT)
+        # Append the step text to collision steps panel
+        self.logger.write(f"[Step {timeline.position + 1}/{len(timeline)}] {frame['text']}\n")
+        
+        # Visual highlighting on canvas: retint only the highlighted bucket
+        if new_bucket is not None:
+            colors = {
+                PROBE: self.COLOR_HIGHLIGHT,
+                COLLISION: self.COLOR_COLLISION,
+                PLACED: self.COLOR_FILLED,
+            }
+            self.tint_bucket(new_bucket, colors[frame["kind"]])
+    
+    def export_timeline(self):
+        """Save the recorded steps to a JSON file."""
+        if not len(self.timeline):
+            messagebox.showinfo("Export Steps", "Insert a key first to record its steps.")
+            return
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(
+            title="Export steps",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            self.timeline.export(path)
+        except OSError as e:
+            messagebox.showerror("Export Failed", f"Could not write {path}:\n{e}")
+            return
+        self.update_status(f"Exported {len(self.timeline)} steps of {self.timeline.title} to {path}")
 
+    def skip_animations(self):
+        """Jump every running and queued animation to its end."""
+        self.animator.skip()
+    
+    def cancel_animations(self):
+        """Stop animations; queued inserts that have not reached the table are dropped."""
+        self.animator.cancel()
+        self.pseudo_text.tag_remove("hl", 1.0, tk.END)
+        self.draw_hash_table()
+        self.update_status("Animation cancelled")
+    
     def toggle_auto_run(self):
         self.auto_running = not self.auto_running
         self.auto_btn.configure(text=("Stop" if self.auto_running else "Auto Run"))
@@ -1981,22 +2355,45 @@ class HashTableGUI:
             self._auto_step_loop()
 
     def _auto_step_loop(self):
-        """Automatically step through pseudocode execution."""
+        """Automatically step through the recorded steps at the replay speed."""
         if not self.auto_running:
             return
-        if self._current_step_index >= len(self._current_steps):
+        if self.worker.busy:
+            # Paused until the background job hands the table back
+            self.root.after(self.speed_var.get(), self._auto_step_loop)
+            return
+        speed = self.REPLAY_SPEEDS.get(self.replay_speed_var.get(), 1)
+        if speed is None:
+            # Instant: jump straight to the last step
+            self.seek_timeline(len(self.timeline) - 1)
+        if self.timeline.at_end:
             self.auto_running = False
             self.auto_btn.configure(text="Auto Run")
             return
         self.step_once()
-        delay = self.speed_var.get()
+        delay = max(1, int(self.speed_var.get() / speed))
         self.root.after(delay, self._auto_step_loop)
 
 
 def main():
-    """Main entry point for the GUI application."""
+    """
+    Main entry point for the GUI application.
+    
+    With --startup-check the window closes as soon as every panel is built
+    and the startup times are printed; build.py uses it to time cold starts.
+    """
+    started = time.perf_counter()
     root = tk.Tk()
     app = HashTableGUI(root)
+    if "--startup-check" in sys.argv[1:]:
+        constructed = time.perf_counter()
+        
+        def report():
+            ready = time.perf_counter()
+            print(f"Window constructed in {(constructed - started) * 1000:.0f} ms, "
+                  f"all panels ready in {(ready - started) * 1000:.0f} ms")
+            root.destroy()
+        app.after_startup(report)
     root.mainloop()
 
 
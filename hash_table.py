@@ -14,12 +14,92 @@ Date: October 25, 2025
 """
 
 
+import struct
+import sys
+from array import array
 from typing import Optional, Any, Callable
-from utils import normalize_key, hash1 as h1_fn, hash2 as h2_fn
+from utils import normalize_key, hash1 as h1_fn, hash2 as h2_fn, P_BASE
 
 
 TOMBSTONE = object()
 
+# Binary snapshot layout (little-endian):
+#   header | chain lengths (chaining only) | slot tags | int keys | str lengths | str blob
+# Slots are stored exactly as laid out in memory (tombstones included), so
+# loading never rehashes. P_BASE is recorded as the hash seed: a snapshot is
+# only valid for the string hashing it was written with.
+# Format 2 appends the table's mutation version to the header; format 1
+# snapshots still load, with version 0.
+SNAPSHOT_MAGIC = b'HTSN'
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct('<4sBB2xQQqqQQQQQQ')
+_SNAPSHOT_HEADERS = {1: struct.Struct('<4sBB2xQQqqQQQQQ'), 2: _SNAPSHOT_HEADER}
+SNAPSHOT_HEADER_SIZE = _SNAPSHOT_HEADER.size
+_MODE_CODES = {'chaining': 0, 'linear': 1, 'quadratic': 2, 'double': 3}
+_CODE_MODES = {code: mode for mode, code in _MODE_CODES.items()}
+
+_TAG_EMPTY = 0
+_TAG_TOMBSTONE = 1
+_TAG_INT = 2
+_TAG_STR = 3
+_TAG_BIGINT = 4  # int outside int64, stored as its decimal string
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+# Probe index formula shown in traced steps, per open addressing mode
+_PROBE_FORMULAS = {
+    'linear': "(h1 + i) % m",
+    'quadratic': "(h1 + i²) % m",
+    'double': "(h1 + i*h2) % m",
+}
+
+
+def _step(line: int, text: str, vars: dict, bucket: Optional[int]) -> dict:
+    """Build one traced step in the format consumed by the API and UIs."""
+    return {"line": line, "text": text, "vars": vars, "highlight_bucket": bucket}
+
+
+def _le_bytes(arr: array) -> bytes:
+    """Serialize an array in little-endian order regardless of host."""
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _le_array(typecode: str, data) -> array:
+    """Inverse of _le_bytes."""
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+def _unpack_snapshot_header(view):
+    """
+    Decode a snapshot header of any supported format.
+    
+    Returns:
+        tuple: (header fields after magic and format, with the mutation
+            version last, 0 for format 1; offset of the data after the header)
+    """
+    if len(view) < 5:
+        raise ValueError("Snapshot is truncated")
+    if view[:4] != SNAPSHOT_MAGIC:
+        raise ValueError("Not a hash table snapshot")
+    header = _SNAPSHOT_HEADERS.get(view[4])
+    if header is None:
+        raise ValueError(f"Unsupported snapshot version {view[4]}")
+    if len(view) < header.size:
+        raise ValueError("Snapshot is truncated")
+    fields = header.unpack_from(view)[2:]
+    if view[4] == 1:
+        fields += (0,)
+    return fields, header.size
+
 
 class Node:
     """
@@ -49,6 +129,9 @@ class HashTable:
         mode (str): Collision handling mode
         count (int): Number of elements currently stored
         collision_log (list): Log of collision events for visualization
+        used_buckets (int): Buckets holding at least one key
+        tombstones (int): Deleted-slot markers (open addressing modes)
+        longest_chain (int): Keys in the longest chain (chaining mode)
     """
     
     def __init__(self, size=10, mode='chaining', c1: int = 1, c2: int = 3):
@@ -63,11 +146,22 @@ class HashTable:
         self.mode = mode
         self.count = 0
         self.collision_log: list = []
+        # Collisions recorded before a snapshot load, whose log entries are not kept
+        self.restored_collisions = 0
         self.c1 = c1
         self.c2 = c2
         
         # Initialize table based on mode
         self.table: list[Any] = [None] * size  # Holds Node, key, TOMBSTONE, or None
+        
+        # Optional write-ahead log (see wal.py); receives every applied mutation
+        self.wal = None
+        
+        # Bumped on every applied mutation so clients can request deltas
+        self.version = 0
+        
+        # Statistics kept up to date by every mutation, so reading them is O(1)
+        self._reset_stats()
     
     def hash_function(self, key):
         """
@@ -101,6 +195,62 @@ class HashTable:
             'h2_exp': h2_exp,
         }
     
+    def _reset_stats(self):
+        """Zero the incremental statistics (empty table)."""
+        self.used_buckets = 0
+        self.tombstones = 0
+        self.longest_chain = 0
+        # Chain length -> number of buckets with a chain that long (chaining)
+        self._chain_lengths: dict = {}
+    
+    def recount_stats(self):
+        """
+        Recompute the incremental statistics from the slots.
+        
+        Only needed after filling self.table directly (snapshot loading);
+        insert, delete, clear and resize keep the statistics current.
+        """
+        self._reset_stats()
+        if self.mode == 'chaining':
+            for bucket in self.table:
+                length = 0
+                while bucket is not None:
+                    length += 1
+                    bucket = bucket.next
+                if length:
+                    self._chain_grew(0, length)
+        else:
+            self.tombstones = sum(1 for slot in self.table if slot is TOMBSTONE)
+            self.used_buckets = self.size - self.tombstones - self.table.count(None)
+    
+    def _chain_grew(self, old, new):
+        """Record a chain growing from old to new keys."""
+        lengths = self._chain_lengths
+        if old:
+            lengths[old] -= 1
+        else:
+            self.used_buckets += 1
+        lengths[new] = lengths.get(new, 0) + 1
+        if new > self.longest_chain:
+            self.longest_chain = new
+    
+    def _chain_shrank(self, old):
+        """Record a chain of old keys losing one."""
+        lengths = self._chain_lengths
+        lengths[old] -= 1
+        if old > 1:
+            lengths[old - 1] = lengths.get(old - 1, 0) + 1
+        else:
+            self.used_buckets -= 1
+        # Chains shrink one key at a time, so the next longest is old - 1
+        if old == self.longest_chain and not lengths[old]:
+            self.longest_chain = old - 1
+    
+    @property
+    def collision_count(self):
+        """Number of inserts that collided, including any restored from a snapshot."""
+        return len(self.collision_log) + self.restored_collisions
+    
     def get_load_factor(self):
         """
         Calculate the current load factor of the hash table.
@@ -112,51 +262,68 @@ class HashTable:
         """
         return self.count / self.size
     
-    def insert(self, key):
+    def insert(self, key, tracer: Optional[Callable[[dict], None]] = None):
         """
         Insert a key into the hash table using the configured collision handling mode.
         
         Args:
             key: The key to insert (int or str)
+            tracer: Optional callable receiving one step dict per pseudocode
+                line executed ({'line', 'text', 'vars', 'highlight_bucket'})
             
         Returns:
             tuple: (success: bool, index: int, collision_occurred: bool, message: str)
         """
         if self.mode == 'chaining':
-            return self._insert_chaining(key)
-        elif self.mode == 'linear':
-            return self._insert_linear_probing(key)
-        elif self.mode == 'quadratic':
-            return self._insert_quadratic_probing(key)
-        elif self.mode == 'double':
-            return self._insert_double_hashing(key)
+            result = self._insert_chaining(key, tracer)
+        elif self.mode in ('linear', 'quadratic', 'double'):
+            result = self._insert_open_addressing(key, tracer)
+        else:
+            return None
+        
+        if result[0]:
+            self.version += 1
+            if self.wal is not None:
+                self.wal.log_insert(key)
+        return result
     
-    def _insert_chaining(self, key):
+    def _insert_chaining(self, key, tracer=None):
         """
         Insert using chaining (linked list) collision resolution.
         
         Args:
             key: The key to insert
+            tracer: Optional step callback (see insert)
             
         Returns:
             tuple: (success, index, collision_occurred, message)
         """
         index = self.hash_function(key)
         collision = False
+        if tracer is not None:
+            m = self.size
+            tracer(_step(1, f"FUNCTION Insert({key}, {m})", {"key": key, "m": m}, None))
+            tracer(_step(2, f"h1 = hash(key) % m = {index}", {"h1": index, "m": m}, index))
         
         # Check if bucket is empty
         if self.table[index] is None:
             self.table[index] = Node(key)
             self.count += 1
+            self._chain_grew(0, 1)
             message = f"Inserted '{key}' at index {index}"
         else:
             # Collision occurred - check if key already exists
             current = self.table[index]
             collision = True
+            length = 0
             
             # Traverse the chain
             while current:
+                length += 1
                 if current.key == key:
+                    if tracer is not None:
+                        tracer(_step(3, f"bucket[{index}] already contains {key}", {"h1": index, "key": key}, index))
+                        tracer(_step(4, "RETURN duplicate", {}, index))
                     return (False, index, False, f"Key '{key}' already exists at index {index}")
                 if current.next is None:
                     break
@@ -165,7 +332,12 @@ class HashTable:
             # Add to end of chain
             current.next = Node(key)
             self.count += 1
+            self._chain_grew(length, length + 1)
             message = f"Collision! Inserted '{key}' at index {index} (chained)"
+
+        if tracer is not None:
+            tracer(_step(3, f"bucket[{index}].append({key})", {"h1": index, "key": key}, index))
+            tracer(_step(4, "RETURN success", {}, index))
         
         # Log collision for visualization
         if collision:
@@ -177,256 +349,261 @@ class HashTable:
         
         return (True, index, collision, message)
     
-    def _insert_linear_probing(self, key):
+    def _insert_open_addressing(self, key, tracer=None):
         """
-        Insert using linear probing collision resolution.
-        
-        Args:
-            key: The key to insert
-            
-        Returns:
-            tuple: (success, index, collision_occurred, message)
-        """
-        index = self.hash_function(key)
-        original_index = index
-        collision = False
-        probes = 0
-        
-        # Check if table is full
-        if self.count >= self.size:
-            return (False, -1, False, "Hash table is full!")
-        
-        # Linear probing: try index, index+1, index+2, ...
-        first_tombstone = None
-        while self.table[index] is not None:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
-                return (False, index, False, f"Key '{key}' already exists at index {index}")
-            
-            collision = True
-            probes += 1
-            index = (original_index + probes) % self.size
-            
-            # Safety check (shouldn't happen if count is correct)
-            if probes >= self.size:
-                return (False, -1, False, "Could not find empty slot!")
-        
-        # Found empty or tombstone slot
-        target_index = first_tombstone if first_tombstone is not None else index
-        self.table[target_index] = key
-        self.count += 1
-        
-        if collision:
-            message = f"Collision! Inserted '{key}' at index {index} after {probes} probe(s)"
-            self.collision_log.append({
-                'key': key,
-                'original_index': original_index,
-                'final_index': target_index,
-                'probes': probes,
-                'type': 'linear'
-            })
-        else:
-            message = f"Inserted '{key}' at index {target_index}"
-        
-        return (True, target_index, collision, message)
-    
-    def _insert_quadratic_probing(self, key):
-        """
-        Insert using quadratic probing collision resolution.
+        Insert using linear probing, quadratic probing or double hashing.
+
+        Probes idx = (h1 + f(i)) % m with f(i) = i, i² or i*h2. The first
+        tombstone seen is remembered and reused once the probe reaches an
+        empty slot (or runs out), after checking the key is not already
+        stored further along the sequence.
         
         Args:
             key: The key to insert
+            tracer: Optional step callback (see insert)
             
         Returns:
             tuple: (success, index, collision_occurred, message)
         """
-        index = self.hash_function(key)
-        original_index = index
-        collision = False
-        probes = 0
+        mode = self.mode
+        m = self.size
+        hashes = self._compute_hashes(key)
+        h1 = hashes['h1']
+        h2 = hashes['h2'] or 1
+        # Double hashing has an extra pseudocode line for h2
+        off = 1 if mode == 'double' else 0
+
+        if tracer is not None:
+            tracer(_step(1, f"FUNCTION Insert({key}, {m})", {"key": key, "m": m}, None))
+            tracer(_step(2, f"h1 = hash(key) % m = {h1}", {"h1": h1}, h1))
+            if mode == 'double':
+                tracer(_step(3, f"h2 = 1 + (hash(key) % (m-1)) = {h2}", {"h2": h2}, None))
+            tracer(_step(3 + off, "i = 0", {"i": 0}, None))
         
         # Check if table is full
-        if self.count >= self.size:
+        if self.count >= m:
+            if tracer is not None:
+                tracer(_step(4 + off, f"Checking: i (0) < m ({m}) → False", {"i": 0, "m": m}, None))
+                tracer(_step(10 + off, "RETURN table_full", {}, None))
             return (False, -1, False, "Hash table is full!")
         
-        # Quadratic probing: try index + 1^2, index + 2^2, index + 3^2, ...
         first_tombstone = None
-        while self.table[index] is not None:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
+        target_index = None
+        probes = m
+        for i in range(m):
+            if mode == 'linear':
+                index = (h1 + i) % m
+            elif mode == 'quadratic':
+                index = (h1 + i * i) % m
+            else:
+                index = (h1 + i * h2) % m
+            slot = self.table[index]
+            if tracer is not None:
+                tracer(_step(4 + off, f"Checking: i ({i}) < m ({m}) → True", {"i": i, "m": m}, None))
+                tracer(_step(5 + off, f"idx = {_PROBE_FORMULAS[mode]} = {index}", {"idx": index, "i": i, "h1": h1}, index))
+
+            if slot is None:
+                if tracer is not None:
+                    tracer(_step(6 + off, f"bucket[{index}] is EMPTY → True", {"idx": index}, index))
+                target_index = index
+                probes = i
+                break
+
+            if slot is TOMBSTONE:
+                if first_tombstone is None:
+                    first_tombstone = index
+                    text = f"bucket[{index}] is TOMBSTONE (reusable, but continue probing)"
+                else:
+                    text = f"bucket[{index}] is TOMBSTONE → False"
+            elif slot == key:
+                if tracer is not None:
+                    tracer(_step(6 + off, f"bucket[{index}] ({slot}) == key ({key}) → already present", {"idx": index, "key": key}, index))
+                    tracer(_step(8 + off, "RETURN duplicate", {"idx": index}, index))
                 return (False, index, False, f"Key '{key}' already exists at index {index}")
+            else:
+                text = f"bucket[{index}] is OCCUPIED → False"
             
-            collision = True
-            probes += 1
-            index = (original_index + probes * probes) % self.size
+            if tracer is not None:
+                tracer(_step(6 + off, text, {"idx": index}, index))
+                tracer(_step(9 + off, f"i = {i} + 1", {"i": i + 1}, None))
             
-            # Safety check
-            if probes >= self.size:
-                return (False, -1, False, "Could not find empty slot!")
+        reused = first_tombstone is not None
+        if reused:
+            target_index = first_tombstone
+        if target_index is None:
+            if tracer is not None:
+                tracer(_step(4 + off, f"Checking: i ({m}) < m ({m}) → False", {"i": m, "m": m}, None))
+                tracer(_step(10 + off, "RETURN table_full", {}, None))
+            return (False, -1, False, "Could not find empty slot!")
         
-        # Found empty or tombstone slot
-        target_index = first_tombstone if first_tombstone is not None else index
         self.table[target_index] = key
         self.count += 1
+        self.used_buckets += 1
+        if reused:
+            self.tombstones -= 1
+        if tracer is not None:
+            suffix = " (using tombstone slot)" if reused else ""
+            tracer(_step(7 + off, f"bucket[{target_index}] = {key}{suffix}", {"idx": target_index, "key": key}, target_index))
+            tracer(_step(8 + off, "RETURN success", {"idx": target_index}, target_index))
         
+        collision = probes > 0
         if collision:
-            message = f"Collision! Inserted '{key}' at index {index} after {probes} probe(s) (quadratic)"
-            self.collision_log.append({
-                'key': key,
-                'original_index': original_index,
-                'final_index': target_index,
-                'probes': probes,
-                'type': 'quadratic'
-            })
-        else:
-            message = f"Inserted '{key}' at index {target_index}"
-        
-        return (True, target_index, collision, message)
-
-    def _insert_double_hashing(self, key):
-        """
-        Insert using double hashing collision resolution.
-        """
-        if self.count >= self.size:
-            return (False, -1, False, "Hash table is full!")
-
-        hashes = self._compute_hashes(key)
-        h1 = hashes['h1']
-        h2 = hashes['h2'] or 1
-        index = h1
-        collision = False
-        probes = 0
-        first_tombstone = None
-
-        while self.table[index] is not None:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
-                return (False, index, False, f"Key '{key}' already exists at index {index}")
-            if first_tombstone is None and self.table[index] is TOMBSTONE:
-                first_tombstone = index
-            collision = True
-            probes += 1
-            if probes >= self.size:
-                return (False, -1, False, "Could not find empty slot!")
-            index = (h1 + probes * h2) % self.size
-
-        target_index = first_tombstone if first_tombstone is not None else index
-        self.table[target_index] = key
-        self.count += 1
-
-        if collision:
-            message = (
-                f"Collision! Inserted '{key}' at index {target_index} after {probes} probe(s) (double)"
-            )
-            self.collision_log.append({
+            label = "" if mode == 'linear' else f" ({mode})"
+            message = f"Collision! Inserted '{key}' at index {target_index} after {probes} probe(s){label}"
+            entry = {
                 'key': key,
                 'original_index': h1,
                 'final_index': target_index,
                 'probes': probes,
-                'h2': h2,
-                'type': 'double'
-            })
+                'type': mode
+            }
+            if mode == 'double':
+                entry['h2'] = h2
+            self.collision_log.append(entry)
         else:
             message = f"Inserted '{key}' at index {target_index}"
-
+        
         return (True, target_index, collision, message)
     
-    def search(self, key):
+    def search(self, key, tracer: Optional[Callable[[dict], None]] = None):
         """
         Search for a key in the hash table.
         
         Args:
             key: The key to search for
+            tracer: Optional step callback (see insert)
             
         Returns:
             tuple: (found: bool, index: int, message: str)
         """
         if self.mode == 'chaining':
-            return self._search_chaining(key)
-        elif self.mode == 'linear':
-            return self._search_linear_probing(key)
-        elif self.mode == 'quadratic':
-            return self._search_quadratic_probing(key)
-        elif self.mode == 'double':
-            return self._search_double_hashing(key)
+            return self._search_chaining(key, tracer)
+        elif self.mode in ('linear', 'quadratic', 'double'):
+            return self._search_open_addressing(key, tracer)
     
-    def _search_chaining(self, key):
+    def _search_chaining(self, key, tracer=None):
         """Search using chaining."""
         index = self.hash_function(key)
         current = self.table[index]
+        if tracer is not None:
+            tracer(_step(1, f"SEARCH(key={key})", {"key": key}, None))
+            tracer(_step(2, f"idx = h1(key) % m = {index}", {"idx": index, "key": key, "m": self.size}, index))
+            tracer(_step(3, f"node = bucket[{index}].head", {"idx": index}, index))
         
+        position = 0
         while current:
+            if tracer is not None:
+                tracer(_step(4, f"node != NULL → True (position {position})", {"chain_pos": position}, index))
+                tracer(_step(5, f"node.key ({current.key}) == key ({key}) → {current.key == key}", {"node_key": current.key, "key": key}, index))
             if current.key == key:
+                if tracer is not None:
+                    tracer(_step(6, f"RETURN found at index {index}, position {position}", {"idx": index, "chain_pos": position}, index))
                 return (True, index, f"Found '{key}' at index {index}")
+            if tracer is not None:
+                tracer(_step(7, "node = node.next", {"chain_pos": position + 1}, index))
             current = current.next
+            position += 1
         
+        if tracer is not None:
+            tracer(_step(4, "node != NULL → False", {}, index))
+            tracer(_step(8, "RETURN not_found", {}, None))
         return (False, index, f"Key '{key}' not found")
     
-    def _search_linear_probing(self, key):
-        """Search using linear probing."""
-        index = self.hash_function(key)
-        original_index = index
-        probes = 0
-        
-        while self.table[index] is not None and probes < self.size:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
-                return (True, index, f"Found '{key}' at index {index}")
-            probes += 1
-            index = (original_index + probes) % self.size
-        
-        return (False, -1, f"Key '{key}' not found")
-    
-    def _search_quadratic_probing(self, key):
-        """Search using quadratic probing."""
-        index = self.hash_function(key)
-        original_index = index
-        probes = 0
-        
-        while self.table[index] is not None and probes < self.size:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
-                return (True, index, f"Found '{key}' at index {index}")
-            probes += 1
-            index = (original_index + probes * probes) % self.size
-        
-        return (False, -1, f"Key '{key}' not found")
-
-    def _search_double_hashing(self, key):
+    def _search_open_addressing(self, key, tracer=None):
+        """Search using linear probing, quadratic probing or double hashing."""
+        mode = self.mode
+        m = self.size
         hashes = self._compute_hashes(key)
         h1 = hashes['h1']
         h2 = hashes['h2'] or 1
-        index = h1
-        probes = 0
-        while self.table[index] is not None and probes < self.size:
-            if self.table[index] != TOMBSTONE and self.table[index] == key:
+        off = 1 if mode == 'double' else 0
+
+        if tracer is not None:
+            tracer(_step(1, f"SEARCH(key={key})", {"key": key}, None))
+            tracer(_step(2, f"h1 = hash1(key) % m = {h1}", {"h1": h1, "key": key, "m": m}, None))
+            if mode == 'double':
+                tracer(_step(3, f"h2 = hash2(key) = {h2}", {"h2": h2, "key": key}, None))
+            tracer(_step(3 + off, "i = 0", {"i": 0}, None))
+
+        for i in range(m):
+            if mode == 'linear':
+                index = (h1 + i) % m
+            elif mode == 'quadratic':
+                index = (h1 + i * i) % m
+            else:
+                index = (h1 + i * h2) % m
+            slot = self.table[index]
+            if tracer is not None:
+                tracer(_step(4 + off, f"Checking: i ({i}) < m ({m}) → True", {"i": i, "m": m}, None))
+                tracer(_step(5 + off, f"idx = {_PROBE_FORMULAS[mode]} = {index}", {"idx": index, "i": i}, index))
+
+            if slot is None:
+                if tracer is not None:
+                    tracer(_step(6 + off, f"bucket[{index}] is EMPTY → True", {"idx": index}, index))
+                    tracer(_step(7 + off, "RETURN not_found", {}, None))
+                return (False, -1, f"Key '{key}' not found")
+
+            if tracer is not None:
+                tracer(_step(6 + off, f"bucket[{index}] is EMPTY → False", {"idx": index}, index))
+            if slot is not TOMBSTONE and slot == key:
+                if tracer is not None:
+                    tracer(_step(8 + off, f"bucket[{index}] ({slot}) == key ({key}) → True", {"idx": index, "key": key}, index))
+                    tracer(_step(9 + off, f"RETURN found at index {index}", {"idx": index}, index))
                 return (True, index, f"Found '{key}' at index {index}")
-            probes += 1
-            index = (h1 + probes * h2) % self.size
+
+            if tracer is not None:
+                shown = 'TOMBSTONE' if slot is TOMBSTONE else slot
+                tracer(_step(8 + off, f"bucket[{index}] ({shown}) == key ({key}) → False", {"idx": index}, index))
+                tracer(_step(10 + off, f"i = {i} + 1", {"i": i + 1}, None))
+
+        if tracer is not None:
+            tracer(_step(4 + off, f"Checking: i ({m}) < m ({m}) → False", {"i": m, "m": m}, None))
+            tracer(_step(11 + off, "RETURN not_found", {}, None))
         return (False, -1, f"Key '{key}' not found")
     
-    def delete(self, key):
+    def delete(self, key, tracer: Optional[Callable[[dict], None]] = None):
         """
         Delete a key from the hash table.
         
         Args:
             key: The key to delete
+            tracer: Optional step callback (see insert)
             
         Returns:
             tuple: (success: bool, index: int, message: str)
         """
         if self.mode == 'chaining':
-            return self._delete_chaining(key)
-        elif self.mode == 'linear':
-            return self._delete_linear_probing(key)
-        elif self.mode == 'quadratic':
-            return self._delete_quadratic_probing(key)
-        elif self.mode == 'double':
-            return self._delete_double_hashing(key)
+            result = self._delete_chaining(key, tracer)
+        elif self.mode in ('linear', 'quadratic', 'double'):
+            result = self._delete_open_addressing(key, tracer)
+        else:
+            return None
+        
+        if result[0]:
+            self.version += 1
+            if self.wal is not None:
+                self.wal.log_delete(key)
+        return result
     
-    def _delete_chaining(self, key):
+    def _delete_chaining(self, key, tracer=None):
         """Delete using chaining."""
         index = self.hash_function(key)
         current = self.table[index]
         prev = None
+        if tracer is not None:
+            tracer(_step(1, f"FUNCTION Delete({key}, {self.size})", {"key": key, "m": self.size}, None))
+            tracer(_step(2, f"h1 = hash(key) % m = {index}", {"h1": index}, index))
+            tracer(_step(3, f"node = bucket[{index}]", {"h1": index}, index))
         
+        position = 0
         while current:
+            if tracer is not None:
+                tracer(_step(4, f"Checking: node is not NULL → True (pos {position})", {"chain_pos": position}, index))
             if current.key == key:
+                if tracer is not None:
+                    tracer(_step(5, f"node.key ({current.key}) == key ({key}) → True", {"key": key}, index))
+                    tracer(_step(6, f"Remove node from chain at bucket[{index}]", {"h1": index}, index))
+                    tracer(_step(7, "RETURN success", {}, index))
                 if prev is None:
                     # Deleting head of chain
                     self.table[index] = current.next
@@ -435,43 +612,83 @@ class HashTable:
                     prev.next = current.next
                 
                 self.count -= 1
+                length = position + 1
+                rest = current.next
+                while rest is not None:
+                    length += 1
+                    rest = rest.next
+                self._chain_shrank(length)
                 return (True, index, f"Deleted '{key}' from index {index}")
             
+            if tracer is not None:
+                tracer(_step(5, f"node.key ({current.key}) == key ({key}) → False", {}, index))
+                tracer(_step(8, "node = node.next", {}, index))
             prev = current
             current = current.next
+            position += 1
         
+        if tracer is not None:
+            tracer(_step(4, "Checking: node is not NULL → False", {}, index))
+            tracer(_step(9, "RETURN not_found", {}, None))
         return (False, index, f"Key '{key}' not found")
     
-    def _delete_linear_probing(self, key):
-        """Delete using linear probing."""
-        found, index, _ = self._search_linear_probing(key)
+    def _delete_open_addressing(self, key, tracer=None):
+        """Delete by probing for the key and leaving a TOMBSTONE in its slot."""
+        mode = self.mode
+        m = self.size
+        hashes = self._compute_hashes(key)
+        h1 = hashes['h1']
+        h2 = hashes['h2'] or 1
+        off = 1 if mode == 'double' else 0
         
-        if not found:
-            return (False, -1, f"Key '{key}' not found")
+        if tracer is not None:
+            tracer(_step(1, f"FUNCTION Delete({key}, {m})", {"key": key, "m": m}, None))
+            tracer(_step(2, f"h1 = hash(key) % m = {h1}", {"h1": h1}, h1))
+            if mode == 'double':
+                tracer(_step(3, f"h2 = 1 + (hash(key) % (m-1)) = {h2}", {"h2": h2}, None))
+            tracer(_step(3 + off, "i = 0", {"i": 0}, None))
         
-        # Mark tombstone for robust open addressing
-        self.table[index] = TOMBSTONE
-        self.count -= 1
-        return (True, index, f"Deleted '{key}' from index {index}")
+        for i in range(m):
+            if mode == 'linear':
+                index = (h1 + i) % m
+            elif mode == 'quadratic':
+                index = (h1 + i * i) % m
+            else:
+                index = (h1 + i * h2) % m
+            slot = self.table[index]
+            if tracer is not None:
+                tracer(_step(4 + off, f"Checking: i ({i}) < m ({m}) → True", {"i": i, "m": m}, None))
+                tracer(_step(5 + off, f"idx = {_PROBE_FORMULAS[mode]} = {index}", {"idx": index, "i": i}, index))
     
-    def _delete_quadratic_probing(self, key):
-        """Delete using quadratic probing."""
-        found, index, _ = self._search_quadratic_probing(key)
-        
-        if not found:
-            return (False, -1, f"Key '{key}' not found")
-        
-        self.table[index] = TOMBSTONE
-        self.count -= 1
-        return (True, index, f"Deleted '{key}' from index {index}")
-
-    def _delete_double_hashing(self, key):
-        found, index, _ = self._search_double_hashing(key)
-        if not found:
-            return (False, -1, f"Key '{key}' not found")
-        self.table[index] = TOMBSTONE
-        self.count -= 1
-        return (True, index, f"Deleted '{key}' from index {index}")
+            if slot is None:
+                if tracer is not None:
+                    tracer(_step(6 + off, f"bucket[{index}] is EMPTY → True", {"idx": index}, index))
+                    tracer(_step(11 + off, "RETURN not_found", {}, None))
+                return (False, -1, f"Key '{key}' not found")
+        
+            if tracer is not None:
+                tracer(_step(6 + off, f"bucket[{index}] is EMPTY → False", {"idx": index}, index))
+            if slot is not TOMBSTONE and slot == key:
+                # Mark tombstone for robust open addressing
+                self.table[index] = TOMBSTONE
+                self.count -= 1
+                self.used_buckets -= 1
+                self.tombstones += 1
+                if tracer is not None:
+                    tracer(_step(7 + off, f"bucket[{index}] ({slot}) == key ({key}) → True", {"idx": index, "key": key}, index))
+                    tracer(_step(8 + off, f"bucket[{index}] = TOMBSTONE", {"idx": index}, index))
+                    tracer(_step(9 + off, "RETURN success", {}, index))
+                return (True, index, f"Deleted '{key}' from index {index}")
+        
+            if tracer is not None:
+                shown = 'TOMBSTONE' if slot is TOMBSTONE else slot
+                tracer(_step(7 + off, f"bucket[{index}] ({shown}) == key ({key}) → False", {"idx": index}, index))
+                tracer(_step(10 + off, f"i = {i} + 1", {"i": i + 1}, None))
+
+        if tracer is not None:
+            tracer(_step(4 + off, f"Checking: i ({m}) < m ({m}) → False", {"i": m, "m": m}, None))
+            tracer(_step(11 + off, "RETURN not_found", {}, None))
+        return (False, -1, f"Key '{key}' not found")
     
     def clear(self):
         """Clear all elements from the hash table."""
@@ -482,6 +699,12 @@ class HashTable:
         
         self.count = 0
         self.collision_log = []
+        self.restored_collisions = 0
+        self._reset_stats()
+        self.version += 1
+        
+        if self.wal is not None:
+            self.wal.log_clear()
     
     def resize(self, new_size):
         """
@@ -496,11 +719,16 @@ class HashTable:
         old_table = self.table
         old_size = self.size
         old_mode = self.mode
+        old_version = self.version
+        # Rehash inserts are implied by the resize record, not logged one by one
+        wal, self.wal = self.wal, None
         
         # Create new table
         self.size = new_size
         self.count = 0
         self.collision_log = []
+        self.restored_collisions = 0
+        self._reset_stats()
         
         if self.mode == 'chaining':
             self.table = [None] * new_size
@@ -518,10 +746,16 @@ class HashTable:
                     current = current.next
         else:
             for key in old_table:
-                if key is not None:
+                if key is not None and key is not TOMBSTONE:
                     self.insert(key)
                     rehashed += 1
         
+        # The whole resize counts as a single mutation
+        self.version = old_version + 1
+        self.wal = wal
+        if self.wal is not None:
+            self.wal.log_resize(new_size)
+        
         return f"Resized from {old_size} to {new_size} buckets. Rehashed {rehashed} keys."
     
     def get_bucket_contents(self, index):
@@ -572,6 +806,197 @@ class HashTable:
         
         return keys
     
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the table into a compact binary snapshot.
+        
+        The raw slot layout is preserved (including tombstones and chain
+        order), so from_bytes() can restore the table without rehashing.
+        Only int and str keys are supported.
+        
+        Returns:
+            bytes: Snapshot payload
+        """
+        tags = bytearray()
+        ints = array('q')
+        str_lens = array('I')
+        blob = []
+
+        def add_key(key):
+            if isinstance(key, int):
+                if _INT64_MIN <= key <= _INT64_MAX:
+                    tags.append(_TAG_INT)
+                    ints.append(key)
+                    return
+                tags.append(_TAG_BIGINT)
+                raw = str(key).encode('ascii')
+            elif isinstance(key, str):
+                tags.append(_TAG_STR)
+                raw = key.encode('utf-8')
+            else:
+                raise TypeError(f"Cannot snapshot key of type {type(key).__name__}: {key!r}")
+            str_lens.append(len(raw))
+            blob.append(raw)
+
+        chain_lens = array('I')
+        if self.mode == 'chaining':
+            for bucket in self.table:
+                length = 0
+                current = bucket
+                while current:
+                    add_key(current.key)
+                    length += 1
+                    current = current.next
+                chain_lens.append(length)
+        else:
+            for slot in self.table:
+                if slot is None:
+                    tags.append(_TAG_EMPTY)
+                elif slot is TOMBSTONE:
+                    tags.append(_TAG_TOMBSTONE)
+                else:
+                    add_key(slot)
+
+        header = _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, _MODE_CODES[self.mode],
+            self.size, self.count, self.c1, self.c2, P_BASE,
+            len(tags), len(ints), len(str_lens), self.collision_count,
+            self.version,
+        )
+        return b''.join([
+            header,
+            _le_bytes(chain_lens),
+            bytes(tags),
+            _le_bytes(ints),
+            _le_bytes(str_lens),
+            *blob,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data) -> 'HashTable':
+        """
+        Rebuild a table from a snapshot produced by to_bytes().
+        
+        Args:
+            data: Snapshot payload (bytes, bytearray or memoryview)
+            
+        Returns:
+            HashTable: Restored table
+            
+        Raises:
+            ValueError: If the payload is not a compatible snapshot
+        """
+        view = memoryview(data)
+        (mode_code, size, count, c1, c2, seed,
+         n_tags, n_ints, n_strs, n_collisions, version), pos = _unpack_snapshot_header(view)
+        if seed != P_BASE:
+            raise ValueError(f"Snapshot hashed with seed {seed}, expected {P_BASE}")
+        if mode_code not in _CODE_MODES:
+            raise ValueError(f"Unknown mode code {mode_code}")
+
+        mode = _CODE_MODES[mode_code]
+        chain_lens = None
+        if mode == 'chaining':
+            chain_lens = _le_array('I', view[pos:pos + 4 * size])
+            pos += 4 * size
+        tags = view[pos:pos + n_tags].tobytes()
+        pos += n_tags
+        ints = _le_array('q', view[pos:pos + 8 * n_ints])
+        pos += 8 * n_ints
+        str_lens = _le_array('I', view[pos:pos + 4 * n_strs])
+        pos += 4 * n_strs
+        if len(view) - pos != sum(str_lens):
+            raise ValueError("Snapshot is truncated")
+
+        strs = []
+        for length in str_lens:
+            strs.append(view[pos:pos + length].tobytes())
+            pos += length
+
+        # Single comprehension over the tag bytes; ints (the common case) are
+        # pulled from a pre-built list so no per-slot decoding is needed.
+        next_int = iter(ints.tolist()).__next__
+        next_str = iter(strs).__next__
+
+        def rare(tag):
+            if tag == _TAG_TOMBSTONE:
+                return TOMBSTONE
+            if tag == _TAG_STR:
+                return next_str().decode('utf-8')
+            return int(next_str())
+
+        keys: list[Any] = [
+            next_int() if tag == _TAG_INT else (None if tag == _TAG_EMPTY else rare(tag))
+            for tag in tags
+        ]
+
+        table = cls(size=size, mode=mode, c1=c1, c2=c2)
+        if chain_lens is not None:
+            pos = 0
+            for index, length in enumerate(chain_lens):
+                head = None
+                for key in reversed(keys[pos:pos + length]):
+                    node = Node(key)
+                    node.next = head
+                    head = node
+                table.table[index] = head
+                pos += length
+        else:
+            table.table = keys
+        table.count = count
+        table.version = version
+        table.recount_stats()
+        # Individual collision events are not persisted; keep the tally.
+        table.restored_collisions = n_collisions
+        return table
+
+    @staticmethod
+    def snapshot_version(data) -> int:
+        """
+        Read the mutation version of a to_bytes() snapshot without decoding it.
+        
+        Only the first SNAPSHOT_HEADER_SIZE bytes are needed, so stores can
+        answer "has this table changed?" without loading the table.
+        
+        Args:
+            data: Snapshot prefix (bytes, bytearray or memoryview)
+            
+        Returns:
+            int: The table's version
+            
+        Raises:
+            ValueError: If the payload is not a compatible snapshot
+        """
+        fields, _ = _unpack_snapshot_header(memoryview(data))
+        return fields[-1]
+
+    def save(self, path):
+        """
+        Write a binary snapshot of the table to disk.
+        
+        Args:
+            path: Destination file path
+        """
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> 'HashTable':
+        """
+        Load a table from a snapshot written by save().
+        
+        The whole file is read in one sequential pass and slots are restored
+        in place, so no key is rehashed.
+        
+        Args:
+            path: Snapshot file path
+            
+        Returns:
+            HashTable: Restored table
+        """
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+    
     def display_console(self):
         """
         Display the hash table in console using ASCII art.
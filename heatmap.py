@@ -0,0 +1,228 @@
+"""
+Heatmap overview of a hash table.
+
+Renders the whole table as one image with one cell per bucket, laid out row
+by row, colored by a per-bucket metric:
+- 'occupancy': empty / filled / tombstone
+- 'chain':     keys in the bucket's chain (chaining mode)
+- 'probe':     how far the stored key sits from its home bucket, in probes
+               (open addressing modes)
+
+Modes without chains or probe sequences fall back to occupancy. Pixels are
+produced as binary PPM, which tkinter.PhotoImage reads directly, so even a
+million-bucket table is a single canvas image; ppm_to_png() converts it for
+snapshots written without a display (see renderer.py). NumPy is optional: with it the
+palette lookup and cell scaling are vectorized, without it they use
+bytes.translate.
+
+Author: Hash Table Simulator
+"""
+
+import math
+import struct
+import zlib
+
+from hash_table import TOMBSTONE
+from utils import normalize_key
+
+try:
+    import numpy as np
+except ImportError:  # optional: vectorized pixel conversion
+    np = None
+
+
+METRICS = ('occupancy', 'chain', 'probe')
+
+# Cell codes: EMPTY and TOMBSTONE_CODE, then FILLED + metric value, where the
+# value (extra chain links, or probe distance) saturates at SCALE_MAX
+EMPTY = 0
+TOMBSTONE_CODE = 1
+FILLED = 2
+SCALE_MAX = 12
+PADDING = 255  # cells past the last bucket
+
+# Largest cell edge in pixels, for small tables
+MAX_CELL = 24
+
+_EMPTY_RGB = (238, 238, 238)
+_TOMBSTONE_RGB = (120, 120, 120)
+_PADDING_RGB = (255, 255, 255)
+# Gradient for FILLED + 0 .. FILLED + SCALE_MAX: green -> amber -> red
+_GRADIENT = ((76, 175, 80), (255, 193, 7), (244, 67, 54))
+
+
+def _gradient(t):
+    """RGB at position t (0..1) along _GRADIENT."""
+    t = min(max(t, 0.0), 1.0) * (len(_GRADIENT) - 1)
+    i = min(int(t), len(_GRADIENT) - 2)
+    f = t - i
+    a, b = _GRADIENT[i], _GRADIENT[i + 1]
+    return tuple(round(a[c] + (b[c] - a[c]) * f) for c in range(3))
+
+
+def _build_palette():
+    palette = [_PADDING_RGB] * 256
+    palette[EMPTY] = _EMPTY_RGB
+    palette[TOMBSTONE_CODE] = _TOMBSTONE_RGB
+    for value in range(SCALE_MAX + 1):
+        palette[FILLED + value] = _gradient(value / SCALE_MAX)
+    return palette
+
+
+PALETTE = _build_palette()
+_CHANNELS = tuple(bytes(rgb[c] for rgb in PALETTE) for c in range(3))
+
+
+def color_of(code):
+    """Tk color string ('#rrggbb') for a cell code."""
+    return '#%02x%02x%02x' % PALETTE[code]
+
+
+def effective_metric(table, metric):
+    """The metric actually shown for table's mode."""
+    if metric == 'chain' and table.mode != 'chaining':
+        return 'occupancy'
+    if metric == 'probe' and table.mode == 'chaining':
+        return 'occupancy'
+    return metric
+
+
+def _probe_distance(table, key, index):
+    """Probes between key's home bucket and index, saturating at SCALE_MAX."""
+    # Same arithmetic as utils.hash1 / hash2, without building their explanations
+    num = abs(key) if type(key) is int else abs(normalize_key(key)[0])
+    m = table.size
+    h1 = num % m
+    if table.mode == 'linear':
+        return min((index - h1) % m, SCALE_MAX)
+    if table.mode == 'quadratic':
+        for i in range(SCALE_MAX):
+            if (h1 + i * i) % m == index:
+                return i
+        return SCALE_MAX
+    h2 = 1 + num % (m - 1) if m > 1 else 1
+    for i in range(SCALE_MAX):
+        if (h1 + i * h2) % m == index:
+            return i
+    return SCALE_MAX
+
+
+def bucket_code(table, index, metric='occupancy'):
+    """Cell code of one bucket (see EMPTY, TOMBSTONE_CODE, FILLED)."""
+    metric = effective_metric(table, metric)
+    slot = table.table[index]
+    if slot is None:
+        return EMPTY
+    if slot is TOMBSTONE:
+        return TOMBSTONE_CODE
+    if metric == 'chain':
+        length = 0
+        while slot is not None and length <= SCALE_MAX:
+            length += 1
+            slot = slot.next
+        return FILLED + min(length - 1, SCALE_MAX)
+    if metric == 'probe':
+        return FILLED + _probe_distance(table, slot, index)
+    return FILLED
+
+
+def bucket_codes(table, metric='occupancy') -> bytes:
+    """Cell codes of every bucket, one byte each."""
+    metric = effective_metric(table, metric)
+    codes = bytearray(table.size)
+    for index, slot in enumerate(table.table):
+        if slot is None:
+            continue
+        if slot is TOMBSTONE:
+            codes[index] = TOMBSTONE_CODE
+        elif metric == 'chain':
+            length = 0
+            while slot is not None and length <= SCALE_MAX:
+                length += 1
+                slot = slot.next
+            codes[index] = FILLED + min(length - 1, SCALE_MAX)
+        elif metric == 'probe':
+            codes[index] = FILLED + _probe_distance(table, slot, index)
+        else:
+            codes[index] = FILLED
+    return bytes(codes)
+
+
+def layout(size, max_width, max_height):
+    """
+    Choose (columns, cell) so that size cells of cell x cell pixels fill
+    max_width. Cells shrink until the grid also fits max_height; at one pixel
+    per bucket the image may be taller than max_height.
+    """
+    max_width = max(max_width, 1)
+    for cell in range(MAX_CELL, 0, -1):
+        columns = max(max_width // cell, 1)
+        rows = math.ceil(size / columns)
+        if rows * cell <= max_height or cell == 1:
+            # Don't leave the grid wider than the table needs
+            return min(columns, max(size, 1)), cell
+    return max_width, 1
+
+
+def cell_index(x, y, columns, cell, size):
+    """Bucket index under image pixel (x, y), or None outside the table."""
+    if x < 0 or y < 0:
+        return None
+    column = int(x) // cell
+    if column >= columns:
+        return None
+    index = (int(y) // cell) * columns + column
+    return index if index < size else None
+
+
+def to_ppm(codes, columns, cell=1) -> bytes:
+    """Binary PPM image of cell codes laid out in rows of columns cells."""
+    rows = max(math.ceil(len(codes) / columns), 1)
+    padded = bytes(codes) + bytes([PADDING]) * (rows * columns - len(codes))
+    width, height = columns * cell, rows * cell
+    header = b'P6 %d %d 255\n' % (width, height)
+    if np is not None:
+        grid = np.frombuffer(padded, dtype=np.uint8).reshape(rows, columns)
+        if cell > 1:
+            grid = grid.repeat(cell, axis=0).repeat(cell, axis=1)
+        return header + np.asarray(PALETTE, dtype=np.uint8)[grid].tobytes()
+    if cell > 1:
+        scaled = bytearray()
+        for r in range(rows):
+            row = bytes(b for b in padded[r * columns:(r + 1) * columns] for _ in range(cell))
+            scaled += row * cell
+        padded = bytes(scaled)
+    pixels = bytearray(len(padded) * 3)
+    for c in range(3):
+        pixels[c::3] = padded.translate(_CHANNELS[c])
+    return header + bytes(pixels)
+
+
+def ppm_to_png(ppm) -> bytes:
+    """PNG file contents of a binary PPM image made by to_ppm()."""
+    header_end = ppm.index(b'\n') + 1
+    _, width, height, _ = ppm[:header_end].split()
+    width, height = int(width), int(height)
+    pixels = memoryview(ppm)[header_end:]
+    stride = width * 3
+    # Each scanline starts with filter type 0 (none)
+    raw = b''.join(b'\x00' + pixels[r * stride:(r + 1) * stride] for r in range(height))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6))
+            + chunk(b'IEND', b''))
+
+
+def render(table, metric, max_width, max_height):
+    """
+    Heatmap of table for a view of max_width x max_height pixels.
+
+    Returns:
+        tuple: (ppm_bytes, columns, cell)
+    """
+    columns, cell = layout(table.size, max_width, max_height)
+    return to_ppm(bucket_codes(table, metric), columns, cell), columns, cell
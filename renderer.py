@@ -0,0 +1,753 @@
+"""
+Bucket view rendering, independent of the display.
+
+TableRenderer draws a hash table's bucket view (header, one row per bucket,
+chain links, footer) on a canvas backend. Items are retained between draws:
+the scene is rebuilt only when the table, its size or its mode changes, and
+otherwise only buckets whose contents differ from what was drawn are
+restyled. Buckets exist as items only while they are in or near the
+backend's viewport.
+
+A backend is any object with the part of the tkinter.Canvas API used here:
+create_rectangle / create_oval / create_text, itemconfig, coords, delete
+(by item id, tag or 'all'), bbox('all'), configure(scrollregion=...),
+canvasy, yview_moveto, winfo_width / winfo_height and cget. A
+tkinter.Canvas is the Tk backend as it is. SVGCanvas is an offscreen backend
+that keeps the items in memory and writes them as SVG, so snapshots can be
+rendered in batch jobs and the draw path profiled without a display:
+
+    python renderer.py table.svg --size 50 --mode linear --keys 30
+    python renderer.py big.png --size 1000000 --keys 700000 --heatmap probe
+
+Author: Hash Table Simulator
+"""
+
+import argparse
+import random
+import time
+from xml.sax.saxutils import escape, quoteattr
+
+
+class TableRenderer:
+    """
+    Retained bucket view of one hash table on a canvas backend.
+
+    Attributes:
+        canvas: The backend drawn on
+        inline_header (bool): The summary header is shown elsewhere (the GUI
+            control panel), so the scene starts with the buckets
+        table: The table the current scene was built for, or None
+    """
+
+    # Color scheme
+    COLOR_EMPTY = "#FFFFFF"
+    COLOR_FILLED = "#4CAF50"
+    COLOR_COLLISION = "#FF9800"
+    COLOR_BORDER = "#333333"
+    COLOR_TEXT = "#000000"
+
+    # Bucket layout
+    BUCKET_WIDTH = 120
+    BUCKET_HEIGHT = 60
+    BUCKET_MARGIN = 20
+    BUCKET_X = 50
+    # Extra bucket rows kept drawn above and below the visible part of the canvas
+    VIEWPORT_OVERSCAN = 5
+
+    def __init__(self, canvas, inline_header=False):
+        self.canvas = canvas
+        self.inline_header = inline_header
+        self.table = None
+        self._scene_key = None
+        self._version = None
+        self._header_items = {}
+        self.bucket_items = {}
+        self._bucket_sigs = {}
+        # Buckets recolored by tint_bucket(), restored by the next draw()
+        self.tinted = set()
+        self._y_start = 0
+        self.scene_top = 0
+        self.scene_bottom = 0
+
+    def reset(self):
+        """Forget the scene (the canvas was cleared for something else); draw() rebuilds it."""
+        self.table = None
+
+    def draw(self, table, changed=None):
+        """
+        Bring the canvas in line with table.
+
+        Args:
+            table: The HashTable to show
+            changed: Optional indices of the buckets a mutation touched; when
+                given, only those buckets are compared instead of all drawn ones
+        """
+        scene_key = (table.size, table.mode, self.inline_header)
+        if table is not self.table or scene_key != self._scene_key:
+            self.build_scene(table)
+            self._scene_key = scene_key
+        else:
+            # Buckets recolored by an animation go back to their normal look
+            dirty = False
+            for i in self.tinted:
+                if i in self.bucket_items:
+                    self._sync_bucket(i, force=True)
+            self.tinted.clear()
+            if table.version != self._version:
+                indices = list(self.bucket_items) if changed is None else changed
+                for i in indices:
+                    if i in self.bucket_items:
+                        dirty = self._sync_bucket(i) or dirty
+            if dirty:
+                self._update_scroll_region()
+        self._version = table.version
+        self.render_viewport()
+        self.update_header()
+
+    def build_scene(self, table):
+        """Create the header and footer for table; buckets follow in render_viewport()."""
+        self.canvas.delete("all")
+        self.table = table
+        self._header_items = {}
+        self.bucket_items = {}
+        self._bucket_sigs = {}
+        self.tinted = set()
+
+        size = table.size
+        inline = self.inline_header
+        # If header is drawn inline, start near top; otherwise leave room for header
+        y_start = 30 if inline else 150
+        self._y_start = y_start
+
+        # ========== DECORATIVE HEADER ==========
+        if not inline:
+            header_height = 130
+            for i in range(0, header_height, 2):
+                shade = 250 - int(i * 0.3)
+                color = f"#{shade:02x}{shade:02x}{255:02x}"
+                self.canvas.create_rectangle(0, i, 1000, i+2, fill=color, outline=color)
+            self.canvas.create_text(250, 25, text="🔐 HASH TABLE VISUALIZER", font=("Arial", 20, "bold"), fill="#000080", anchor="center")
+            stats_y = 90
+            gauge_x, gauge_y, gauge_w, gauge_h = 330, stats_y-10, 150, 20
+            self._header_items = {
+                "mode": self.canvas.create_text(250, 55, font=("Arial", 16, "bold"), fill="#4B0082", anchor="center"),
+                "size": self.canvas.create_text(80, stats_y, font=("Arial", 12, "bold"), fill="#0b5394", anchor="w"),
+                "count": self.canvas.create_text(220, stats_y, font=("Arial", 12, "bold"), fill="#0b5394", anchor="w"),
+                "gauge": self.canvas.create_rectangle(gauge_x, gauge_y, gauge_x+gauge_w, gauge_y+gauge_h, outline="#777", width=2, fill="#eee"),
+                "gauge_fill": self.canvas.create_rectangle(gauge_x, gauge_y, gauge_x, gauge_y+gauge_h, outline="", state="hidden"),
+                "load": self.canvas.create_text(gauge_x+gauge_w-15, gauge_y+gauge_h/2, font=("Arial", 11, "bold"), fill="#000", anchor="e"),
+                "collisions": self.canvas.create_text(80, stats_y+25, font=("Arial", 12, "bold"), fill="#6a1b9a", anchor="w"),
+                "hash": self.canvas.create_text(330, stats_y+25, font=("Arial", 12), fill="#333", anchor="w"),
+            }
+
+        # ========== FOOTER INFO ==========
+        footer_y = y_start + size * (self.BUCKET_HEIGHT + self.BUCKET_MARGIN) + 20
+
+        # Tips box
+        self.canvas.create_rectangle(
+            20, footer_y,
+            480, footer_y + 60,
+            fill="#e3f2fd",
+            outline="#2196f3",
+            width=2
+        )
+
+        self.canvas.create_text(
+            250, footer_y + 15,
+            text="💡 Quick Tips",
+            font=("Arial", 11, "bold"),
+            fill="#1976d2"
+        )
+
+        tips = {
+            "chaining": "Chains can grow indefinitely • No table full condition",
+            "linear": "Sequential probing • Watch for primary clustering",
+            "quadratic": "i² spacing reduces clustering • Best with prime m",
+            "double": "Dual hash functions • Minimal clustering"
+        }
+
+        tip_text = tips.get(table.mode, "Hash table operations")
+        self.canvas.create_text(
+            250, footer_y + 40,
+            text=tip_text,
+            font=("Arial", 10),
+            fill="#424242"
+        )
+
+        # The scroll region spans every bucket, drawn or not
+        self.scene_top = 0 if not inline else y_start - 5
+        self.scene_bottom = footer_y + 62
+        self._update_scroll_region()
+        self.canvas.yview_moveto(0)
+
+    def _update_scroll_region(self):
+        """Size the scroll region to the full table (width follows the longest drawn chain)."""
+        bbox = self.canvas.bbox("all")
+        right = max(bbox[2] if bbox else 0, 520)
+        self.canvas.configure(scrollregion=(0, self.scene_top, right, self.scene_bottom))
+
+    def bucket_y(self, i):
+        """Canvas y of the top of bucket i."""
+        return self._y_start + i * (self.BUCKET_HEIGHT + self.BUCKET_MARGIN)
+
+    def viewport_width(self):
+        width = self.canvas.winfo_width()
+        return width if width > 1 else int(self.canvas.cget("width"))
+
+    def viewport_height(self):
+        height = self.canvas.winfo_height()
+        # Not mapped yet: fall back to the requested height
+        return height if height > 1 else int(self.canvas.cget("height"))
+
+    def visible_bucket_range(self):
+        """(first, last) bucket indices in view, widened by VIEWPORT_OVERSCAN rows."""
+        row = self.BUCKET_HEIGHT + self.BUCKET_MARGIN
+        top = self.canvas.canvasy(0)
+        bottom = top + self.viewport_height()
+        first = max(0, int((top - self._y_start) // row) - self.VIEWPORT_OVERSCAN)
+        last = min(self.table.size, int((bottom - self._y_start) // row) + 1 + self.VIEWPORT_OVERSCAN)
+        return first, max(first, last)
+
+    def render_viewport(self):
+        """Create items for buckets that scrolled into view and delete those that left it."""
+        if self.table is None:
+            return
+        first, last = self.visible_bucket_range()
+        for i in [i for i in self.bucket_items if not first <= i < last]:
+            self.canvas.delete(f"slot_{i}")
+            del self.bucket_items[i]
+            self._bucket_sigs.pop(i, None)
+            self.tinted.discard(i)
+        for i in range(first, last):
+            if i not in self.bucket_items:
+                self._create_bucket(i, self.bucket_y(i))
+                self._sync_bucket(i, force=True)
+
+    def scroll_to_bucket(self, index):
+        """Scroll bucket index into view (centered) if it is not visible, and draw it."""
+        if self.table is None or not 0 <= index < self.table.size:
+            return
+        top = self.canvas.canvasy(0)
+        height = self.viewport_height()
+        y = self.bucket_y(index)
+        if top <= y and y + self.BUCKET_HEIGHT <= top + height:
+            return
+        span = self.scene_bottom - self.scene_top
+        target = y + self.BUCKET_HEIGHT / 2 - height / 2 - self.scene_top
+        self.canvas.yview_moveto(max(0.0, target / span))
+        self.render_viewport()
+
+    def tint_bucket(self, index, color):
+        """Recolor bucket index; restore_bucket() or the next draw() undoes it."""
+        self.scroll_to_bucket(index)
+        self.canvas.itemconfig(f"bucket_{index}", fill=color)
+        self.tinted.add(index)
+
+    def restore_bucket(self, index):
+        """Undo tint_bucket() on one bucket."""
+        if index in self.bucket_items:
+            self._sync_bucket(index, force=True)
+        self.tinted.discard(index)
+
+    def update_header(self):
+        """Refresh the retained header texts and load-factor gauge in place."""
+        items = self._header_items
+        if not items:
+            return
+        table = self.table
+        size = table.size
+        load_factor = table.get_load_factor()
+        mode = table.mode.upper()
+        mode_icons = {"CHAINING":"🔗","LINEAR":"➡️","QUADRATIC":"📐","DOUBLE":"🔁"}
+        icon = mode_icons.get(mode, "🔐")
+        collisions = getattr(table, 'collision_count', 0)
+        self.canvas.itemconfig(items["mode"], text=f"{icon}  Mode: {mode}")
+        self.canvas.itemconfig(items["size"], text=f"🧮  Size: {size}")
+        self.canvas.itemconfig(items["count"], text=f"⚙️  Elements: {table.count}")
+        self.canvas.itemconfig(items["load"], text=f"{load_factor:.2f}")
+        self.canvas.itemconfig(items["collisions"], text=f"✳️  Collisions: {collisions}")
+        self.canvas.itemconfig(items["hash"], text=f"🧩  Hash: h(k) = k mod {size}")
+        gauge_x, gauge_y, gauge_right, gauge_bottom = self.canvas.coords(items["gauge"])
+        gauge_w = gauge_right - gauge_x
+        fill_w = int(gauge_w * load_factor) if load_factor <= 1 else gauge_w
+        lf_color = "#4CAF50" if load_factor < 0.5 else ("#FFC107" if load_factor < 0.75 else "#F44336")
+        self.canvas.coords(items["gauge_fill"], gauge_x, gauge_y, gauge_x + fill_w, gauge_bottom)
+        self.canvas.itemconfig(items["gauge_fill"], fill=lf_color, state="normal" if fill_w > 0 else "hidden")
+
+    def _create_bucket(self, i, y):
+        """Create the retained items of bucket i; _render_bucket styles them."""
+        bucket_width, bucket_height, x_offset = self.BUCKET_WIDTH, self.BUCKET_HEIGHT, self.BUCKET_X
+        # bucket_{i}: items recolored by highlights; slot_{i}: every item of the row
+        slot = f"slot_{i}"
+        tag = (f"bucket_{i}", slot)
+
+        # Decorative row background (alternating subtle colors)
+        row_color = "#fafafa" if i % 2 == 0 else "#ffffff"
+        self.canvas.create_rectangle(
+            0, y - 5,
+            520, y + bucket_height + 5,
+            fill=row_color,
+            outline="",
+            tags=slot
+        )
+
+        # Bucket index label with icon
+        index_icon = "▶" if i < 10 else "⏩"
+        self.canvas.create_text(
+            x_offset - 35,
+            y + bucket_height // 2,
+            text=f"{index_icon}",
+            font=("Arial", 10),
+            fill="#4a90e2",
+            tags=slot
+        )
+
+        self.canvas.create_text(
+            x_offset - 15,
+            y + bucket_height // 2,
+            text=f"{i}",
+            font=("Arial", 12, "bold"),
+            fill=self.COLOR_TEXT,
+            tags=slot
+        )
+
+        # First slot: empty, tombstone or the first key, restyled in place
+        rect = self.canvas.create_rectangle(
+            x_offset, y,
+            x_offset + bucket_width, y + bucket_height,
+            outline=self.COLOR_BORDER,
+            width=2,
+            tags=tag
+        )
+
+        # Dotted pattern for empty, shown only while the bucket is empty
+        for dx in range(10, bucket_width, 20):
+            for dy in range(10, bucket_height, 20):
+                self.canvas.create_oval(
+                    x_offset + dx - 1, y + dy - 1,
+                    x_offset + dx + 1, y + dy + 1,
+                    outline="",
+                    tags=(*tag, f"dots_{i}")
+                )
+
+        # Key icon
+        icon = self.canvas.create_text(
+            x_offset + 20, y + bucket_height // 2,
+            text="🔑",
+            font=("Arial", 12),
+            tags=tag
+        )
+
+        label = self.canvas.create_text(
+            x_offset + bucket_width // 2,
+            y + bucket_height // 2,
+            tags=tag
+        )
+
+        self.bucket_items[i] = {"y": y, "rect": rect, "icon": icon, "label": label, "links": []}
+
+    def _sync_bucket(self, i, force=False):
+        """Redraw bucket i if its contents changed since it was last drawn."""
+        contents = self.table.get_bucket_contents(i)
+        signature = tuple(contents)
+        if not force and self._bucket_sigs.get(i) == signature:
+            return False
+        self._bucket_sigs[i] = signature
+        self._render_bucket(i, contents)
+        return True
+
+    def _render_bucket(self, i, contents):
+        """Style the retained items of bucket i for its contents."""
+        items = self.bucket_items[i]
+        y = items["y"]
+        bucket_width, bucket_height, x_offset = self.BUCKET_WIDTH, self.BUCKET_HEIGHT, self.BUCKET_X
+        center_x = x_offset + bucket_width // 2
+        center_y = y + bucket_height // 2
+        c = self.canvas
+
+        if not contents:
+            # Empty bucket with creative styling
+            c.itemconfig(items["rect"], fill=self.COLOR_EMPTY, stipple="")
+            c.itemconfig(f"dots_{i}", fill="#e0e0e0", state="normal")
+            c.itemconfig(items["icon"], state="hidden")
+            c.itemconfig(items["label"], text="∅ EMPTY", font=("Arial", 10, "italic"), fill="#cccccc")
+            c.coords(items["label"], center_x, center_y)
+        elif self.table.mode != 'chaining' and contents[0] == "TOMBSTONE":
+            # Tombstone styling
+            c.itemconfig(items["rect"], fill="#9e9e9e", stipple="gray50")
+            c.itemconfig(f"dots_{i}", state="hidden")
+            c.itemconfig(items["icon"], state="hidden")
+            c.itemconfig(items["label"], text="🪦 TOMBSTONE", font=("Arial", 10, "bold"), fill="white")
+            c.coords(items["label"], center_x, center_y)
+        else:
+            # First (or only) key
+            c.itemconfig(items["rect"], fill=self.COLOR_FILLED, stipple="")
+            c.itemconfig(f"dots_{i}", state="hidden")
+            c.itemconfig(items["icon"], fill=self.COLOR_TEXT, state="normal")
+            c.itemconfig(items["label"], text=str(contents[0]), font=("Arial", 12, "bold"), fill="white")
+            c.coords(items["label"], center_x + 10, center_y)
+
+        # Chain links after the first key: reuse, add or drop link items
+        links = items["links"]
+        extra = list(contents[1:]) if self.table.mode == 'chaining' else []
+        while len(links) > len(extra):
+            for item in links.pop():
+                c.delete(item)
+        for idx in range(1, len(extra) + 1):
+            if idx > len(links):
+                links.append(self._create_chain_link(i, idx, y))
+            arrow, badge, badge_text, rect, icon, text = links[idx - 1]
+            c.itemconfig(rect, fill=self.COLOR_COLLISION)
+            c.itemconfig(icon, fill=self.COLOR_TEXT)
+            c.itemconfig(text, text=str(extra[idx - 1]), fill="white")
+
+    def _create_chain_link(self, i, idx, y):
+        """Create the items of chain link idx (> 0) of bucket i, with the arrow leading to it."""
+        bucket_width, bucket_height = self.BUCKET_WIDTH, self.BUCKET_HEIGHT
+        x = self.BUCKET_X + idx * (bucket_width + 15)
+        slot = f"slot_{i}"
+        tag = (f"bucket_{i}", slot)
+
+        # Arrow from the previous link
+        arrow = self.canvas.create_text(
+            x - 8,
+            y + bucket_height // 2,
+            text="⇨",
+            font=("Arial", 16, "bold"),
+            fill=self.COLOR_COLLISION,
+            tags=slot
+        )
+
+        # Chain link number badge
+        badge = self.canvas.create_oval(
+            x - 10, y + bucket_height//2 - 10,
+            x - 10 + 20, y + bucket_height//2 + 10,
+            fill="#ff9800",
+            outline="#f57c00",
+            width=2,
+            tags=slot
+        )
+        badge_text = self.canvas.create_text(
+            x, y + bucket_height//2,
+            text=str(idx),
+            font=("Arial", 9, "bold"),
+            fill="white",
+            tags=slot
+        )
+
+        # Rectangle for key
+        rect = self.canvas.create_rectangle(
+            x, y,
+            x + bucket_width, y + bucket_height,
+            outline=self.COLOR_BORDER,
+            width=2,
+            tags=tag
+        )
+
+        # Key icon
+        icon = self.canvas.create_text(
+            x + 20, y + bucket_height // 2,
+            text="🔑",
+            font=("Arial", 12),
+            tags=tag
+        )
+
+        # Key text
+        text = self.canvas.create_text(
+            x + bucket_width // 2 + 10,
+            y + bucket_height // 2,
+            font=("Arial", 12, "bold"),
+            tags=tag
+        )
+        return arrow, badge, badge_text, rect, icon, text
+
+
+class SVGCanvas:
+    """
+    Offscreen canvas backend: keeps items in memory and writes them as SVG.
+
+    Items follow Tk's defaults (rectangles and ovals unfilled with a black
+    outline, black text anchored at its center) and its stacking order.
+    Hidden items and items outside the view are left out of the output.
+
+    Attributes:
+        width (int): Image width in pixels
+        height (Optional[int]): Viewport height in pixels; None shows the
+            whole scroll region, so every bucket is drawn
+        operations (int): Item calls made so far (create, itemconfig,
+            coords, delete), for profiling the draw path
+    """
+
+    # Text width estimate per point of font size, used by bbox()
+    CHAR_WIDTH = 0.6
+
+    def __init__(self, width=600, height=None, background="#ffffff"):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.items = {}
+        # tag -> ids of the items carrying it, in creation order
+        self._tagged = {}
+        self.operations = 0
+        self.scrollregion = (0, 0, width, height or 0)
+        self.top = 0
+        self._next_id = 1
+
+    # ----- Tk canvas interface -----
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def itemconfig(self, ref, **options):
+        self.operations += 1
+        tags = options.pop("tags", None)
+        for item in self._find(ref):
+            self.items[item]["options"].update(options)
+            if tags is not None:
+                self._untag(item)
+                self._tag(item, self._tags(tags))
+
+    def coords(self, ref, *coords):
+        items = self._find(ref)
+        if not coords:
+            return list(self.items[items[0]]["coords"]) if items else []
+        self.operations += 1
+        for item in items:
+            self.items[item]["coords"] = [float(c) for c in coords]
+
+    def delete(self, ref):
+        self.operations += 1
+        for item in self._find(ref):
+            self._untag(item)
+            del self.items[item]
+
+    def bbox(self, ref):
+        boxes = [self._bounds(self.items[item]) for item in self._find(ref)
+                 if self.items[item]["options"].get("state") != "hidden"]
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+    def configure(self, **options):
+        if "scrollregion" in options:
+            self.scrollregion = tuple(float(v) for v in options["scrollregion"])
+
+    config = configure
+
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return self.top + y
+
+    def yview_moveto(self, fraction):
+        region_top, region_bottom = self.scrollregion[1], self.scrollregion[3]
+        top = region_top + fraction * (region_bottom - region_top)
+        # Like Tk, stop scrolling once the bottom of the region is in view
+        self.top = max(region_top, min(top, region_bottom - self.winfo_height()))
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        if self.height is not None:
+            return self.height
+        return int(self.scrollregion[3] - self.scrollregion[1])
+
+    def cget(self, option):
+        return str(self.winfo_width() if option == "width" else self.winfo_height())
+
+    # ----- Output -----
+
+    def to_svg(self):
+        """The current view as an SVG document."""
+        width, height = self.width, self.winfo_height()
+        top = self.top if self.height is not None else self.scrollregion[1]
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 {top:g} {width} {height}">',
+            f'<rect x="0" y="{top:g}" width="{width}" height="{height}" fill="{self.background}"/>',
+        ]
+        for item in self.items.values():
+            if item["options"].get("state") == "hidden":
+                continue
+            _, item_top, _, item_bottom = self._bounds(item)
+            # Items scrolled out of view (overscan rows, the header) are left out
+            if item_bottom >= top and item_top <= top + height:
+                parts.append(self._svg_element(item))
+        parts.append("</svg>")
+        return "\n".join(parts) + "\n"
+
+    def save(self, path):
+        """Write to_svg() to path."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_svg())
+
+    # ----- Internals -----
+
+    def _create(self, kind, coords, options):
+        self.operations += 1
+        item = self._next_id
+        self._next_id += 1
+        self.items[item] = {"kind": kind, "coords": [float(c) for c in coords], "tags": set(), "options": options}
+        self._tag(item, self._tags(options.pop("tags", ())))
+        return item
+
+    def _tag(self, item, tags):
+        self.items[item]["tags"] = tags
+        for tag in tags:
+            self._tagged.setdefault(tag, {})[item] = None
+
+    def _untag(self, item):
+        for tag in self.items[item]["tags"]:
+            tagged = self._tagged[tag]
+            del tagged[item]
+            if not tagged:
+                del self._tagged[tag]
+
+    @staticmethod
+    def _tags(tags):
+        return {tags} if isinstance(tags, str) else set(tags)
+
+    def _find(self, ref):
+        if ref == "all":
+            return list(self.items)
+        if isinstance(ref, int):
+            return [ref] if ref in self.items else []
+        return list(self._tagged.get(ref, ()))
+
+    @staticmethod
+    def _font(options):
+        """(family, size in points, styles) of an item's font option."""
+        font = options.get("font") or ("Arial", 10)
+        if isinstance(font, str):
+            font = font.split()
+        family = font[0]
+        size = abs(int(font[1])) if len(font) > 1 else 10
+        return family, size, set(font[2:])
+
+    def _bounds(self, item):
+        coords = item["coords"]
+        if item["kind"] != "text":
+            return (min(coords[0::2]), min(coords[1::2]), max(coords[0::2]), max(coords[1::2]))
+        # Text: estimate the extent from the font size and anchor
+        _, size, _ = self._font(item["options"])
+        w = len(str(item["options"].get("text", ""))) * size * self.CHAR_WIDTH
+        h = size * 1.4
+        x, y = coords[0], coords[1]
+        anchor = item["options"].get("anchor", "center")
+        left = x if "w" in anchor else (x - w if "e" in anchor else x - w / 2)
+        top = y if anchor.startswith("n") else (y - h if anchor.startswith("s") else y - h / 2)
+        return (left, top, left + w, top + h)
+
+    @staticmethod
+    def _paint(value, default):
+        """SVG paint for a Tk color option ('' means none)."""
+        if value is None:
+            value = default
+        return quoteattr(value or "none")
+
+    def _svg_element(self, item):
+        options = item["options"]
+        coords = item["coords"]
+        if item["kind"] == "text":
+            family, size, styles = self._font(options)
+            anchor = options.get("anchor", "center")
+            text_anchor = "start" if "w" in anchor else ("end" if "e" in anchor else "middle")
+            baseline = "hanging" if anchor.startswith("n") else ("text-after-edge" if anchor.startswith("s") else "central")
+            style = ' font-weight="bold"' if "bold" in styles else ""
+            style += ' font-style="italic"' if "italic" in styles else ""
+            return (f'<text x="{coords[0]:g}" y="{coords[1]:g}" font-family={quoteattr(family)} '
+                    f'font-size="{size}pt"{style} text-anchor="{text_anchor}" dominant-baseline="{baseline}" '
+                    f'fill={self._paint(options.get("fill"), "black")}>{escape(str(options.get("text", "")))}</text>')
+        x0, y0, x1, y1 = min(coords[0], coords[2]), min(coords[1], coords[3]), max(coords[0], coords[2]), max(coords[1], coords[3])
+        paint = (f'fill={self._paint(options.get("fill"), "")} stroke={self._paint(options.get("outline"), "black")} '
+                 f'stroke-width="{options.get("width", 1)}"')
+        if options.get("stipple"):
+            paint += ' fill-opacity="0.5"'
+        if item["kind"] == "oval":
+            return (f'<ellipse cx="{(x0 + x1) / 2:g}" cy="{(y0 + y1) / 2:g}" '
+                    f'rx="{(x1 - x0) / 2:g}" ry="{(y1 - y0) / 2:g}" {paint}/>')
+        return f'<rect x="{x0:g}" y="{y0:g}" width="{x1 - x0:g}" height="{y1 - y0:g}" {paint}/>'
+
+
+def render_svg(table, path=None, first=0, rows=None, width=600, inline_header=False):
+    """
+    Render table's bucket view offscreen.
+
+    Args:
+        table: The HashTable to draw
+        path: Optional file to write the SVG to
+        first: Bucket shown at the top when rows is set
+        rows: Bucket rows in view; None draws every bucket
+        width: Image width in pixels
+        inline_header: Leave out the summary header
+
+    Returns:
+        SVGCanvas: The drawn canvas
+    """
+    row = TableRenderer.BUCKET_HEIGHT + TableRenderer.BUCKET_MARGIN
+    canvas = SVGCanvas(width, None if rows is None else rows * row)
+    renderer = TableRenderer(canvas, inline_header=inline_header)
+    renderer.VIEWPORT_OVERSCAN = 0
+    renderer.draw(table)
+    if rows is not None and first:
+        span = renderer.scene_bottom - renderer.scene_top
+        canvas.yview_moveto((renderer.bucket_y(first) - 5 - renderer.scene_top) / span)
+        renderer.render_viewport()
+    if path:
+        canvas.save(path)
+    return canvas
+
+
+def main():
+    """Render a random table to SVG (bucket view) or PNG/PPM (heatmap) and report timings."""
+    from hash_table import HashTable
+
+    parser = argparse.ArgumentParser(description="Render a hash table snapshot without a display.")
+    parser.add_argument("output", help="output file: .svg for the bucket view, .png or .ppm with --heatmap")
+    parser.add_argument("--size", type=int, default=20, help="number of buckets")
+    parser.add_argument("--mode", default="chaining", choices=["chaining", "linear", "quadratic", "double"])
+    parser.add_argument("--keys", type=int, default=15, help="random keys to insert")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--first", type=int, default=0, help="first bucket in view (with --rows)")
+    parser.add_argument("--rows", type=int, help="bucket rows in view (default: all)")
+    parser.add_argument("--heatmap", choices=["occupancy", "chain", "probe"], help="render a heatmap instead")
+    parser.add_argument("--width", type=int, default=600)
+    parser.add_argument("--height", type=int, default=600, help="heatmap height in pixels")
+    args = parser.parse_args()
+
+    table = HashTable(size=args.size, mode=args.mode)
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(args.size * 100), args.keys)
+    if args.mode != "chaining":
+        keys = keys[:args.size]
+    started = time.perf_counter()
+    for key in keys:
+        table.insert(key)
+    inserted = time.perf_counter()
+
+    if args.heatmap:
+        import heatmap
+        ppm, columns, cell = heatmap.render(table, args.heatmap, args.width, args.height)
+        image = ppm if args.output.lower().endswith(".ppm") else heatmap.ppm_to_png(ppm)
+        with open(args.output, "wb") as f:
+            f.write(image)
+        detail = f"{columns} columns, {cell}px cells"
+    else:
+        canvas = render_svg(table, args.output, args.first, args.rows, args.width)
+        detail = f"{len(canvas.items)} items, {canvas.operations} canvas calls"
+    done = time.perf_counter()
+    print(f"Inserted {len(keys)} keys in {(inserted - started) * 1000:.0f} ms; "
+          f"rendered {args.output} ({detail}) in {(done - inserted) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
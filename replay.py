@@ -0,0 +1,146 @@
+"""
+Step replay timelines for the GUI stepper.
+
+Compiles the step dicts recorded by HashTable's tracer ({'line', 'text',
+'vars', 'highlight_bucket'}) into a timeline of frames held in parallel
+arrays. Each frame's bucket highlight is resolved at compile time (a step
+without a bucket keeps the previous one), so seeking to any frame is O(1)
+and moving between two frames touches at most two buckets.
+
+Timelines export to JSON in the tracer's step format, the same shape the
+web API returns as 'steps', and load back from it.
+
+Author: Hash Table Simulator
+"""
+
+import json
+from array import array
+from typing import Optional, Tuple
+
+
+NO_BUCKET = -1
+
+# How a frame's bucket is highlighted
+PROBE = 0
+COLLISION = 1
+PLACED = 2
+
+
+def classify(text: str) -> int:
+    """Highlight kind for a step's text."""
+    lowered = text.lower()
+    if '✓' in text or 'success' in lowered or 'complete' in lowered or '] = ' in text:
+        return PLACED
+    if 'collision' in lowered or 'occupied' in lowered or 'already' in lowered:
+        return COLLISION
+    return PROBE
+
+
+class Timeline:
+    """
+    Replayable frames of one recorded operation.
+
+    Attributes:
+        title (str): What was recorded, e.g. "Insert 42"
+        position (int): Current frame, -1 before the first one
+    """
+
+    def __init__(self, title: str = ''):
+        self.title = title
+        self.lines = array('i')
+        # Bucket highlighted once the frame is shown, or NO_BUCKET
+        self.buckets = array('i')
+        self.kinds = array('b')
+        self.texts: list = []
+        self.vars: list = []
+        self.position = -1
+
+    @classmethod
+    def compile(cls, steps, title: str = '') -> 'Timeline':
+        """
+        Build a timeline from recorded steps.
+
+        Args:
+            steps: Iterable of tracer step dicts
+            title: Label for the recording
+
+        Returns:
+            Timeline: Positioned before the first frame
+        """
+        timeline = cls(title)
+        bucket, kind = NO_BUCKET, PROBE
+        for step in steps:
+            text = step.get('text', '')
+            highlight = step.get('highlight_bucket')
+            if highlight is not None and highlight >= 0:
+                bucket, kind = highlight, classify(text)
+            timeline.lines.append(step.get('line', 1))
+            timeline.buckets.append(bucket)
+            timeline.kinds.append(kind)
+            timeline.texts.append(text)
+            timeline.vars.append(step.get('vars') or {})
+        return timeline
+
+    def __len__(self):
+        return len(self.lines)
+
+    @property
+    def at_end(self) -> bool:
+        return self.position >= len(self.lines) - 1
+
+    def frame(self, position: Optional[int] = None) -> Optional[dict]:
+        """Frame at position (default: the current one), None before the start."""
+        if position is None:
+            position = self.position
+        if not 0 <= position < len(self.lines):
+            return None
+        bucket = self.buckets[position]
+        return {
+            'line': self.lines[position],
+            'text': self.texts[position],
+            'vars': self.vars[position],
+            'bucket': None if bucket == NO_BUCKET else bucket,
+            'kind': self.kinds[position],
+        }
+
+    def _bucket_at(self, position: int) -> Optional[int]:
+        if position < 0:
+            return None
+        bucket = self.buckets[position]
+        return None if bucket == NO_BUCKET else bucket
+
+    def seek(self, position: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Move to position (clamped to -1 .. len - 1).
+
+        Returns:
+            tuple: (bucket to un-highlight, bucket to highlight), either None
+        """
+        position = max(-1, min(position, len(self.lines) - 1))
+        old = self._bucket_at(self.position)
+        self.position = position
+        return old, self._bucket_at(position)
+
+    def step(self, delta: int = 1) -> Tuple[Optional[int], Optional[int]]:
+        """Move delta frames forward (negative: backward); see seek()."""
+        return self.seek(self.position + delta)
+
+    def to_steps(self) -> list:
+        """Frames in the tracer's step format."""
+        return [
+            {'line': self.lines[i], 'text': self.texts[i], 'vars': self.vars[i],
+             'highlight_bucket': self._bucket_at(i)}
+            for i in range(len(self.lines))
+        ]
+
+    def export(self, path):
+        """Write the timeline to path as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'title': self.title, 'steps': self.to_steps()}, f, ensure_ascii=False, indent=1, default=str)
+
+    @classmethod
+    def load(cls, path) -> 'Timeline':
+        """Read a timeline written by export()."""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls.compile(data.get('steps', []), data.get('title', ''))
@@ -18,6 +18,59 @@ def print_header(text):
     print("="*60)
 
 
+# The API's hash_table and utils, once imported, so every API module shares them
+_API_SHARED_MODULES = {}
+
+
+def import_api_module(name):
+    """
+    Import a module from web-app/api together with the API's own copies of
+    hash_table and utils, leaving the root modules in place for other tests.
+    
+    Returns:
+        tuple: (module, the API's hash_table module)
+    """
+    import importlib
+    import os
+    shared = ("hash_table", "utils")
+    api_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web-app", "api")
+    saved = {m: sys.modules.pop(m) for m in shared if m in sys.modules}
+    sys.modules.update(_API_SHARED_MODULES)
+    sys.path.insert(0, api_dir)
+    try:
+        module = importlib.import_module(name)
+        _API_SHARED_MODULES.update((m, sys.modules[m]) for m in shared if m in sys.modules)
+        api_hash_table = sys.modules["hash_table"]
+    finally:
+        sys.path.remove(api_dir)
+        for m in shared:
+            sys.modules.pop(m, None)
+        sys.modules.update(saved)
+    return module, api_hash_table
+
+
+def import_web_api(name="index"):
+    """
+    Import an API app module (see import_api_module), or return None with a
+    warning when Flask or the other web-app requirements are not installed.
+    """
+    try:
+        return import_api_module(name)[0]
+    except ImportError as e:
+        print(f"⚠️  Web API not available ({e}); install web-app/api/requirements.txt")
+        return None
+
+
+def read_sse(body):
+    """Split a Server-Sent Events body into (event, data) pairs."""
+    import json
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
 def test_imports():
     """Test if all required modules can be imported."""
     print_header("TEST 1: Module Imports")
@@ -217,6 +270,655 @@ def test_console_display():
         return False
 
 
+def test_snapshot():
+    """Test binary snapshot save/load round trip."""
+    print_header("TEST 8: Snapshot Save/Load")
+    
+    import os
+    import tempfile
+    from hash_table import HashTable, TOMBSTONE, SNAPSHOT_HEADER_SIZE
+    
+    for mode in ['chaining', 'linear', 'quadratic', 'double']:
+        ht = HashTable(size=7, mode=mode)
+        for key in [10, 17, "Alice", 24, 2**70]:
+            ht.insert(key)
+        ht.delete(17)
+        
+        fd, path = tempfile.mkstemp(suffix=".htsnap")
+        os.close(fd)
+        try:
+            ht.save(path)
+            loaded = HashTable.load(path)
+        finally:
+            os.remove(path)
+        
+        same_slots = all(
+            (a is TOMBSTONE) == (b is TOMBSTONE)
+            for a, b in zip(ht.table, loaded.table)
+        )
+        same_version = loaded.version == ht.version == 6
+        # Format 1 snapshots (no version field) still load, at version 0
+        current = ht.to_bytes()
+        v1 = current[:4] + b'\x01' + current[5:SNAPSHOT_HEADER_SIZE - 8] + current[SNAPSHOT_HEADER_SIZE:]
+        old = HashTable.from_bytes(v1)
+        same_version &= old.version == 0 and old.get_all_keys() == ht.get_all_keys()
+        same_version &= HashTable.snapshot_version(ht.to_bytes()[:SNAPSHOT_HEADER_SIZE]) == 6
+        # Only the collision tally survives; the log holds real events only
+        same_tally = loaded.collision_count == ht.collision_count > 0 and loaded.collision_log == []
+        if (loaded.get_all_keys() == ht.get_all_keys() and loaded.count == ht.count
+                and same_slots and same_version and same_tally):
+            print(f"  ✅ {mode}: {loaded.count} keys restored with identical layout")
+        else:
+            print(f"  ❌ {mode}: snapshot round trip mismatch")
+            return False
+    
+    return True
+
+
+def test_frozen_table():
+    """Test freeze -> open -> lookups -> thaw for every mode."""
+    print_header("TEST 9: Frozen (Memory-Mapped) Tables")
+    
+    import os
+    import tempfile
+    frozen_table, api_hash_table = import_api_module("frozen_table")
+    HashTable, TOMBSTONE = api_hash_table.HashTable, api_hash_table.TOMBSTONE
+    
+    keys = [10, 21, "Alice", 2**70, 32, -5]
+    for mode in ['chaining', 'linear', 'quadratic', 'double']:
+        ht = HashTable(size=11, mode=mode, c1=2, c2=5)
+        for key in keys:
+            ht.insert(key)
+        ht.delete(21)
+        
+        fd, path = tempfile.mkstemp(suffix=".htfz")
+        os.close(fd)
+        try:
+            frozen_table.freeze(ht, path)
+            with frozen_table.FrozenHashTable.open(path) as frozen:
+                lookups_ok = all(frozen.search(k)[:2] == ht.search(k)[:2] for k in keys + ["Bob", 2**71])
+                lookups_ok = lookups_ok and all(
+                    frozen.get_bucket_contents(i) == ht.get_bucket_contents(i) for i in range(ht.size)
+                )
+                lookups_ok = lookups_ok and sorted(map(str, frozen.get_all_keys())) == sorted(map(str, ht.get_all_keys()))
+                thawed = frozen.thaw()
+        finally:
+            os.remove(path)
+        
+        if mode == 'chaining':
+            same_layout = all(thawed.get_bucket_contents(i) == ht.get_bucket_contents(i) for i in range(ht.size))
+        else:
+            same_layout = len(thawed.table) == len(ht.table) and all(
+                (a is TOMBSTONE and b is TOMBSTONE) or (a is not TOMBSTONE and a == b)
+                for a, b in zip(thawed.table, ht.table)
+            ) and TOMBSTONE in ht.table
+        same_fields = (
+            (thawed.c1, thawed.c2, thawed.version, thawed.count, thawed.collision_count)
+            == (ht.c1, ht.c2, ht.version, ht.count, ht.collision_count)
+            and thawed.collision_log == []
+        )
+        if lookups_ok and same_layout and same_fields:
+            print(f"  ✅ {mode}: lookups served from the mapped file; thaw() restores the table")
+        else:
+            print(f"  ❌ {mode}: frozen table differs from its source")
+            return False
+    
+    return True
+
+
+def test_write_ahead_log():
+    """Test WAL replay on top of the latest snapshot."""
+    print_header("TEST 10: Write-Ahead Log Recovery")
+    
+    import shutil
+    import tempfile
+    from wal import DurableHashTable
+    
+    directory = tempfile.mkdtemp()
+    try:
+        store = DurableHashTable(directory, size=7, mode='double', fsync='never')
+        for key in [10, 17, 24, "Bob"]:
+            store.table.insert(key)
+        store.table.delete(17)
+        store.compact()
+        store.table.resize(11)
+        store.table.insert(31)
+        expected = list(store.table.table)
+        store.close()
+        
+        recovered = DurableHashTable(directory)
+        layout_ok = recovered.table.table == expected and recovered.table.size == 11
+        recovered.close()
+    finally:
+        shutil.rmtree(directory)
+    
+    if layout_ok:
+        print("  ✅ Snapshot + log replay restored the exact table")
+        return True
+    print("  ❌ Recovered table differs from the original")
+    return False
+
+
+def test_traced_operations():
+    """Test that traced steps follow the real probe sequence."""
+    print_header("TEST 11: Traced Operations")
+    
+    from hash_table import HashTable
+    
+    ht = HashTable(size=7, mode='linear')
+    for key in [10, 17, 24]:
+        ht.insert(key)
+    ht.delete(17)
+    
+    steps = []
+    success, index, _, _ = ht.insert(31, tracer=steps.append)
+    probed = [s['highlight_bucket'] for s in steps if s['text'].startswith('idx =')]
+    trace_ok = success and probed == [3, 4, 5, 6] and steps[-1]['text'] == "RETURN success"
+    trace_ok = trace_ok and steps[-2]['highlight_bucket'] == index == 4
+    
+    steps = []
+    ht.insert(24, tracer=steps.append)
+    trace_ok = trace_ok and steps[-1]['text'] == "RETURN duplicate"
+    
+    if trace_ok:
+        print("  ✅ Insert trace reuses the tombstone after checking for duplicates")
+        return True
+    print("  ❌ Traced steps do not match the executed probe sequence")
+    return False
+
+
+def test_heatmap():
+    """Test heatmap cell codes, probe distances and image layout."""
+    print_header("TEST 12: Heatmap")
+    
+    import heatmap
+    from hash_table import HashTable
+    
+    ht = HashTable(size=7, mode='linear')
+    for key in [10, 17, 24]:
+        ht.insert(key)
+    ht.delete(17)
+    codes = heatmap.bucket_codes(ht, 'probe')
+    codes_ok = list(codes) == [0, 0, 0, heatmap.FILLED, heatmap.TOMBSTONE_CODE, heatmap.FILLED + 2, 0]
+    codes_ok = codes_ok and all(heatmap.bucket_code(ht, i, 'probe') == codes[i] for i in range(ht.size))
+    
+    chained = HashTable(size=5, mode='chaining')
+    for key in [1, 6, 11, 2]:
+        chained.insert(key)
+    codes_ok = codes_ok and list(heatmap.bucket_codes(chained, 'chain')) == [0, heatmap.FILLED + 2, heatmap.FILLED, 0, 0]
+    
+    ppm = heatmap.to_ppm(codes, columns=3, cell=2)
+    image_ok = ppm.startswith(b'P6 6 6 255\n') and len(ppm) == len(b'P6 6 6 255\n') + 6 * 6 * 3
+    image_ok = image_ok and heatmap.cell_index(5, 3, 3, 2, ht.size) == 5 and heatmap.cell_index(1, 5, 3, 2, ht.size) == 6
+    image_ok = image_ok and heatmap.cell_index(3, 5, 3, 2, ht.size) is None
+    
+    if codes_ok and image_ok:
+        print("  ✅ Heatmap codes match bucket state and cells map back to buckets")
+        return True
+    print("  ❌ Heatmap codes or layout are wrong")
+    return False
+
+
+def test_incremental_stats():
+    """Test that the O(1) statistics counters track every mutation."""
+    print_header("TEST 13: Incremental Statistics")
+    
+    from hash_table import HashTable
+    
+    ht = HashTable(size=5, mode='chaining')
+    for key in [1, 6, 11, 2]:
+        ht.insert(key)
+    ht.delete(6)
+    chain_ok = (ht.longest_chain, ht.used_buckets, ht.collision_count) == (2, 2, 2)
+    ht.delete(11)
+    chain_ok = chain_ok and ht.longest_chain == 1
+    
+    ht = HashTable(size=7, mode='linear')
+    for key in [10, 17, 24]:
+        ht.insert(key)
+    ht.delete(17)
+    open_ok = (ht.used_buckets, ht.tombstones) == (2, 1)
+    loaded = HashTable.from_bytes(ht.to_bytes())
+    open_ok = open_ok and (loaded.used_buckets, loaded.tombstones) == (2, 1)
+    ht.insert(31)
+    open_ok = open_ok and (ht.used_buckets, ht.tombstones) == (3, 0)
+    ht.resize(11)
+    open_ok = open_ok and (ht.used_buckets, ht.tombstones) == (3, 0)
+    
+    if chain_ok and open_ok:
+        print("  ✅ Chain lengths, used buckets and tombstones follow inserts and deletes")
+        return True
+    print("  ❌ Statistics counters drifted from the table contents")
+    return False
+
+
+def test_replay_timeline():
+    """Test compiling, seeking and exporting a recorded step timeline."""
+    print_header("TEST 14: Step Replay Timeline")
+    
+    import os
+    import tempfile
+    from hash_table import HashTable
+    from replay import Timeline, COLLISION, PLACED
+    
+    ht = HashTable(size=7, mode='linear')
+    for key in [10, 17]:
+        ht.insert(key)
+    steps = []
+    ht.insert(24, tracer=steps.append)
+    timeline = Timeline.compile(steps, "Insert 24")
+    
+    seek_ok = len(timeline) == len(steps) and timeline.position == -1
+    seek_ok = seek_ok and timeline.seek(len(steps) - 1) == (None, 5) and timeline.frame()['kind'] == PLACED
+    seek_ok = seek_ok and timeline.step(-1) == (5, 5) and timeline.seek(-10) == (5, None)
+    probes = [timeline.frame(i) for i in range(len(timeline)) if 'OCCUPIED' in timeline.texts[i]]
+    seek_ok = seek_ok and [f['bucket'] for f in probes] == [3, 4] and all(f['kind'] == COLLISION for f in probes)
+    
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        timeline.export(path)
+        loaded = Timeline.load(path)
+    finally:
+        os.remove(path)
+    export_ok = loaded.to_steps() == timeline.to_steps() and loaded.title == "Insert 24"
+    
+    if seek_ok and export_ok:
+        print(f"  ✅ {len(timeline)} recorded steps replay forwards, backwards and from a file")
+        return True
+    print("  ❌ Timeline frames do not match the recorded steps")
+    return False
+
+
+def test_headless_rendering():
+    """Test drawing the bucket view offscreen and writing SVG and PNG snapshots."""
+    print_header("TEST 15: Headless Rendering")
+    
+    import heatmap
+    from hash_table import HashTable
+    from renderer import TableRenderer, SVGCanvas, render_svg
+    
+    ht = HashTable(size=5, mode='chaining')
+    for key in [1, 6, 11, 3]:
+        ht.insert(key)
+    canvas = SVGCanvas(width=600)
+    renderer = TableRenderer(canvas)
+    renderer.draw(ht)
+    draw_ok = sorted(renderer.bucket_items) == [0, 1, 2, 3, 4]
+    labels = [canvas.items[renderer.bucket_items[i]["label"]]["options"]["text"] for i in range(ht.size)]
+    draw_ok = draw_ok and labels[1] == "1" and labels[3] == "3" and labels[0] == "∅ EMPTY"
+    draw_ok = draw_ok and len(renderer.bucket_items[1]["links"]) == 2
+    
+    # Only the changed bucket is restyled
+    operations = canvas.operations
+    ht.delete(3)
+    renderer.draw(ht, changed=[3])
+    draw_ok = draw_ok and canvas.items[renderer.bucket_items[3]["label"]]["options"]["text"] == "∅ EMPTY"
+    draw_ok = draw_ok and canvas.operations - operations < 30
+    
+    svg = canvas.to_svg()
+    svg_ok = svg.startswith("<svg") and svg.rstrip().endswith("</svg>") and ">11</text>" in svg
+    window = render_svg(HashTable(size=1000, mode='linear'), first=500, rows=4)
+    svg_ok = svg_ok and ">500</text>" in window.to_svg() and ">0</text>" not in window.to_svg()
+    
+    png = heatmap.ppm_to_png(heatmap.to_ppm(bytes([heatmap.EMPTY, heatmap.FILLED] * 3), columns=3, cell=2))
+    png_ok = png.startswith(b'\x89PNG\r\n\x1a\n') and png[16:24] == bytes([0, 0, 0, 6, 0, 0, 0, 4])
+    
+    if draw_ok and svg_ok and png_ok:
+        print(f"  ✅ Bucket view drawn offscreen ({len(canvas.items)} items) and saved as SVG; heatmaps as PNG")
+        return True
+    print("  ❌ Offscreen rendering does not match the table")
+    return False
+
+
+def test_table_stores():
+    """Test the table store backends, per-table locking and LRU/TTL eviction."""
+    print_header("TEST 16: Table Stores")
+    
+    import os
+    import shutil
+    import tempfile
+    import threading
+    try:
+        table_store, api_hash_table = import_api_module("table_store")
+    except ImportError as e:
+        print(f"⚠️  Table stores not available ({e}); install web-app/api/requirements.txt")
+        return True
+    HashTable = api_hash_table.HashTable
+    
+    directory = tempfile.mkdtemp()
+    try:
+        backends = [
+            ("memory", table_store.InProcessTableStore()),
+            ("shm", table_store.SharedMemoryTableStore(os.path.join(directory, "shm"))),
+            ("redis (in-process stand-in)", table_store.RedisTableStore()),
+        ]
+        for name, store in backends:
+            table_id = store.create(HashTable(size=101, mode='linear'))
+            
+            # Concurrent get/insert/put cycles under the table's write lock
+            def writer(base):
+                for key in range(base, base + 25):
+                    with store.lock(table_id):
+                        table = store.get(table_id)
+                        table.insert(key)
+                        store.put(table_id, table)
+            threads = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            table = store.get(table_id)
+            ok = table.count == 100 and store.version(table_id) == 100 and table.search(3024)[0]
+            ok = ok and store.create(HashTable(size=3)) != table_id and len(store) == 2
+            ok = ok and store.delete(table_id) and not store.delete(table_id)
+            ok = ok and table_id not in store and store.get(table_id) is None and store.version(table_id) is None
+            if ok:
+                print(f"  ✅ {name}: 100 concurrent locked inserts kept, then deleted")
+            else:
+                print(f"  ❌ {name}: store lost updates or kept a deleted table")
+                return False
+        
+        # Evicted tables are spilled to disk and reloaded on the next get()
+        spill_dir = os.path.join(directory, "spill")
+        now = [0.0]
+        store = table_store.EvictingTableStore(max_tables=2, ttl_seconds=60, spill_dir=spill_dir,
+                                               clock=lambda: now[0])
+        ids = [store.create(HashTable(size=5, mode='chaining')) for _ in range(3)]
+        spill_ok = store.stats()['tables'] == 2 and os.listdir(spill_dir) == [ids[0] + ".htsnap"]
+        reloaded = store.get(ids[0])
+        spill_ok = spill_ok and reloaded is not None and os.listdir(spill_dir) == [ids[1] + ".htsnap"]
+        store.put(ids[1], HashTable(size=5))
+        spill_ok = spill_ok and ids[1] + ".htsnap" not in os.listdir(spill_dir)
+        spill_ok = spill_ok and all(table_id in store for table_id in ids)
+        
+        # A table whose lock is held stays in memory; idle tables expire
+        with store.lock(ids[0]):
+            store.create(HashTable(size=5))
+            spill_ok = spill_ok and ids[0] + ".htsnap" not in os.listdir(spill_dir)
+        now[0] += 120
+        newest = store.create(HashTable(size=5))
+        spill_ok = spill_ok and store.stats()['tables'] == 1 and ids[0] + ".htsnap" in os.listdir(spill_dir)
+        spill_ok = spill_ok and store.delete(ids[0]) and ids[0] not in store and newest in store
+        
+        # Without spill_dir evicted tables are gone, locks included
+        dropping = table_store.EvictingTableStore(max_tables=1)
+        first = dropping.create(HashTable(size=5))
+        with dropping.lock(first):
+            pass
+        dropping.create(HashTable(size=5))
+        drop_ok = first not in dropping and dropping._table_locks.peek(first) is None
+        drop_ok = drop_ok and dropping.stats()['evictions'] == 1
+    finally:
+        shutil.rmtree(directory)
+    
+    if spill_ok and drop_ok:
+        print("  ✅ LRU/TTL eviction spills to disk, reloads on demand and skips locked tables")
+        return True
+    print("  ❌ Evicting store kept, lost or spilled the wrong tables")
+    return False
+
+
+def test_api_state_paging():
+    """Test versioned deltas, bucket paging and the occupancy summary."""
+    print_header("TEST 17: API State Deltas and Paging")
+    
+    index = import_web_api()
+    if index is None:
+        return True
+    client = index.app.test_client()
+    
+    created = client.post('/api/create', json={'size': 11, 'mode': 'linear'}).get_json()
+    table_id, version = created['table_id'], created['state']['version']
+    r = client.post(f'/api/{table_id}/insert', json={'key': 16, 'version': version}).get_json()
+    delta = r.get('delta', {})
+    delta_ok = 'state' not in r and delta.get('base_version') == version and delta['version'] == version + 1
+    delta_ok = delta_ok and delta['buckets'] == {'index': [5], 'type': ['filled'], 'contents': [[16]]}
+    # A stale or missing version gets the full state
+    r = client.post(f'/api/{table_id}/insert', json={'key': 27, 'version': version}).get_json()
+    delta_ok = delta_ok and 'delta' not in r and sorted(r['state']['all_keys']) == [16, 27]
+    
+    size = index.FULL_STATE_MAX_BUCKETS * 3
+    created = client.post('/api/create', json={'size': size, 'mode': 'chaining'}).get_json()
+    table_id, state = created['table_id'], created['state']
+    paged_ok = len(state['buckets']['index']) == index.MAX_BUCKET_PAGE and 'all_keys' not in state
+    paged_ok = paged_ok and len(state['summary']) == index.SUMMARY_RANGES
+    client.post(f'/api/{table_id}/batch', json={'ops': [{'op': 'insert', 'key': k} for k in (2999, 5999, 7)]})
+    page = client.get(f'/api/{table_id}/buckets?offset={size - 4}&limit=10').get_json()
+    paged_ok = paged_ok and page['buckets']['index'] == list(range(size - 4, size))
+    paged_ok = paged_ok and page['buckets']['contents'][-1] == [2999, 5999] and page['version'] == 3
+    summary = client.get(f'/api/{table_id}/summary?ranges=3').get_json()['summary']
+    paged_ok = paged_ok and [(s['start'], s['keys']) for s in summary] == [(0, 1), (1000, 0), (2000, 2)]
+    paged_ok = paged_ok and client.get(f'/api/{table_id}/buckets?offset=-1').status_code == 400
+    paged_ok = paged_ok and client.get('/api/missing/summary').status_code == 404
+    
+    if delta_ok and paged_ok:
+        print("  ✅ Deltas carry only changed buckets; large tables are paged with a summary")
+        return True
+    print("  ❌ Delta, page or summary payloads do not match the table")
+    return False
+
+
+def test_batch_operations():
+    """Test the /batch endpoint and its up-front validation."""
+    print_header("TEST 18: Batch Operations")
+    
+    index = import_web_api()
+    if index is None:
+        return True
+    client = index.app.test_client()
+    table_id = client.post('/api/create', json={'size': 7, 'mode': 'double'}).get_json()['table_id']
+    
+    ops = [{'op': 'insert', 'key': 1}, {'op': 'insert', 'key': '8'}, {'op': 'search', 'key': 8},
+           {'op': 'delete', 'key': 1}, {'op': 'delete', 'key': 1}, {'op': 'insert', 'key': 'Bob'}]
+    r = client.post(f'/api/{table_id}/batch', json={'ops': ops, 'steps': True}).get_json()
+    outcome = [res.get('success', res.get('found')) for res in r['results']]
+    batch_ok = outcome == [True, True, True, True, False, True] and r['applied'] == 4
+    batch_ok = batch_ok and r['state']['count'] == 2 and r['state']['version'] == 4
+    batch_ok = batch_ok and all(res['steps'] for res in r['results']) and set(r['pseudocode_refs']) == {'insert', 'search', 'delete'}
+    
+    invalid = [
+        ({'ops': []}, 'non-empty'),
+        ({'ops': [{'op': 'insert', 'key': 2}, {'op': 'upsert', 'key': 3}]}, 'ops[1]: op'),
+        ({'ops': [{'op': 'insert', 'key': 2}, {'op': 'delete'}]}, 'ops[1]: key'),
+        ({'ops': [{'op': 'search', 'key': 2}] * (index.MAX_BATCH_OPS + 1)}, 'At most'),
+    ]
+    for body, message in invalid:
+        response = client.post(f'/api/{table_id}/batch', json=body)
+        batch_ok = batch_ok and response.status_code == 400 and message in response.get_json()['error']
+    # Nothing from a rejected batch was applied
+    state = client.get(f'/api/{table_id}/state').get_json()['state']
+    batch_ok = batch_ok and state['version'] == 4 and 2 not in state['all_keys']
+    
+    if batch_ok:
+        print("  ✅ Ops run in order under one lock; invalid batches are rejected before any op runs")
+        return True
+    print("  ❌ Batch results or validation errors are wrong")
+    return False
+
+
+def test_step_streaming():
+    """Test streaming operation steps as Server-Sent Events."""
+    print_header("TEST 19: Step Streaming")
+    
+    index = import_web_api()
+    if index is None:
+        return True
+    client = index.app.test_client()
+    table_id = client.post('/api/create', json={'size': 7, 'mode': 'linear'}).get_json()['table_id']
+    
+    events = read_sse(client.post(f'/api/{table_id}/insert/stream', json={'key': 3}).data)
+    names = [name for name, _ in events]
+    stream_ok = names[0] == 'pseudocode' and names[-1] == 'result' and set(names[1:-1]) == {'step'}
+    stream_ok = stream_ok and events[-1][1]['success'] and events[-1][1]['state']['count'] == 1
+    events = read_sse(client.get(f'/api/{table_id}/search/stream?key=3').data)
+    stream_ok = stream_ok and events[-1][1]['found'] and events[-2][1]['text'].startswith("RETURN found")
+    
+    # A repeated request_id (an EventSource reconnect) replays the result
+    url = f'/api/{table_id}/insert/stream?key=10&request_id=r1'
+    first = read_sse(client.get(url).data)
+    replay = read_sse(client.get(url).data)
+    stream_ok = stream_ok and [name for name, _ in replay] == ['result'] and replay[0][1] == first[-1][1]
+    stream_ok = stream_ok and client.get(f'/api/{table_id}/state').get_json()['state']['count'] == 2
+    
+    # A failing operation ends the stream with an 'error' event
+    _, api_hash_table = import_api_module("index")
+    HashTable = api_hash_table.HashTable
+    original = HashTable.insert
+    def failing_insert(self, key, tracer=None):
+        raise RuntimeError("simulated failure")
+    HashTable.insert = failing_insert
+    try:
+        events = read_sse(client.get(f'/api/{table_id}/insert/stream?key=11&request_id=r2').data)
+    finally:
+        HashTable.insert = original
+    error_ok = events[-1] == ('error', {'error': "insert failed: simulated failure"})
+    error_ok = error_ok and read_sse(client.get(f'/api/{table_id}/insert/stream?key=11&request_id=r2').data)[-1][1]['success']
+    
+    if stream_ok and error_ok:
+        print("  ✅ Steps stream before the result; reconnects replay it and failures end with 'error'")
+        return True
+    print("  ❌ Streamed events are missing, repeated or out of order")
+    return False
+
+
+def test_pseudocode_caching():
+    """Test the cached pseudocode endpoint and its ETag revalidation."""
+    print_header("TEST 20: Pseudocode Caching")
+    
+    index = import_web_api()
+    if index is None:
+        return True
+    client = index.app.test_client()
+    
+    response = client.get('/api/pseudocode/quadratic/insert')
+    body, etag = response.get_json(), response.headers.get('ETag')
+    cache_ok = response.status_code == 200 and body['pseudocode'] and etag == f'"{body["version"]}"'
+    cache_ok = cache_ok and 'max-age=86400' in response.headers['Cache-Control']
+    revalidated = client.get('/api/pseudocode/quadratic/insert', headers={'If-None-Match': etag})
+    cache_ok = cache_ok and revalidated.status_code == 304 and not revalidated.data
+    cache_ok = cache_ok and client.get('/api/pseudocode/quadratic/rehash').status_code == 404
+    
+    # Operation responses point at the cached copy unless asked to inline it
+    table_id = client.post('/api/create', json={'size': 7, 'mode': 'quadratic'}).get_json()['table_id']
+    ref = client.post(f'/api/{table_id}/insert', json={'key': 4}).get_json()['pseudocode_ref']
+    cache_ok = cache_ok and ref['version'] == body['version'] and 'lines' not in ref
+    ref = client.post(f'/api/{table_id}/search', json={'key': 4, 'pseudocode': True}).get_json()['pseudocode_ref']
+    cache_ok = cache_ok and ref['lines'] == index.get_pseudocode('quadratic', 'search')
+    
+    if cache_ok:
+        print("  ✅ Pseudocode is served once per version and revalidated with a 304")
+        return True
+    print("  ❌ Pseudocode caching headers or references are wrong")
+    return False
+
+
+def test_response_encoding():
+    """Test content negotiation, compression and conditional GET on /state."""
+    print_header("TEST 21: Response Encoding and Conditional GET")
+    
+    import gzip
+    index = import_web_api()
+    if index is None:
+        return True
+    serialization = sys.modules["serialization"]
+    client = index.app.test_client()
+    created = client.post('/api/create', json={'size': 1000, 'mode': 'linear'}).get_json()
+    table_id = created['table_id']
+    client.post(f'/api/{table_id}/batch', json={'ops': [{'op': 'insert', 'key': k} for k in range(0, 3000, 7)]})
+    plain = client.get(f'/api/{table_id}/state')
+    expected = plain.get_json()
+    
+    encoded_ok = plain.mimetype == 'application/json' and 'Content-Encoding' not in plain.headers
+    zipped = client.get(f'/api/{table_id}/state', headers={'Accept-Encoding': 'gzip'})
+    encoded_ok = encoded_ok and zipped.headers['Content-Encoding'] == 'gzip'
+    encoded_ok = encoded_ok and gzip.decompress(zipped.data) == plain.data and len(zipped.data) < len(plain.data)
+    decoders = {
+        'application/msgpack': serialization.msgpack and serialization.msgpack.unpackb,
+        'application/cbor': serialization.cbor2 and serialization.cbor2.loads,
+    }
+    for mimetype, decode in decoders.items():
+        if not decode:
+            print(f"  ⚠️  {mimetype} encoder not installed; skipped")
+            continue
+        response = client.get(f'/api/{table_id}/state', headers={'Accept': mimetype})
+        encoded_ok = encoded_ok and response.mimetype == mimetype and decode(response.data) == expected
+        encoded_ok = encoded_ok and response.headers['ETag'] != plain.headers['ETag']
+    encoded_ok = encoded_ok and serialization.negotiate('application/json, application/cbor') == 'application/json'
+    
+    etag = plain.headers['ETag']
+    unchanged = client.get(f'/api/{table_id}/state', headers={'If-None-Match': etag})
+    conditional_ok = unchanged.status_code == 304 and not unchanged.data and unchanged.headers['ETag'] == etag
+    client.post(f'/api/{table_id}/insert', json={'key': 1})
+    changed = client.get(f'/api/{table_id}/state', headers={'If-None-Match': etag})
+    conditional_ok = conditional_ok and changed.status_code == 200 and changed.headers['ETag'] != etag
+    conditional_ok = conditional_ok and changed.headers['Cache-Control'] == 'no-cache'
+    conditional_ok = conditional_ok and client.get('/api/missing/state').status_code == 404
+    
+    if encoded_ok and conditional_ok:
+        print("  ✅ State is negotiated, compressed and answered with 304 while unchanged")
+        return True
+    print("  ❌ Encoded, compressed or conditional /state responses are wrong")
+    return False
+
+
+def test_asgi_app():
+    """Test the ASGI app by driving it in-process."""
+    print_header("TEST 22: ASGI App")
+    
+    import asyncio
+    import gc
+    import json
+    asgi = import_web_api("asgi")
+    if asgi is None:
+        return True
+    
+    async def call(method, path, body=None, headers=()):
+        messages = [{'type': 'http.request', 'body': b'' if body is None else json.dumps(body).encode()}]
+        sent = []
+        
+        async def receive():
+            return messages.pop(0)
+        
+        async def send(message):
+            sent.append(message)
+        
+        scope = {'type': 'http', 'method': method, 'path': path,
+                 'headers': [(k.encode(), v.encode()) for k, v in headers]}
+        await asgi.app(scope, receive, send)
+        start, reply = sent
+        return start['status'], dict(start['headers']), json.loads(reply['body']) if reply['body'] else None
+    
+    async def scenario():
+        status, _, created = await call('POST', '/api/create', {'size': 11, 'mode': 'linear'})
+        table_id = created['table_id']
+        ok = status == 200
+        # Concurrent inserts to one table are serialized by its gate
+        results = await asyncio.gather(*[call('POST', f'/api/{table_id}/insert', {'key': k}) for k in range(8)])
+        ok = ok and all(status == 200 and reply['success'] for status, _, reply in results)
+        _, _, found = await call('POST', f'/api/{table_id}/search', {'key': 5})
+        ok = ok and found['found'] and found['index'] == 5
+        
+        status, headers, state = await call('GET', f'/api/{table_id}/state')
+        ok = ok and status == 200 and state['state']['count'] == 8 and headers[b'cache-control'] == b'no-cache'
+        status, _, reply = await call('GET', f'/api/{table_id}/state', headers=[('if-none-match', headers[b'etag'].decode())])
+        ok = ok and status == 304 and reply is None
+        ok = ok and (await call('POST', f'/api/{table_id}/insert', {}))[0] == 400
+        
+        ok = ok and (await call('DELETE', f'/api/{table_id}'))[0] == 200
+        ok = ok and (await call('GET', f'/api/{table_id}/state'))[0] == 404
+        ok = ok and (await call('DELETE', f'/api/{table_id}'))[0] == 404
+        gc.collect()
+        return ok and table_id not in asgi._sizes and not asgi._gates
+    
+    if asyncio.run(scenario()):
+        print("  ✅ Async routes match the Flask app; gates and size hints are released")
+        return True
+    print("  ❌ ASGI responses differ from the expected ones")
+    return False
+
+
 def run_all_tests():
     """Run all tests."""
     print("\n" + "#"*60)
@@ -235,6 +937,21 @@ def run_all_tests():
         ("Load Factor", test_load_factor),
         ("Resize", test_resize),
         ("Console Display", test_console_display),
+        ("Snapshot", test_snapshot),
+        ("Frozen Table", test_frozen_table),
+        ("Write-Ahead Log", test_write_ahead_log),
+        ("Traced Operations", test_traced_operations),
+        ("Heatmap", test_heatmap),
+        ("Incremental Statistics", test_incremental_stats),
+        ("Replay Timeline", test_replay_timeline),
+        ("Headless Rendering", test_headless_rendering),
+        ("Table Stores", test_table_stores),
+        ("API State Deltas and Paging", test_api_state_paging),
+        ("Batch Operations", test_batch_operations),
+        ("Step Streaming", test_step_streaming),
+        ("Pseudocode Caching", test_pseudocode_caching),
+        ("Response Encoding", test_response_encoding),
+        ("ASGI App", test_asgi_app),
     ]
     
     passed = 0
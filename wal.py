@@ -0,0 +1,410 @@
+"""
+Write-Ahead Log for crash-safe hash tables.
+
+Every applied mutation (insert, delete, resize, clear) is appended to a log
+segment as a compact binary record. On restart the latest snapshot is loaded
+and the remaining segments are replayed on top of it. Compaction folds the
+log into a fresh snapshot on a background thread.
+
+Record framing: uint32 payload length | uint32 crc32 | payload. Replay stops
+at the first torn or corrupt record, so a crash mid-write loses at most the
+records that were not yet synced.
+
+Fsync policies:
+- 'always':   each append is synced before returning; concurrent writers
+              share one fsync (group commit)
+- 'interval': appends are buffered and synced together every interval_ms
+- 'never':    appends are handed to the OS immediately but never fsynced
+
+Author: Hash Table Simulator
+"""
+
+import os
+import re
+import struct
+import threading
+import zlib
+from typing import Optional, Tuple
+
+from hash_table import HashTable
+
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+OP_INSERT = 1
+OP_DELETE = 2
+OP_RESIZE = 3
+OP_CLEAR = 4
+
+_FRAME = struct.Struct('<II')
+_OP = struct.Struct('<B')
+_INT_KEY = struct.Struct('<Bq')
+_STR_KEY = struct.Struct('<BI')
+_SIZE = struct.Struct('<Q')
+
+_KEY_INT = 0
+_KEY_STR = 1
+_KEY_BIGINT = 2
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _encode_key(key) -> bytes:
+    if isinstance(key, int) and _INT64_MIN <= key <= _INT64_MAX:
+        return _INT_KEY.pack(_KEY_INT, key)
+    if isinstance(key, int):
+        raw = str(key).encode('ascii')
+        return _STR_KEY.pack(_KEY_BIGINT, len(raw)) + raw
+    if isinstance(key, str):
+        raw = key.encode('utf-8')
+        return _STR_KEY.pack(_KEY_STR, len(raw)) + raw
+    raise TypeError(f"Cannot log key of type {type(key).__name__}: {key!r}")
+
+
+def _decode_key(payload: bytes, pos: int):
+    kind = payload[pos]
+    if kind == _KEY_INT:
+        return _INT_KEY.unpack_from(payload, pos)[1]
+    length = _STR_KEY.unpack_from(payload, pos)[1]
+    raw = payload[pos + _STR_KEY.size:pos + _STR_KEY.size + length]
+    return raw.decode('utf-8') if kind == _KEY_STR else int(raw)
+
+
+def read_records(path) -> Tuple[list, int]:
+    """
+    Read all intact records from a log segment.
+
+    Args:
+        path: Segment file path
+
+    Returns:
+        tuple: (records: list of (op, arg), valid_length: int). valid_length
+        is the byte offset just past the last intact record.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    records = []
+    pos = 0
+    while pos + _FRAME.size <= len(data):
+        length, crc = _FRAME.unpack_from(data, pos)
+        start = pos + _FRAME.size
+        payload = data[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            break
+        op = payload[0]
+        if op in (OP_INSERT, OP_DELETE):
+            records.append((op, _decode_key(payload, 1)))
+        elif op == OP_RESIZE:
+            records.append((op, _SIZE.unpack_from(payload, 1)[0]))
+        elif op == OP_CLEAR:
+            records.append((op, None))
+        else:
+            break
+        pos = start + length
+    return records, pos
+
+
+def apply_records(table: HashTable, records) -> int:
+    """
+    Re-apply decoded records to a table.
+
+    The table's own WAL hook is detached while applying so records are not
+    logged twice.
+
+    Args:
+        table: Table to mutate (typically freshly loaded from a snapshot)
+        records: (op, arg) pairs as returned by read_records()
+
+    Returns:
+        int: Number of records applied
+    """
+    wal, table.wal = table.wal, None
+    try:
+        for op, arg in records:
+            if op == OP_INSERT:
+                table.insert(arg)
+            elif op == OP_DELETE:
+                table.delete(arg)
+            elif op == OP_RESIZE:
+                table.resize(arg)
+            else:
+                table.clear()
+    finally:
+        table.wal = wal
+    return len(records)
+
+
+def replay(table: HashTable, path) -> int:
+    """
+    Re-apply the intact records of a log segment to a table.
+
+    Args:
+        table: Table to mutate
+        path: Segment file path
+
+    Returns:
+        int: Number of records applied
+    """
+    records, _ = read_records(path)
+    return apply_records(table, records)
+
+
+class WriteAheadLog:
+    """
+    Append-only log segment with configurable fsync policy.
+
+    Attach an instance to HashTable.wal to have mutations logged
+    automatically.
+
+    Attributes:
+        path (str): Segment file path
+        fsync (str): One of FSYNC_POLICIES
+        interval_ms (int): Sync period for the 'interval' policy
+    """
+
+    def __init__(self, path, fsync: str = 'always', interval_ms: int = 50):
+        """
+        Open (or create) a log segment for appending.
+
+        Args:
+            path: Segment file path
+            fsync: 'always', 'interval' or 'never'
+            interval_ms: Group commit period for the 'interval' policy
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.path = path
+        self.fsync = fsync
+        self.interval_ms = interval_ms
+        self._file = open(path, 'ab', buffering=0)
+        self._buffer = bytearray()
+        self._lock = threading.Lock()        # guards _buffer and _appended
+        self._write_lock = threading.Lock()  # serializes writes and fsyncs
+        self._appended = 0
+        self._synced = 0
+        self._closed = False
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if fsync == 'interval':
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+
+    def log_insert(self, key):
+        """Log a successful insert."""
+        self._append(_OP.pack(OP_INSERT) + _encode_key(key))
+
+    def log_delete(self, key):
+        """Log a successful delete."""
+        self._append(_OP.pack(OP_DELETE) + _encode_key(key))
+
+    def log_resize(self, new_size: int):
+        """Log a resize (the rehash itself is implied)."""
+        self._append(_OP.pack(OP_RESIZE) + _SIZE.pack(new_size))
+
+    def log_clear(self):
+        """Log a clear."""
+        self._append(_OP.pack(OP_CLEAR))
+
+    def _append(self, payload: bytes) -> int:
+        if self._closed:
+            raise ValueError("Write-ahead log is closed")
+        record = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._buffer += record
+            self._appended += 1
+            lsn = self._appended
+        if self.fsync == 'always':
+            self.sync(lsn)
+        elif self.fsync == 'never':
+            with self._write_lock:
+                self._write_buffer()
+        return lsn
+
+    def _write_buffer(self) -> int:
+        """Hand buffered records to the OS. Caller holds _write_lock."""
+        with self._lock:
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            lsn = self._appended
+        if data:
+            self._file.write(data)
+        return lsn
+
+    def sync(self, lsn: Optional[int] = None):
+        """
+        Make records durable up to lsn (default: everything appended so far).
+
+        If another thread already synced past lsn, this returns without a
+        second fsync - that is what turns concurrent appends into a group
+        commit.
+        """
+        with self._write_lock:
+            if lsn is not None and self._synced >= lsn:
+                return
+            written = self._write_buffer()
+            if written > self._synced:
+                os.fsync(self._file.fileno())
+                self._synced = written
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.interval_ms / 1000.0):
+            self.sync()
+
+    def truncate(self, length: int):
+        """Cut the segment back to length bytes (drops a torn tail)."""
+        with self._write_lock:
+            self._file.truncate(length)
+
+    def close(self):
+        """Sync outstanding records (unless policy is 'never') and close."""
+        if self._closed:
+            return
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        if self.fsync == 'never':
+            with self._write_lock:
+                self._write_buffer()
+        else:
+            self.sync()
+        self._closed = True
+        self._file.close()
+
+
+class DurableHashTable:
+    """
+    A HashTable persisted as snapshot + write-ahead log in a directory.
+
+    Directory layout:
+        snapshot-<gen>.htsnap   table state covering all segments before <gen>
+        wal-<gen>.log           mutations applied after that snapshot
+
+    Attributes:
+        table (HashTable): The live table; mutate it directly
+        directory (str): Storage directory
+    """
+
+    _SNAPSHOT_RE = re.compile(r'^snapshot-(\d+)\.htsnap$')
+    _WAL_RE = re.compile(r'^wal-(\d+)\.log$')
+
+    def __init__(self, directory, size=10, mode='chaining', fsync='always', interval_ms=50):
+        """
+        Open the store, recovering the table from disk if present.
+
+        Args:
+            directory: Storage directory (created if missing)
+            size: Table size when no snapshot exists yet
+            mode: Collision mode when no snapshot exists yet
+            fsync: WAL fsync policy
+            interval_ms: WAL group commit period for the 'interval' policy
+        """
+        self.directory = str(directory)
+        self.fsync = fsync
+        self.interval_ms = interval_ms
+        self._compaction: Optional[threading.Thread] = None
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshots = self._generations(self._SNAPSHOT_RE)
+        if snapshots:
+            self._generation = snapshots[-1]
+            self.table = HashTable.load(self._snapshot_path(self._generation))
+        else:
+            # Persist the empty table so mode and size survive a restart
+            self._generation = 0
+            self.table = HashTable(size=size, mode=mode)
+            self._write_snapshot(0, self.table.to_bytes())
+
+        segments = [g for g in self._generations(self._WAL_RE) if g >= self._generation]
+        valid_length = 0
+        for gen in segments:
+            records, valid_length = read_records(self._wal_path(gen))
+            apply_records(self.table, records)
+        self._cleanup(self._generation)
+
+        self._segment = segments[-1] if segments else self._generation
+        self.table.wal = WriteAheadLog(self._wal_path(self._segment), fsync, interval_ms)
+        if segments:
+            self.table.wal.truncate(valid_length)
+
+    def _snapshot_path(self, gen: int) -> str:
+        return os.path.join(self.directory, f"snapshot-{gen}.htsnap")
+
+    def _wal_path(self, gen: int) -> str:
+        return os.path.join(self.directory, f"wal-{gen}.log")
+
+    def _generations(self, pattern) -> list:
+        gens = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                gens.append(int(match.group(1)))
+        return sorted(gens)
+
+    def _write_snapshot(self, gen: int, data: bytes):
+        """Atomically write snapshot gen (temp file, fsync, rename)."""
+        tmp_path = self._snapshot_path(gen) + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path(gen))
+
+    def _cleanup(self, keep_from: int):
+        """Delete snapshots and segments older than generation keep_from."""
+        for pattern, path_for in ((self._SNAPSHOT_RE, self._snapshot_path), (self._WAL_RE, self._wal_path)):
+            for gen in self._generations(pattern):
+                if gen < keep_from:
+                    os.remove(path_for(gen))
+
+    def compact(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Fold the log into a new snapshot.
+
+        The table is serialized and the log rotated to a fresh segment on the
+        calling thread; writing the snapshot and deleting the superseded files
+        happens in the background.
+
+        Args:
+            background: Run the file work on a thread (default True)
+
+        Returns:
+            threading.Thread or None: The compaction thread when backgrounded
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+
+        old_wal = self.table.wal
+        gen = self._segment + 1
+        data = self.table.to_bytes()
+        self.table.wal = WriteAheadLog(self._wal_path(gen), self.fsync, self.interval_ms)
+        self._segment = gen
+        old_wal.close()
+
+        def write_snapshot():
+            self._write_snapshot(gen, data)
+            self._generation = gen
+            self._cleanup(gen)
+
+        if not background:
+            write_snapshot()
+            return None
+        self._compaction = threading.Thread(target=write_snapshot, name="wal-compaction", daemon=True)
+        self._compaction.start()
+        return self._compaction
+
+    def close(self):
+        """Wait for any compaction and close the log."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+        if self.table.wal is not None:
+            self.table.wal.close()
+            self.table.wal = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,418 @@
+"""
+ASGI variant of the Hash Table Simulator API
+Serves the core table routes from async handlers, so one worker keeps many
+connections in flight instead of handling one request at a time.
+
+Shares its store, limits and payload helpers with the Flask app in index.py,
+so both return identical JSON. Short operations run directly on the event
+loop; work that grows with the table (resize, creating or rendering large
+tables, large batches) runs on a thread pool so it never stalls the loop.
+
+Run with any ASGI server, e.g.:
+    uvicorn asgi:app --port 5000
+"""
+
+import asyncio
+import functools
+import json
+import os
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import index as flask_api
+from hash_table import HashTable
+from index import (
+    MAX_TABLE_SIZE, conditional_state, get_table_state, parse_batch_ops,
+    pseudocode_ref, run_batch, state_or_delta
+)
+from serialization import compress, encode, negotiate
+
+# Tables with at least this many buckets are processed on the worker pool
+OFFLOAD_MIN_BUCKETS = 50_000
+# Batches with at least this many operations are processed on the worker pool
+OFFLOAD_MIN_OPS = 500
+WORKER_THREADS = int(os.environ.get('ASGI_WORKER_THREADS', 4))
+# Most tables whose bucket count is remembered; older hints are dropped first
+MAX_SIZE_HINTS = 10_000
+
+_executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix='asgi-offload')
+
+# Per-table asyncio locks: requests for one table queue here, on the event
+# loop, so an inline handler never blocks the loop on store.lock() while a
+# pool thread holds it. Held weakly: a gate lives only while a request for
+# its table holds or waits on it, so tables evicted or deleted elsewhere
+# leave nothing behind.
+_gates = weakref.WeakValueDictionary()
+
+# Last bucket count seen per table, to decide inline vs offloaded without
+# loading the table first. Unknown tables (created by another worker, or
+# whose hint was dropped) are treated as large.
+_sizes = {}
+
+
+class HTTPError(Exception):
+    """Abort a handler with a JSON error response"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Reply:
+    """A handler result with its own status and headers (payload None: empty body)"""
+
+    def __init__(self, payload, status=200, headers=()):
+        self.payload = payload
+        self.status = status
+        self.headers = headers
+
+
+def _remember_size(table_id, size):
+    """Record a table's bucket count, dropping the stalest hint past MAX_SIZE_HINTS"""
+    _sizes.pop(table_id, None)
+    _sizes[table_id] = size
+    while len(_sizes) > MAX_SIZE_HINTS:
+        del _sizes[next(iter(_sizes))]
+
+
+def _table_missing(table_id):
+    """Forget a table that is gone from the store; the caller answers 404"""
+    _sizes.pop(table_id, None)
+    return HTTPError(404, 'Table not found')
+
+
+def parse_key(data):
+    """Return the request's key (as int where possible); 400 if missing"""
+    key = data.get('key')
+    if key is None:
+        raise HTTPError(400, 'Key is required')
+    try:
+        return int(key)
+    except (ValueError, TypeError):
+        return key
+
+
+async def offload(fn, *args):
+    """Run fn(*args) on the worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args))
+
+
+def _with_table(table_id, write, fn):
+    """Load the table under its store lock and return fn(table)"""
+    with flask_api.store.lock(table_id, write=write):
+        table = flask_api.store.get(table_id)
+        if table is None:
+            raise _table_missing(table_id)
+        result = fn(table)
+        _remember_size(table_id, table.size)
+        return result
+
+
+def _delete(table_id):
+    """Remove the table under its store write lock (as the Flask route does)"""
+    with flask_api.store.lock(table_id, write=True):
+        return flask_api.store.delete(table_id)
+
+
+async def gated(table_id, fn, *args, heavy=False):
+    """
+    Run fn(*args) behind the table's gate, inline for small tables and on
+    the worker pool for large ones (or when the caller says the work is heavy).
+    """
+    gate = _gates.setdefault(table_id, asyncio.Lock())
+    async with gate:
+        if heavy or _sizes.get(table_id, OFFLOAD_MIN_BUCKETS) >= OFFLOAD_MIN_BUCKETS:
+            return await offload(fn, *args)
+        return fn(*args)
+
+
+async def with_table(table_id, fn, write=True, heavy=False):
+    """Run fn(table) with the table locked (see gated)"""
+    if table_id not in flask_api.store:
+        raise _table_missing(table_id)
+    return await gated(table_id, _with_table, table_id, write, fn, heavy=heavy)
+
+
+# Route handlers: (params, data, headers) -> payload dict or Reply, or raise
+# HTTPError. headers maps lower-case header names to values (bytes).
+
+async def create_table(params, data, headers):
+    size = data.get('size', 10)
+    mode = data.get('mode', 'chaining')
+
+    if not isinstance(size, int) or size < 1 or size > MAX_TABLE_SIZE:
+        raise HTTPError(400, f'Size must be between 1 and {MAX_TABLE_SIZE}')
+
+    def create():
+        table = HashTable(size=size, mode=mode)
+        table_id = flask_api.store.create(table)
+        _remember_size(table_id, size)
+        return {
+            'table_id': table_id,
+            'state': get_table_state(table),
+            'message': f'Created hash table with size {size} and mode {mode}'
+        }
+
+    if size >= OFFLOAD_MIN_BUCKETS:
+        return await offload(create)
+    return create()
+
+
+async def insert_key(params, data, headers):
+    table_id = params['table_id']
+    key = parse_key(data)
+
+    def insert(table):
+        base_version = table.version
+        steps = []
+        success, index, collision, message = table.insert(key, tracer=steps.append)
+        if success:
+            flask_api.store.put(table_id, table)
+        return {
+            'success': success,
+            'index': index,
+            'collision': collision,
+            'message': message,
+            **state_or_delta(table, data, base_version, [index] if success else []),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'insert', data)
+        }
+
+    return await with_table(table_id, insert)
+
+
+async def search_key(params, data, headers):
+    table_id = params['table_id']
+    key = parse_key(data)
+
+    def search(table):
+        base_version = table.version
+        steps = []
+        found, index, message = table.search(key, tracer=steps.append)
+        return {
+            'found': found,
+            'index': index,
+            'message': message,
+            **state_or_delta(table, data, base_version),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'search', data)
+        }
+
+    return await with_table(table_id, search, write=False)
+
+
+async def delete_key(params, data, headers):
+    table_id = params['table_id']
+    key = parse_key(data)
+
+    def delete(table):
+        base_version = table.version
+        steps = []
+        success, index, message = table.delete(key, tracer=steps.append)
+        if success:
+            flask_api.store.put(table_id, table)
+        return {
+            'success': success,
+            'index': index,
+            'message': message,
+            **state_or_delta(table, data, base_version, [index] if success else []),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'delete', data)
+        }
+
+    return await with_table(table_id, delete)
+
+
+async def batch_operations(params, data, headers):
+    table_id = params['table_id']
+    parsed, error = parse_batch_ops(data)
+    if error:
+        raise HTTPError(400, error)
+
+    def batch(table):
+        response, changed = run_batch(table, parsed, data)
+        if changed:
+            flask_api.store.put(table_id, table)
+        return response
+
+    return await with_table(table_id, batch, heavy=len(parsed) >= OFFLOAD_MIN_OPS)
+
+
+async def resize_table(params, data, headers):
+    table_id = params['table_id']
+    new_size = data.get('new_size')
+
+    if not isinstance(new_size, int) or new_size < 1 or new_size > MAX_TABLE_SIZE:
+        raise HTTPError(400, f'New size must be between 1 and {MAX_TABLE_SIZE}')
+
+    def resize(table):
+        message = table.resize(new_size)
+        flask_api.store.put(table_id, table)
+        return {'message': message, 'state': get_table_state(table)}
+
+    # Rehashes every key: always off the event loop
+    return await with_table(table_id, resize, heavy=True)
+
+
+async def clear_table(params, data, headers):
+    table_id = params['table_id']
+
+    def clear(table):
+        table.clear()
+        flask_api.store.put(table_id, table)
+        return {'message': 'Table cleared', 'state': get_table_state(table)}
+
+    return await with_table(table_id, clear)
+
+
+async def get_state(params, data, headers):
+    table_id = params['table_id']
+    if table_id not in flask_api.store:
+        raise _table_missing(table_id)
+    result = await gated(
+        table_id, conditional_state, table_id,
+        negotiate(headers.get(b'accept', b'').decode('latin-1')),
+        headers.get(b'if-none-match', b'').decode('latin-1')
+    )
+    if result is None:
+        raise _table_missing(table_id)
+    status, payload, response_headers = result
+    return Reply(payload, status, [(k.lower().encode(), v.encode()) for k, v in response_headers.items()])
+
+
+async def delete_table(params, data, headers):
+    table_id = params['table_id']
+    if table_id not in flask_api.store or not await gated(table_id, _delete, table_id):
+        raise _table_missing(table_id)
+    _sizes.pop(table_id, None)
+    return {'message': f'Deleted {table_id}'}
+
+
+async def health(params, data, headers):
+    return {'status': 'healthy', 'tables': len(flask_api.store)}
+
+
+ROUTES = [
+    ('POST', r'/api/create', create_table),
+    ('GET', r'/api/health', health),
+    ('POST', r'/api/(?P<table_id>[^/]+)/insert', insert_key),
+    ('POST', r'/api/(?P<table_id>[^/]+)/search', search_key),
+    ('POST', r'/api/(?P<table_id>[^/]+)/delete', delete_key),
+    ('POST', r'/api/(?P<table_id>[^/]+)/batch', batch_operations),
+    ('POST', r'/api/(?P<table_id>[^/]+)/resize', resize_table),
+    ('POST', r'/api/(?P<table_id>[^/]+)/clear', clear_table),
+    ('GET', r'/api/(?P<table_id>[^/]+)/state', get_state),
+    ('DELETE', r'/api/(?P<table_id>[^/]+)', delete_table),
+]
+ROUTES = [(method, re.compile(pattern + '$'), handler) for method, pattern, handler in ROUTES]
+
+CORS_HEADERS = [(b'access-control-allow-origin', b'*')]
+
+
+async def read_body(receive):
+    """Collect the full request body"""
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def send_json(send, status, payload, headers=(), accept='', accept_encoding=''):
+    """
+    Send payload as JSON, or MessagePack/CBOR if the Accept header prefers
+    it, compressed when large and the client accepts gzip/Brotli. A None
+    payload sends an empty body (e.g. for a 304).
+    """
+    if payload is None:
+        body, content = b'', []
+    else:
+        body, mimetype = encode(payload, negotiate(accept))
+        body, coding = compress(body, accept_encoding)
+        content = [(b'content-type', mimetype.encode())]
+        if coding is not None:
+            content.append((b'content-encoding', coding.encode()))
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            *content,
+            (b'content-length', str(len(body)).encode()),
+            (b'vary', b'Accept, Accept-Encoding'),
+            *CORS_HEADERS,
+            *headers
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def handle_http(scope, receive, send):
+    method, path = scope['method'], scope['path']
+    request_headers = dict(scope['headers'])
+    reply = functools.partial(
+        send_json, send,
+        accept=request_headers.get(b'accept', b'').decode('latin-1'),
+        accept_encoding=request_headers.get(b'accept-encoding', b'').decode('latin-1')
+    )
+
+    if method == 'OPTIONS':
+        # CORS preflight, as flask-cors answers it for the Flask app
+        await send_json(send, 200, {}, [
+            (b'access-control-allow-methods', b'DELETE, GET, OPTIONS, POST'),
+            (b'access-control-allow-headers', request_headers.get(b'access-control-request-headers', b''))
+        ])
+        return
+
+    allowed = False
+    for route_method, pattern, handler in ROUTES:
+        match = pattern.match(path)
+        if match is None:
+            continue
+        if route_method != method:
+            allowed = True
+            continue
+        try:
+            body = await read_body(receive)
+            try:
+                data = json.loads(body) if body else {}
+            except ValueError:
+                raise HTTPError(400, 'Request body must be JSON')
+            if not isinstance(data, dict):
+                raise HTTPError(400, 'Request body must be a JSON object')
+            payload = await handler(match.groupdict(), data, request_headers)
+        except HTTPError as error:
+            await reply(error.status, {'error': error.message})
+            return
+        if isinstance(payload, Reply):
+            await reply(payload.status, payload.payload, payload.headers)
+        else:
+            await reply(200, payload)
+        return
+
+    if allowed:
+        await reply(405, {'error': 'Method not allowed'})
+    else:
+        await reply(404, {'error': 'Not found'})
+
+
+async def handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _executor.shutdown(wait=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'http':
+        await handle_http(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        await handle_lifespan(receive, send)
@@ -0,0 +1,332 @@
+"""
+Read-only, memory-mapped hash tables.
+
+A frozen table is a flat file built from an existing HashTable. Lookups probe
+directly inside the mapped file with the same h1/h2 scheme as utils.hash1 and
+utils.hash2, so several worker processes can open the same file and share one
+physical copy through the OS page cache instead of each rebuilding the table.
+
+File layout (little-endian):
+    header
+    bucket offsets   (size + 1) * int64, chaining only
+    entry tags       n_entries bytes
+    entry values     n_entries * int64 (int key, or offset into string region)
+    string region    uint32 length + utf-8 bytes per string/bigint key
+
+The header also keeps c1/c2, the mutation version and the collision tally,
+so thaw() gives back a table equivalent to the one that was frozen. Format 1
+files (without those fields) still open, with the HashTable defaults.
+
+Sharing a table between API workers: whoever owns the table freezes it once,
+e.g. after a bulk load, into a file every worker can reach (a tmpfs such as
+/dev/shm keeps it in memory):
+
+    freeze(store.get(table_id), '/dev/shm/hashsim/<table_id>.htfz')
+
+Each worker process then maps the file once at startup and answers lookups
+from it without loading or rehashing anything; the pages are shared through
+the OS page cache:
+
+    frozen = FrozenHashTable.open('/dev/shm/hashsim/<table_id>.htfz')
+    found, index, message = frozen.search(key)
+    bucket = frozen.get_bucket_contents(index)
+
+A frozen file never changes. To modify the table, thaw() it into a HashTable,
+mutate that, and freeze it into a new file that workers switch to.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Any
+
+# Mode codes and entry tags are shared with the snapshot format
+from hash_table import (
+    HashTable, Node, TOMBSTONE, _CODE_MODES, _INT64_MAX, _INT64_MIN, _MODE_CODES,
+    _TAG_BIGINT, _TAG_EMPTY, _TAG_INT, _TAG_STR, _TAG_TOMBSTONE
+)
+from utils import normalize_key, hash1 as h1_fn, hash2 as h2_fn, P_BASE
+
+
+FROZEN_MAGIC = b'HTFZ'
+FROZEN_VERSION = 2
+_HEADER = struct.Struct('<4sBB2xQQQQqqQQ')
+# Format 1 had no c1, c2, version or collision tally
+_HEADER_V1 = struct.Struct('<4sBB2xQQQQ')
+_INT64 = struct.Struct('<q')
+_UINT32 = struct.Struct('<I')
+
+
+def freeze(table: HashTable, path) -> None:
+    """
+    Write a read-only, mmap-able image of a table.
+
+    Args:
+        table: Source HashTable
+        path: Destination file path
+    """
+    tags = bytearray()
+    values = array('q')
+    strings = bytearray()
+
+    def add_key(key):
+        if isinstance(key, int) and _INT64_MIN <= key <= _INT64_MAX:
+            tags.append(_TAG_INT)
+            values.append(key)
+            return
+        if isinstance(key, int):
+            tags.append(_TAG_BIGINT)
+            raw = str(key).encode('ascii')
+        elif isinstance(key, str):
+            tags.append(_TAG_STR)
+            raw = key.encode('utf-8')
+        else:
+            raise TypeError(f"Cannot freeze key of type {type(key).__name__}: {key!r}")
+        values.append(len(strings))
+        strings.extend(_UINT32.pack(len(raw)))
+        strings.extend(raw)
+
+    offsets = array('q')
+    if table.mode == 'chaining':
+        for bucket in table.table:
+            offsets.append(len(tags))
+            current = bucket
+            while current:
+                add_key(current.key)
+                current = current.next
+        offsets.append(len(tags))
+    else:
+        for slot in table.table:
+            if slot is None:
+                tags.append(_TAG_EMPTY)
+                values.append(0)
+            elif slot is TOMBSTONE:
+                tags.append(_TAG_TOMBSTONE)
+                values.append(0)
+            else:
+                add_key(slot)
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(
+            FROZEN_MAGIC, FROZEN_VERSION, _MODE_CODES[table.mode],
+            table.size, table.count, P_BASE, len(tags),
+            table.c1, table.c2, table.version, table.collision_count,
+        ))
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+            values.byteswap()
+        f.write(offsets.tobytes())
+        f.write(tags)
+        f.write(values.tobytes())
+        f.write(strings)
+
+
+class FrozenHashTable:
+    """
+    Read-only view of a frozen table backed by a memory-mapped file.
+
+    Mirrors the query side of HashTable (search, get_bucket_contents,
+    get_all_keys, get_load_factor) so it can stand in for lookups.
+
+    Attributes:
+        size (int): Number of buckets
+        mode (str): Collision handling mode the table was built with
+        count (int): Number of stored keys
+        version (int): Mutation version of the source table when frozen
+        collision_count (int): Collisions the source table had recorded
+    """
+
+    def __init__(self, buffer):
+        """
+        Wrap an already mapped (or in-memory) frozen image.
+
+        Args:
+            buffer: Object supporting the buffer protocol (mmap, bytes)
+        """
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER_V1.size or view[:4] != FROZEN_MAGIC:
+            raise ValueError("Not a frozen hash table")
+        fmt_version = view[4]
+        if fmt_version == 1:
+            _, _, mode_code, size, count, seed, n_entries = _HEADER_V1.unpack_from(view)
+            c1, c2, version, n_collisions = 1, 3, 0, 0
+            pos = _HEADER_V1.size
+        elif fmt_version == FROZEN_VERSION:
+            (_, _, mode_code, size, count, seed, n_entries,
+             c1, c2, version, n_collisions) = _HEADER.unpack_from(view)
+            pos = _HEADER.size
+        else:
+            raise ValueError(f"Unsupported frozen table version {fmt_version}")
+        if seed != P_BASE:
+            raise ValueError(f"Frozen table hashed with seed {seed}, expected {P_BASE}")
+
+        self.size = size
+        self.mode = _CODE_MODES[mode_code]
+        self.count = count
+        self.c1 = c1
+        self.c2 = c2
+        self.version = version
+        self.collision_count = n_collisions
+        self._n_entries = n_entries
+        self._offsets_pos = pos
+        if self.mode == 'chaining':
+            pos += 8 * (size + 1)
+        self._tags = view[pos:pos + n_entries]
+        pos += n_entries
+        self._values_pos = pos
+        pos += 8 * n_entries
+        self._strings_pos = pos
+        self._view = view
+
+    @classmethod
+    def open(cls, path) -> 'FrozenHashTable':
+        """
+        Map a frozen table file read-only.
+
+        Args:
+            path: File written by freeze()
+
+        Returns:
+            FrozenHashTable: Mapped table; pages are shared between processes
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    def close(self):
+        """Release the mapping."""
+        self._tags.release()
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _entry(self, i: int) -> Any:
+        """Decode entry i into its key (or None / TOMBSTONE)."""
+        tag = self._tags[i]
+        if tag == _TAG_EMPTY:
+            return None
+        if tag == _TAG_TOMBSTONE:
+            return TOMBSTONE
+        value = _INT64.unpack_from(self._view, self._values_pos + 8 * i)[0]
+        if tag == _TAG_INT:
+            return value
+        start = self._strings_pos + value
+        length = _UINT32.unpack_from(self._view, start)[0]
+        raw = bytes(self._view[start + 4:start + 4 + length])
+        return raw.decode('utf-8') if tag == _TAG_STR else int(raw)
+
+    def _chain_bounds(self, index: int):
+        start, end = struct.unpack_from('<2q', self._view, self._offsets_pos + 8 * index)
+        return start, end
+
+    def search(self, key):
+        """
+        Search for a key by probing the mapped file.
+
+        Args:
+            key: The key to search for
+
+        Returns:
+            tuple: (found: bool, index: int, message: str), same as HashTable.search
+        """
+        num, _ = normalize_key(key)
+        h1, _ = h1_fn(abs(num), self.size)
+
+        if self.mode == 'chaining':
+            start, end = self._chain_bounds(h1)
+            for i in range(start, end):
+                if self._entry(i) == key:
+                    return (True, h1, f"Found '{key}' at index {h1}")
+            return (False, h1, f"Key '{key}' not found")
+
+        h2 = 1
+        if self.mode == 'double':
+            h2, _ = h2_fn(abs(num), self.size)
+        for probes in range(self.size):
+            if self.mode == 'linear':
+                index = (h1 + probes) % self.size
+            elif self.mode == 'quadratic':
+                index = (h1 + probes * probes) % self.size
+            else:
+                index = (h1 + probes * h2) % self.size
+            tag = self._tags[index]
+            if tag == _TAG_EMPTY:
+                break
+            if tag != _TAG_TOMBSTONE and self._entry(index) == key:
+                return (True, index, f"Found '{key}' at index {index}")
+        return (False, -1, f"Key '{key}' not found")
+
+    def __contains__(self, key) -> bool:
+        return self.search(key)[0]
+
+    def get_load_factor(self):
+        """Calculate the load factor (count / size)."""
+        return self.count / self.size
+
+    def get_bucket_contents(self, index):
+        """
+        Get all keys in a specific bucket.
+
+        Args:
+            index (int): Bucket index
+
+        Returns:
+            list: Keys in the bucket (empty for a tombstone, as in HashTable)
+        """
+        if index < 0 or index >= self.size:
+            return []
+        if self.mode == 'chaining':
+            start, end = self._chain_bounds(index)
+            return [self._entry(i) for i in range(start, end)]
+        key = self._entry(index)
+        if key is None or key is TOMBSTONE:
+            return []
+        return [key]
+
+    def get_all_keys(self):
+        """Get all keys stored in the table."""
+        keys = []
+        for i in range(self._n_entries):
+            key = self._entry(i)
+            if key is not None and key is not TOMBSTONE:
+                keys.append(key)
+        return keys
+
+    def thaw(self) -> HashTable:
+        """
+        Copy the frozen contents into a mutable HashTable.
+
+        Returns:
+            HashTable: Table with the same slot layout, parameters and version
+        """
+        table = HashTable(size=self.size, mode=self.mode, c1=self.c1, c2=self.c2)
+        if self.mode == 'chaining':
+            for index in range(self.size):
+                head = None
+                for key in reversed(self.get_bucket_contents(index)):
+                    node = Node(key)
+                    node.next = head
+                    head = node
+                table.table[index] = head
+        else:
+            table.table = [self._entry(i) for i in range(self.size)]
+        table.count = self.count
+        table.version = self.version
+        table.recount_stats()
+        # Individual collision events are not stored; keep the tally
+        table.restored_collisions = self.collision_count
+        return table
+
+    def __str__(self):
+        return f"FrozenHashTable(size={self.size}, mode={self.mode}, count={self.count})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -3,22 +3,127 @@ Flask API for Hash Table Simulator Web Application
 Provides REST API endpoints for all hash table operations
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+import hashlib
+import json
+import queue
 import sys
 import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+from werkzeug.http import parse_etags, quote_etag
 
 # Import from the same directory (for Vercel deployment)
 from hash_table import HashTable, TOMBSTONE
-from utils import normalize_key, hash1 as h1_fn, hash2 as h2_fn
+from serialization import APIJSONProvider, JSON, compress_response, dumps_json, negotiate
+from table_store import create_store_from_env
 
 app = Flask(__name__)
+app.json = APIJSONProvider(app)  # Fast JSON, or MessagePack/CBOR via Accept
 CORS(app)  # Enable CORS for React frontend
 
-# Store hash tables in memory (keyed by session or simple storage)
-# For production, consider using Redis or sessions
-hash_tables = {}
-current_id = 0
+# Table storage backend (in-process, shared memory or Redis; see table_store.py)
+store = create_store_from_env()
+
+
+@app.after_request
+def compress_large_responses(response):
+    """gzip/Brotli-compress large bodies for clients that accept it"""
+    return compress_response(response, request.headers.get('Accept-Encoding', ''))
+
+# Table size limits. Tables above FULL_STATE_MAX_BUCKETS get a paged state:
+# the first page of buckets plus an occupancy summary; clients fetch other
+# windows from /buckets.
+MAX_TABLE_SIZE = 5_000_000
+FULL_STATE_MAX_BUCKETS = 1000
+MAX_BUCKET_PAGE = 1000
+SUMMARY_RANGES = 64
+MAX_SUMMARY_RANGES = 1024
+
+# Largest number of operations accepted by one /batch request
+MAX_BATCH_OPS = 10_000
+BATCH_OPERATIONS = ('insert', 'search', 'delete')
+
+# Steps buffered between a streamed operation and the client before the
+# probe loop waits for the client to catch up
+STREAM_QUEUE_SIZE = 1024
+# Results of recent GET-streamed mutations kept per (table id, request id),
+# so an EventSource reconnect replays the result instead of mutating again
+STREAM_REPLAY_MAX = 1024
+
+_stream_results = OrderedDict()
+_stream_results_lock = threading.Lock()
+
+
+def get_bucket_columns(table, indices):
+    """
+    Convert buckets to columnar form: parallel 'index', 'type' and 'contents'
+    arrays instead of one dict per bucket, which is several times smaller
+    and faster to encode
+    """
+    indices = list(indices)
+    types = []
+    contents = []
+    
+    if table.mode == 'chaining':
+        for i in indices:
+            keys = table.get_bucket_contents(i)
+            types.append('filled' if keys else 'empty')
+            contents.append(keys)
+    else:
+        slots = table.table
+        for i in indices:
+            slot = slots[i]
+            if slot is None:
+                types.append('empty')
+                contents.append([])
+            elif slot is TOMBSTONE:
+                types.append('tombstone')
+                contents.append([])
+            else:
+                types.append('filled')
+                contents.append([slot])
+    
+    return {'index': indices, 'type': types, 'contents': contents}
+
+
+def get_bucket_page(table, offset, limit):
+    """Convert buckets [offset, offset + limit) to columnar form"""
+    end = min(table.size, offset + limit)
+    return get_bucket_columns(table, range(offset, end))
+
+
+def get_occupancy_summary(table, ranges=SUMMARY_RANGES):
+    """Histogram of keys, empty buckets and tombstones per bucket range"""
+    ranges = max(1, min(ranges, table.size))
+    width = -(-table.size // ranges)
+    summary = []
+    for start in range(0, table.size, width):
+        end = min(start + width, table.size)
+        slots = table.table[start:end]
+        # list.count compares by identity first, so these run at C speed
+        empty = slots.count(None)
+        if table.mode == 'chaining':
+            tombstones = 0
+            keys = 0
+            for node in slots:
+                while node:
+                    keys += 1
+                    node = node.next
+        else:
+            tombstones = slots.count(TOMBSTONE)
+            keys = len(slots) - empty - tombstones
+        summary.append({
+            'start': start,
+            'end': end,
+            'keys': keys,
+            'empty': empty,
+            'tombstones': tombstones
+        })
+    return summary
 
 
 def get_table_state(table):
@@ -26,337 +131,100 @@ def get_table_state(table):
     if not table:
         return None
     
-    buckets = []
-    for i in range(table.size):
-        contents = table.get_bucket_contents(i)
-        # Check if the actual slot is a tombstone
-        is_tombstone = (table.mode != 'chaining' and table.table[i] is TOMBSTONE)
-        
-        bucket_data = {
-            'index': i,
-            'contents': contents,
-            'type': 'tombstone' if is_tombstone else ('empty' if not contents else 'filled')
-        }
-        buckets.append(bucket_data)
+    paged = table.size > FULL_STATE_MAX_BUCKETS
+    buckets = get_bucket_page(table, 0, MAX_BUCKET_PAGE if paged else table.size)
     
-    return {
+    state = {
+        'version': table.version,
         'size': table.size,
         'mode': table.mode,
         'count': table.count,
         'load_factor': table.get_load_factor(),
+        'bucket_offset': 0,
         'buckets': buckets,
-        'all_keys': table.get_all_keys(),
-        'collisions': len(table.collision_log) if hasattr(table, 'collision_log') else 0
+        'collisions': table.collision_count
     }
+    if paged:
+        state['summary'] = get_occupancy_summary(table)
+    else:
+        state['all_keys'] = [key for keys in buckets['contents'] for key in keys]
+    return state
 
 
-def build_insert_steps(table, key):
-    """Build detailed execution steps for insert operation based on current table contents.
-    Accurately simulates probing, detects full-table condition, and mirrors pseudocode lines.
+def get_table_delta(table, base_version, changed):
+    """Describe the buckets that changed since base_version (O(changes))"""
+    return {
+        'base_version': base_version,
+        'version': table.version,
+        'count': table.count,
+        'load_factor': table.get_load_factor(),
+        'buckets': get_bucket_columns(table, sorted(set(changed))),
+        'collisions': table.collision_count
+    }
+
+
+def state_etag(version, mimetype=JSON):
     """
-    steps = []
-    mode = table.mode
-    m = table.size
-    nk_val, _ = normalize_key(key)
-    h1_val, _ = h1_fn(abs(nk_val), m)
-
-    # CHAINING: straightforward
-    if mode == 'chaining':
-        steps.append({"line": 1, "text": f"FUNCTION Insert({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val, "m": m}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": f"bucket[{h1_val}].append({key})", "vars": {"h1": h1_val, "key": key}, "highlight_bucket": h1_val})
-        steps.append({"line": 4, "text": "RETURN success", "vars": {}, "highlight_bucket": h1_val})
-        return steps
-
-    # OPEN ADDRESSING: line mapping
-    if mode == 'double':
-        # Lines per get_pseudocode for double hashing
-        # 1 FUNC, 2 h1, 3 h2, 4 i=0, 5 while, 6 idx, 7 if, 8 assign, 9 return success, 10 i++, 11 return full
-        h2_val, _ = h2_fn(abs(nk_val), m)
-        steps.append({"line": 1, "text": f"FUNCTION Insert({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": f"h2 = 1 + (hash(key) % (m-1)) = {h2_val}", "vars": {"h2": h2_val}, "highlight_bucket": None})
-        steps.append({"line": 4, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-        while_line, idx_line, if_line, assign_line, ret_ok_line, incr_line, ret_full_line = 5, 6, 7, 8, 9, 10, 11
-    else:
-        # linear and quadratic share mapping
-        # 1 FUNC, 2 h1, 3 i=0, 4 while, 5 idx, 6 if, 7 assign, 8 return success, 9 i++, 10 return full
-        steps.append({"line": 1, "text": f"FUNCTION Insert({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-        while_line, idx_line, if_line, assign_line, ret_ok_line, incr_line, ret_full_line = 4, 5, 6, 7, 8, 9, 10
-
-    # If table already full, immediately show full path without probing
-    if table.count >= table.size:
-        steps.append({"line": while_line, "text": f"Checking: i (0) < m ({m}) → False", "vars": {"i": 0, "m": m}, "highlight_bucket": None})
-        steps.append({"line": ret_full_line, "text": "RETURN table_full", "vars": {}, "highlight_bucket": None})
-        return steps
-
-    # Simulate probing loop using actual table contents
-    first_tombstone = None
-    for i in range(m):
-        # WHILE check
-        steps.append({"line": while_line, "text": f"Checking: i ({i}) < m ({m}) → True", "vars": {"i": i, "m": m}, "highlight_bucket": None})
-
-        # Compute index per mode
-        if mode == 'linear':
-            idx = (h1_val + i) % m
-            idx_text = f"idx = (h1 + i) % m = {idx}"
-        elif mode == 'quadratic':
-            idx = (h1_val + i*i) % m
-            idx_text = f"idx = (h1 + i^2) % m = {idx}"
-        else:  # double
-            step = (h2_val or 1)
-            idx = (h1_val + i * step) % m
-            idx_text = f"idx = (h1 + i*h2) % m = {idx}"
-
-        steps.append({"line": idx_line, "text": idx_text, "vars": {"idx": idx, "i": i, "h1": h1_val}, "highlight_bucket": idx})
-
-        # Inspect slot
-        slot_val = table.table[idx]
-        if slot_val is None or slot_val is TOMBSTONE:
-            # Track first tombstone if we haven't seen one yet
-            if first_tombstone is None and slot_val is TOMBSTONE:
-                first_tombstone = idx
-                # Show that we found a tombstone but will keep probing
-                steps.append({"line": if_line, "text": f"bucket[{idx}] is TOMBSTONE (reusable, but continue probing)", "vars": {"idx": idx}, "highlight_bucket": idx})
-                steps.append({"line": incr_line, "text": f"i = {i} + 1", "vars": {"i": i + 1}, "highlight_bucket": None})
-                continue
-            
-            # Found truly empty slot or we're at a tombstone and continuing
-            if slot_val is None:
-                steps.append({"line": if_line, "text": f"bucket[{idx}] is EMPTY → True", "vars": {"idx": idx}, "highlight_bucket": idx})
-            else:
-                steps.append({"line": if_line, "text": f"bucket[{idx}] is TOMBSTONE → reusable", "vars": {"idx": idx}, "highlight_bucket": idx})
-            
-            dest = first_tombstone if first_tombstone is not None else idx
-            steps.append({"line": assign_line, "text": f"bucket[{dest}] = {key}", "vars": {"idx": dest, "key": key}, "highlight_bucket": dest})
-            steps.append({"line": ret_ok_line, "text": "RETURN success", "vars": {"idx": dest}, "highlight_bucket": dest})
-            return steps
-        else:
-            # Occupied
-            occ_text = f"bucket[{idx}] is OCCUPIED → False"
-            steps.append({"line": if_line, "text": occ_text, "vars": {"idx": idx}, "highlight_bucket": idx})
-            # Increment i
-            steps.append({"line": incr_line, "text": f"i = {i} + 1", "vars": {"i": i + 1}, "highlight_bucket": None})
-
-    # If loop completes without insertion
-    if first_tombstone is not None:
-        # We found a tombstone during probing - use it!
-        dest = first_tombstone
-        steps.append({"line": assign_line, "text": f"bucket[{dest}] = {key} (using tombstone slot)", "vars": {"idx": dest, "key": key}, "highlight_bucket": dest})
-        steps.append({"line": ret_ok_line, "text": "RETURN success", "vars": {"idx": dest}, "highlight_bucket": dest})
-    else:
-        # No tombstone found, table is full
-        steps.append({"line": while_line, "text": f"Checking: i ({m}) < m ({m}) → False", "vars": {"i": m, "m": m}, "highlight_bucket": None})
-        steps.append({"line": ret_full_line, "text": "RETURN table_full", "vars": {}, "highlight_bucket": None})
-    return steps
-
-
-def build_delete_steps(table, key):
-    """Build detailed execution steps for delete operation based on current table contents."""
-    steps = []
-    mode = table.mode
-    m = table.size
-    nk_val, _ = normalize_key(key)
-    h1_val, _ = h1_fn(abs(nk_val), m)
-
-    # CHAINING
-    if mode == 'chaining':
-        steps.append({"line": 1, "text": f"FUNCTION Delete({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": f"node = bucket[{h1_val}]", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        
-        # Traverse chain
-        current = table.table[h1_val]
-        found = False
-        chain_pos = 0
-        while current:
-            steps.append({"line": 4, "text": f"Checking: node is not NULL → True (pos {chain_pos})", "vars": {"chain_pos": chain_pos}, "highlight_bucket": h1_val})
-            if current.key == key:
-                steps.append({"line": 5, "text": f"node.key ({current.key}) == key ({key}) → True", "vars": {"key": key}, "highlight_bucket": h1_val})
-                steps.append({"line": 6, "text": f"Remove node from chain at bucket[{h1_val}]", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-                steps.append({"line": 7, "text": "RETURN success", "vars": {}, "highlight_bucket": h1_val})
-                found = True
-                break
-            steps.append({"line": 5, "text": f"node.key ({current.key}) == key ({key}) → False", "vars": {}, "highlight_bucket": h1_val})
-            steps.append({"line": 8, "text": "node = node.next", "vars": {}, "highlight_bucket": h1_val})
-            current = current.next
-            chain_pos += 1
-        
-        if not found:
-            steps.append({"line": 4, "text": "Checking: node is not NULL → False", "vars": {}, "highlight_bucket": h1_val})
-            steps.append({"line": 9, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-        return steps
-
-    # OPEN ADDRESSING
-    if mode == 'double':
-        h2_val, _ = h2_fn(abs(nk_val), m)
-        steps.append({"line": 1, "text": f"FUNCTION Delete({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": f"h2 = 1 + (hash(key) % (m-1)) = {h2_val}", "vars": {"h2": h2_val}, "highlight_bucket": None})
-        steps.append({"line": 4, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-        while_line, idx_line, if_empty_line, if_match_line, assign_line, ret_ok_line, incr_line, ret_nf_line = 5, 6, 7, 8, 9, 10, 11, 12
-    else:
-        steps.append({"line": 1, "text": f"FUNCTION Delete({key}, {m})", "vars": {"key": key, "m": m}, "highlight_bucket": None})
-        steps.append({"line": 2, "text": f"h1 = hash(key) % m = {h1_val}", "vars": {"h1": h1_val}, "highlight_bucket": h1_val})
-        steps.append({"line": 3, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-        while_line, idx_line, if_empty_line, if_match_line, assign_line, ret_ok_line, incr_line, ret_nf_line = 4, 5, 6, 7, 8, 9, 10, 11
-
-    # Probe loop
-    for i in range(m):
-        steps.append({"line": while_line, "text": f"Checking: i ({i}) < m ({m}) → True", "vars": {"i": i, "m": m}, "highlight_bucket": None})
-        
-        if mode == 'linear':
-            idx = (h1_val + i) % m
-            idx_text = f"idx = (h1 + i) % m = {idx}"
-        elif mode == 'quadratic':
-            idx = (h1_val + i*i) % m
-            idx_text = f"idx = (h1 + i²) % m = {idx}"
-        else:  # double
-            step = h2_val or 1
-            idx = (h1_val + i * step) % m
-            idx_text = f"idx = (h1 + i*h2) % m = {idx}"
-        
-        steps.append({"line": idx_line, "text": idx_text, "vars": {"idx": idx, "i": i}, "highlight_bucket": idx})
-        
-        slot_val = table.table[idx]
-        if slot_val is None:
-            steps.append({"line": if_empty_line, "text": f"bucket[{idx}] is EMPTY → True", "vars": {"idx": idx}, "highlight_bucket": idx})
-            steps.append({"line": ret_nf_line, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-            return steps
-        
-        steps.append({"line": if_empty_line, "text": f"bucket[{idx}] is EMPTY → False", "vars": {"idx": idx}, "highlight_bucket": idx})
-        
-        if slot_val != TOMBSTONE and slot_val == key:
-            steps.append({"line": if_match_line, "text": f"bucket[{idx}] ({slot_val}) == key ({key}) → True", "vars": {"idx": idx, "key": key}, "highlight_bucket": idx})
-            steps.append({"line": assign_line, "text": f"bucket[{idx}] = TOMBSTONE", "vars": {"idx": idx}, "highlight_bucket": idx})
-            steps.append({"line": ret_ok_line, "text": "RETURN success", "vars": {}, "highlight_bucket": idx})
-            return steps
-        
-        steps.append({"line": if_match_line, "text": f"bucket[{idx}] ({slot_val if slot_val!=TOMBSTONE else 'TOMBSTONE'}) == key ({key}) → False", "vars": {"idx": idx}, "highlight_bucket": idx})
-        steps.append({"line": incr_line, "text": f"i = {i} + 1", "vars": {"i": i+1}, "highlight_bucket": None})
-    
-    steps.append({"line": while_line, "text": f"Checking: i ({m}) < m ({m}) → False", "vars": {"i": m, "m": m}, "highlight_bucket": None})
-    steps.append({"line": ret_nf_line, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-    return steps
+    Entity tag of a table's state at version, per response format. The store
+    epoch keeps tags from matching a different table that reuses the id.
+    """
+    tag = f"{store.epoch}.{version}"
+    return tag if mimetype == JSON else f"{tag}-{mimetype.rsplit('/', 1)[-1]}"
 
 
-def build_search_steps(table, key):
-    """Build step-by-step execution for search operation"""
-    steps = []
-    mode = table.mode
-    m = table.size
+def conditional_state(table_id, mimetype=JSON, if_none_match=''):
+    """
+    The /state response, shared by this app and the ASGI app (asgi.py).
     
-    if mode == 'chaining':
-        # Chaining search pseudocode lines: 1=func, 2=idx, 3=node, 4=while, 5=if, 6=return found, 7=node=next, 8=return not_found
-        steps.append({"line": 1, "text": f"SEARCH(key={key})", "vars": {"key": key}, "highlight_bucket": None})
-        
-        # Compute h1 using the same helpers used elsewhere
-        nk_val, _ = normalize_key(key)
-        h1_val, _ = h1_fn(abs(nk_val), m)
-        idx = h1_val
-        steps.append({"line": 2, "text": f"idx = h1(key) % m = {idx}", "vars": {"idx": idx, "key": key, "m": m}, "highlight_bucket": idx})
-        
-        # Traverse the chain
-        current = table.table[idx]
-        steps.append({"line": 3, "text": f"node = bucket[{idx}].head", "vars": {"idx": idx}, "highlight_bucket": idx})
-        
-        chain_pos = 0
-        while current is not None:
-            steps.append({"line": 4, "text": f"node != NULL → True (position {chain_pos})", "vars": {"chain_pos": chain_pos}, "highlight_bucket": idx})
-            steps.append({"line": 5, "text": f"node.key ({current.key}) == key ({key}) → {current.key == key}", "vars": {"node_key": current.key, "key": key}, "highlight_bucket": idx})
-            
-            if current.key == key:
-                steps.append({"line": 6, "text": f"RETURN found at index {idx}, position {chain_pos}", "vars": {"idx": idx, "chain_pos": chain_pos}, "highlight_bucket": idx})
-                return steps
-            
-            steps.append({"line": 7, "text": "node = node.next", "vars": {"chain_pos": chain_pos + 1}, "highlight_bucket": idx})
-            current = current.next
-            chain_pos += 1
-        
-        steps.append({"line": 4, "text": "node != NULL → False", "vars": {}, "highlight_bucket": idx})
-        steps.append({"line": 8, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-        return steps
+    Conditional on If-None-Match: an unchanged table gets an empty 304,
+    decided from its version alone without loading or serializing it.
     
-    else:
-        # Open addressing search
-        # Compute hashes consistently with insert/delete
-        nk_val, _ = normalize_key(key)
-        h1_val, _ = h1_fn(abs(nk_val), m)
-        h2_val, _ = (h2_fn(abs(nk_val), m) if mode == 'double' else (None, None))
-        
-        if mode == 'double':
-            # Double hashing: 1=func, 2=h1, 3=h2, 4=i=0, 5=while, 6=idx, 7=if empty, 8=return not_found, 9=if match, 10=return found, 11=i++, 12=return not_found
-            steps.append({"line": 1, "text": f"SEARCH(key={key})", "vars": {"key": key}, "highlight_bucket": None})
-            steps.append({"line": 2, "text": f"h1 = hash1(key) % m = {h1_val}", "vars": {"h1": h1_val, "key": key, "m": m}, "highlight_bucket": None})
-            steps.append({"line": 3, "text": f"h2 = hash2(key) = {h2_val}", "vars": {"h2": h2_val, "key": key}, "highlight_bucket": None})
-            steps.append({"line": 4, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-            while_line, idx_line, if_empty_line, ret_nf1_line, if_match_line, ret_found_line, incr_line, ret_nf2_line = 5, 6, 7, 8, 9, 10, 11, 12
+    Returns:
+        tuple: (status, payload, headers), with payload None for a 304;
+            None if the table does not exist
+    """
+    with store.lock(table_id, write=False):
+        version = store.version(table_id)
+        if version is None:
+            return None
+        etag = state_etag(version, mimetype)
+        if parse_etags(if_none_match or None).contains_weak(etag):
+            status, payload = 304, None
         else:
-            # Linear/Quadratic: 1=func, 2=h1, 3=i=0, 4=while, 5=idx, 6=if empty, 7=return not_found, 8=if match, 9=return found, 10=i++, 11=return not_found
-            steps.append({"line": 1, "text": f"SEARCH(key={key})", "vars": {"key": key}, "highlight_bucket": None})
-            steps.append({"line": 2, "text": f"h1 = hash1(key) % m = {h1_val}", "vars": {"h1": h1_val, "key": key, "m": m}, "highlight_bucket": None})
-            steps.append({"line": 3, "text": "i = 0", "vars": {"i": 0}, "highlight_bucket": None})
-            while_line, idx_line, if_empty_line, ret_nf1_line, if_match_line, ret_found_line, incr_line, ret_nf2_line = 4, 5, 6, 7, 8, 9, 10, 11
-        
-        # Probing loop
-        for i in range(m):
-            steps.append({"line": while_line, "text": f"Checking: i ({i}) < m ({m}) → True", "vars": {"i": i, "m": m}, "highlight_bucket": None})
-            
-            if mode == 'linear':
-                idx = (h1_val + i) % m
-                idx_text = f"idx = (h1 + i) % m = {idx}"
-            elif mode == 'quadratic':
-                idx = (h1_val + i*i) % m
-                idx_text = f"idx = (h1 + i²) % m = {idx}"
-            else:  # double
-                step = h2_val or 1
-                idx = (h1_val + i * step) % m
-                idx_text = f"idx = (h1 + i*h2) % m = {idx}"
-            
-            steps.append({"line": idx_line, "text": idx_text, "vars": {"idx": idx, "i": i}, "highlight_bucket": idx})
-            
-            slot_val = table.table[idx]
-            if slot_val is None:
-                steps.append({"line": if_empty_line, "text": f"bucket[{idx}] is EMPTY → True", "vars": {"idx": idx}, "highlight_bucket": idx})
-                steps.append({"line": ret_nf1_line, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-                return steps
-            
-            steps.append({"line": if_empty_line, "text": f"bucket[{idx}] is EMPTY → False", "vars": {"idx": idx}, "highlight_bucket": idx})
-            
-            if slot_val != TOMBSTONE and slot_val == key:
-                steps.append({"line": if_match_line, "text": f"bucket[{idx}] ({slot_val}) == key ({key}) → True", "vars": {"idx": idx, "key": key}, "highlight_bucket": idx})
-                steps.append({"line": ret_found_line, "text": f"RETURN found at index {idx}", "vars": {"idx": idx}, "highlight_bucket": idx})
-                return steps
-            
-            steps.append({"line": if_match_line, "text": f"bucket[{idx}] ({slot_val if slot_val!=TOMBSTONE else 'TOMBSTONE'}) == key ({key}) → False", "vars": {"idx": idx}, "highlight_bucket": idx})
-            steps.append({"line": incr_line, "text": f"i = {i} + 1", "vars": {"i": i+1}, "highlight_bucket": None})
-        
-        steps.append({"line": while_line, "text": f"Checking: i ({m}) < m ({m}) → False", "vars": {"i": m, "m": m}, "highlight_bucket": None})
-        steps.append({"line": ret_nf2_line, "text": "RETURN not_found", "vars": {}, "highlight_bucket": None})
-        return steps
+            status, payload = 200, {'state': get_table_state(store.get(table_id))}
+    # Let browsers cache the state but revalidate it on every use
+    return status, payload, {'ETag': quote_etag(etag, weak=True), 'Cache-Control': 'no-cache'}
+
+
+def state_or_delta(table, data, base_version, changed=()):
+    """
+    Pick the state payload for a response.
+    
+    A delta is sent when the client says it holds base_version (the table
+    version before this request) via the 'version' field; a missing or stale
+    version, or 'full': true, gets the full state instead.
+    """
+    if not data.get('full') and data.get('version') == base_version:
+        return {'delta': get_table_delta(table, base_version, changed)}
+    return {'state': get_table_state(table)}
 
 
 @app.route('/api/create', methods=['POST'])
 def create_table():
     """Create a new hash table"""
-    global current_id
     data = request.json
     size = data.get('size', 10)
     mode = data.get('mode', 'chaining')
     
-    if size < 1 or size > 100:
-        return jsonify({'error': 'Size must be between 1 and 100'}), 400
+    if size < 1 or size > MAX_TABLE_SIZE:
+        return jsonify({'error': f'Size must be between 1 and {MAX_TABLE_SIZE}'}), 400
     
-    table_id = f"table_{current_id}"
-    current_id += 1
-    
-    hash_tables[table_id] = HashTable(size=size, mode=mode)
+    table = HashTable(size=size, mode=mode)
+    table_id = store.create(table)
     
     return jsonify({
         'table_id': table_id,
-        'state': get_table_state(hash_tables[table_id]),
+        'state': get_table_state(table),
         'message': f'Created hash table with size {size} and mode {mode}'
     })
 
@@ -364,88 +232,296 @@ def create_table():
 @app.route('/api/<table_id>/insert', methods=['POST'])
 def insert_key(table_id):
     """Insert a key into the hash table"""
-    if table_id not in hash_tables:
-        return jsonify({'error': 'Table not found'}), 404
-    
-    data = request.json
-    key = data.get('key')
-    
-    if key is None:
-        return jsonify({'error': 'Key is required'}), 400
-    
-    # Try to convert to int
-    try:
-        key = int(key)
-    except (ValueError, TypeError):
-        pass
-    
-    table = hash_tables[table_id]
-    
-    # Build steps before insertion
-    steps = build_insert_steps(table, key)
-    
-    # Perform insertion
-    success, index, collision, message = table.insert(key)
-    
-    # Get pseudocode based on mode
-    pseudocode = get_pseudocode(table.mode, 'insert')
-    
-    return jsonify({
-        'success': success,
-        'index': index,
-        'collision': collision,
-        'message': message,
-        'state': get_table_state(table),
-        'steps': steps,
-        'pseudocode': pseudocode
-    })
+    with store.lock(table_id):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        data = request.json
+        key = data.get('key')
+        
+        if key is None:
+            return jsonify({'error': 'Key is required'}), 400
+        
+        # Try to convert to int
+        try:
+            key = int(key)
+        except (ValueError, TypeError):
+            pass
+        
+        # Perform insertion, recording the pseudocode steps it executes
+        base_version = table.version
+        steps = []
+        success, index, collision, message = table.insert(key, tracer=steps.append)
+        if success:
+            store.put(table_id, table)
+        
+        return jsonify({
+            'success': success,
+            'index': index,
+            'collision': collision,
+            'message': message,
+            **state_or_delta(table, data, base_version, [index] if success else []),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'insert', data)
+        })
 
 
 @app.route('/api/<table_id>/search', methods=['POST'])
 def search_key(table_id):
     """Search for a key in the hash table"""
-    if table_id not in hash_tables:
-        return jsonify({'error': 'Table not found'}), 404
-    
-    data = request.json
-    key = data.get('key')
+    with store.lock(table_id, write=False):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        data = request.json
+        key = data.get('key')
+        
+        if key is None:
+            return jsonify({'error': 'Key is required'}), 400
+        
+        try:
+            key = int(key)
+        except (ValueError, TypeError):
+            pass
+        
+        # Perform search, recording the pseudocode steps it executes
+        base_version = table.version
+        steps = []
+        found, index, message = table.search(key, tracer=steps.append)
+        
+        return jsonify({
+            'found': found,
+            'index': index,
+            'message': message,
+            **state_or_delta(table, data, base_version),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'search', data)
+        })
+
+
+@app.route('/api/<table_id>/delete', methods=['POST'])
+def delete_key(table_id):
+    """Delete a key from the hash table"""
+    with store.lock(table_id):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        data = request.json
+        key = data.get('key')
+        
+        if key is None:
+            return jsonify({'error': 'Key is required'}), 400
+        
+        try:
+            key = int(key)
+        except (ValueError, TypeError):
+            pass
+        
+        # Perform deletion, recording the pseudocode steps it executes
+        base_version = table.version
+        steps = []
+        success, index, message = table.delete(key, tracer=steps.append)
+        if success:
+            store.put(table_id, table)
+        
+        return jsonify({
+            'success': success,
+            'index': index,
+            'message': message,
+            **state_or_delta(table, data, base_version, [index] if success else []),
+            'steps': steps,
+            'pseudocode_ref': pseudocode_ref(table.mode, 'delete', data)
+        })
+
+
+def parse_batch_ops(data):
+    """
+    Validate a /batch body's ops list.
     
-    if key is None:
-        return jsonify({'error': 'Key is required'}), 400
+    Returns (parsed, error): a list of (op, key) pairs, or an error message
+    naming the first invalid entry.
+    """
+    ops = data.get('ops')
+    
+    if not isinstance(ops, list) or not ops:
+        return None, 'ops must be a non-empty list'
+    if len(ops) > MAX_BATCH_OPS:
+        return None, f'At most {MAX_BATCH_OPS} operations per batch'
+    
+    parsed = []
+    for position, entry in enumerate(ops):
+        op = entry.get('op') if isinstance(entry, dict) else None
+        key = entry.get('key') if isinstance(entry, dict) else None
+        if op not in BATCH_OPERATIONS:
+            return None, f'ops[{position}]: op must be one of {", ".join(BATCH_OPERATIONS)}'
+        if key is None:
+            return None, f'ops[{position}]: key is required'
+        try:
+            key = int(key)
+        except (ValueError, TypeError):
+            pass
+        parsed.append((op, key))
+    return parsed, None
+
+
+def run_batch(table, parsed, data):
+    """
+    Apply parsed batch ops to table in order.
     
-    try:
-        key = int(key)
-    except (ValueError, TypeError):
-        pass
+    Returns (response, changed) where changed lists the buckets mutated; the
+    caller stores the table if changed is non-empty.
+    """
+    want_steps = bool(data.get('steps'))
+    base_version = table.version
+    changed = []
+    results = []
+    
+    for op, key in parsed:
+        steps = [] if want_steps else None
+        tracer = steps.append if want_steps else None
+        if op == 'insert':
+            success, index, collision, _ = table.insert(key, tracer=tracer)
+            result = {'op': op, 'key': key, 'success': success, 'index': index, 'collision': collision}
+        elif op == 'search':
+            found, index, _ = table.search(key, tracer=tracer)
+            result = {'op': op, 'key': key, 'found': found, 'index': index}
+        else:
+            success, index, _ = table.delete(key, tracer=tracer)
+            result = {'op': op, 'key': key, 'success': success, 'index': index}
+        if op != 'search' and success:
+            changed.append(index)
+        if want_steps:
+            result['steps'] = steps
+        results.append(result)
+    
+    response = {
+        'results': results,
+        'applied': len(changed),
+        **state_or_delta(table, data, base_version, changed)
+    }
+    if want_steps:
+        response['pseudocode_refs'] = {op: pseudocode_ref(table.mode, op, data) for op in {op for op, _ in parsed}}
+    return response, changed
+
+
+@app.route('/api/<table_id>/batch', methods=['POST'])
+def batch_operations(table_id):
+    """
+    Run an ordered list of insert/search/delete operations in one request.
     
-    table = hash_tables[table_id]
+    Body: {"ops": [{"op": "insert", "key": 5}, ...], "steps": false,
+           "version": <int>, "full": false}
+    Every op is validated before any is executed. Results are compact
+    (no per-op state); one state or delta for the whole batch is returned.
+    """
+    with store.lock(table_id):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        data = request.json or {}
+        parsed, error = parse_batch_ops(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        response, changed = run_batch(table, parsed, data)
+        if changed:
+            store.put(table_id, table)
+        return jsonify(response)
+
+
+def sse_event(event, payload):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {dumps_json(payload).decode()}\n\n"
+
+
+def iter_traced(operation, key, outcome):
+    """
+    Run operation(key, tracer=...) on a worker thread and yield its steps as
+    they are produced; the operation's return value is stored in
+    outcome['result'], or the exception it raised in outcome['error'].
     
-    # Build steps before search
-    steps = build_search_steps(table, key)
+    The bounded queue makes the probe loop wait for a slow client. If the
+    client goes away, remaining steps are dropped but the operation still
+    runs to completion before this generator finishes.
+    """
+    steps = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancelled = threading.Event()
+    done = object()
+    
+    def tracer(step):
+        while not cancelled.is_set():
+            try:
+                steps.put(step, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    def run():
+        try:
+            outcome['result'] = operation(key, tracer=tracer)
+        except Exception as exc:
+            outcome['error'] = exc
+        finally:
+            tracer(done)
+    
+    worker = threading.Thread(target=run, name="step-stream", daemon=True)
+    worker.start()
+    try:
+        while True:
+            step = steps.get()
+            if step is done:
+                break
+            yield step
+    finally:
+        cancelled.set()
+        worker.join()
+
+
+def remember_stream_result(replay_key, payload):
+    """Keep a streamed mutation's result for replay, dropping the oldest past STREAM_REPLAY_MAX"""
+    with _stream_results_lock:
+        _stream_results[replay_key] = payload
+        _stream_results.move_to_end(replay_key)
+        while len(_stream_results) > STREAM_REPLAY_MAX:
+            _stream_results.popitem(last=False)
+
+
+@app.route('/api/<table_id>/<operation>/stream', methods=['GET', 'POST'])
+def stream_operation(table_id, operation):
+    """
+    Run insert/search/delete and stream its steps as Server-Sent Events.
     
-    # Perform search
-    found, index, message = table.search(key)
+    Parameters come from the JSON body (POST) or the query string (GET, for
+    EventSource): key, version, full, pseudocode, plus request_id on GET.
+    Events: 'pseudocode' (a pseudocode_ref) first, one 'step'
+    per executed pseudocode line, then 'result' with the same fields as the
+    non-streaming route, or 'error' if the operation failed.
     
-    # Get pseudocode based on mode
-    pseudocode = get_pseudocode(table.mode, 'search')
+    EventSource reconnects on its own when a stream breaks, so a GET insert
+    or delete with a request_id is run only once: repeating the request_id
+    replays the first result instead.
+    """
+    if operation not in BATCH_OPERATIONS:
+        return jsonify({'error': 'Unknown operation'}), 404
     
-    return jsonify({
-        'found': found,
-        'index': index,
-        'message': message,
-        'state': get_table_state(table),
-        'steps': steps,
-        'pseudocode': pseudocode
-    })
-
-
-@app.route('/api/<table_id>/delete', methods=['POST'])
-def delete_key(table_id):
-    """Delete a key from the hash table"""
-    if table_id not in hash_tables:
+    if table_id not in store:
         return jsonify({'error': 'Table not found'}), 404
     
-    data = request.json
+    if request.method == 'POST':
+        data = request.json or {}
+    else:
+        data = {
+            'key': request.args.get('key'),
+            'version': request.args.get('version', type=int),
+            'full': request.args.get('full', '').lower() in ('1', 'true'),
+            'pseudocode': request.args.get('pseudocode', '').lower() in ('1', 'true')
+        }
+    request_id = request.args.get('request_id')
+    replay_key = (table_id, request_id) if request_id and request.method == 'GET' and operation != 'search' else None
     key = data.get('key')
     
     if key is None:
@@ -456,76 +532,179 @@ def delete_key(table_id):
     except (ValueError, TypeError):
         pass
     
-    table = hash_tables[table_id]
-    
-    # Build steps before deletion
-    steps = build_delete_steps(table, key)
-    
-    # Perform deletion
-    success, index, message = table.delete(key)
-    
-    # Get pseudocode based on mode
-    pseudocode = get_pseudocode(table.mode, 'delete')
+    def generate():
+        # The lock is held for the whole stream, so concurrent writers wait
+        # for it rather than interleaving with the traced operation
+        with store.lock(table_id, write=operation != 'search'):
+            if replay_key is not None:
+                with _stream_results_lock:
+                    replayed = _stream_results.get(replay_key)
+                if replayed is not None:
+                    yield sse_event('result', replayed)
+                    return
+            table = store.get(table_id)
+            if table is None:
+                yield sse_event('error', {'error': 'Table not found'})
+                return
+            yield from generate_locked(table)
+    
+    def generate_locked(table):
+        base_version = table.version
+        yield sse_event('pseudocode', pseudocode_ref(table.mode, operation, data))
+        
+        outcome = {}
+        try:
+            for step in iter_traced(getattr(table, operation), key, outcome):
+                yield sse_event('step', step)
+        finally:
+            # Runs even if the client disconnected mid-stream
+            if 'result' in outcome:
+                if operation != 'search' and outcome['result'][0]:
+                    store.put(table_id, table)
+                outcome['payload'] = result_payload(table, base_version, outcome['result'])
+                if replay_key is not None:
+                    remember_stream_result(replay_key, outcome['payload'])
+        
+        if 'error' in outcome:
+            yield sse_event('error', {'error': f"{operation} failed: {outcome['error']}"})
+            return
+        yield sse_event('result', outcome['payload'])
+    
+    def result_payload(table, base_version, result):
+        if operation == 'insert':
+            success, index, collision, message = result
+            payload = {'success': success, 'index': index, 'collision': collision, 'message': message}
+        elif operation == 'search':
+            found, index, message = result
+            success = False
+            payload = {'found': found, 'index': index, 'message': message}
+        else:
+            success, index, message = result
+            payload = {'success': success, 'index': index, 'message': message}
+        payload.update(state_or_delta(table, data, base_version, [index] if success else []))
+        return payload
     
-    return jsonify({
-        'success': success,
-        'index': index,
-        'message': message,
-        'state': get_table_state(table),
-        'steps': steps,
-        'pseudocode': pseudocode
-    })
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/api/<table_id>/resize', methods=['POST'])
 def resize_table(table_id):
     """Resize the hash table"""
-    if table_id not in hash_tables:
-        return jsonify({'error': 'Table not found'}), 404
-    
-    data = request.json
-    new_size = data.get('new_size')
-    
-    if not new_size or new_size < 1 or new_size > 100:
-        return jsonify({'error': 'New size must be between 1 and 100'}), 400
-    
-    table = hash_tables[table_id]
-    message = table.resize(new_size)
-    
-    return jsonify({
-        'message': message,
-        'state': get_table_state(table)
-    })
+    with store.lock(table_id):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        data = request.json
+        new_size = data.get('new_size')
+        
+        if not new_size or new_size < 1 or new_size > MAX_TABLE_SIZE:
+            return jsonify({'error': f'New size must be between 1 and {MAX_TABLE_SIZE}'}), 400
+        
+        message = table.resize(new_size)
+        store.put(table_id, table)
+        
+        return jsonify({
+            'message': message,
+            'state': get_table_state(table)
+        })
 
 
 @app.route('/api/<table_id>/clear', methods=['POST'])
 def clear_table(table_id):
     """Clear the hash table"""
-    if table_id not in hash_tables:
-        return jsonify({'error': 'Table not found'}), 404
-    
-    table = hash_tables[table_id]
-    table.clear()
+    with store.lock(table_id):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        table.clear()
+        store.put(table_id, table)
+        
+        return jsonify({
+            'message': 'Table cleared',
+            'state': get_table_state(table)
+        })
+
+
+@app.route('/api/<table_id>', methods=['DELETE'])
+def delete_table(table_id):
+    """Delete a hash table and free its memory"""
+    with store.lock(table_id):
+        if not store.delete(table_id):
+            return jsonify({'error': 'Table not found'}), 404
     
-    return jsonify({
-        'message': 'Table cleared',
-        'state': get_table_state(table)
-    })
+    return jsonify({'message': f'Deleted {table_id}'})
 
 
 @app.route('/api/<table_id>/state', methods=['GET'])
 def get_state(table_id):
-    """Get current state of hash table"""
-    if table_id not in hash_tables:
+    """Get current state of hash table (conditional, see conditional_state)"""
+    mimetype = negotiate(request.headers.get('Accept', ''))
+    result = conditional_state(table_id, mimetype, request.headers.get('If-None-Match', ''))
+    if result is None:
         return jsonify({'error': 'Table not found'}), 404
     
-    return jsonify({
-        'state': get_table_state(hash_tables[table_id])
-    })
+    status, payload, headers = result
+    response = app.response_class(status=304) if payload is None else jsonify(payload)
+    response.headers.update(headers)
+    response.vary.add('Accept')
+    return response
 
 
-def get_pseudocode(mode, operation='insert'):
-    """Get pseudocode for the operation"""
+@app.route('/api/<table_id>/buckets', methods=['GET'])
+def get_buckets(table_id):
+    """Get a window of buckets (?offset=&limit=) for large tables"""
+    with store.lock(table_id, write=False):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        try:
+            offset = int(request.args.get('offset', 0))
+            limit = int(request.args.get('limit', MAX_BUCKET_PAGE))
+        except ValueError:
+            return jsonify({'error': 'offset and limit must be integers'}), 400
+        
+        if offset < 0 or limit < 1:
+            return jsonify({'error': 'offset must be >= 0 and limit >= 1'}), 400
+        limit = min(limit, MAX_BUCKET_PAGE)
+        
+        return jsonify({
+            'version': table.version,
+            'size': table.size,
+            'offset': offset,
+            'buckets': get_bucket_page(table, offset, limit)
+        })
+
+
+@app.route('/api/<table_id>/summary', methods=['GET'])
+def get_summary(table_id):
+    """Get per-range occupancy (?ranges=) without shipping any buckets"""
+    with store.lock(table_id, write=False):
+        table = store.get(table_id)
+        if table is None:
+            return jsonify({'error': 'Table not found'}), 404
+        
+        try:
+            ranges = int(request.args.get('ranges', SUMMARY_RANGES))
+        except ValueError:
+            return jsonify({'error': 'ranges must be an integer'}), 400
+        
+        if ranges < 1:
+            return jsonify({'error': 'ranges must be >= 1'}), 400
+        
+        return jsonify({
+            'version': table.version,
+            'size': table.size,
+            'count': table.count,
+            'summary': get_occupancy_summary(table, min(ranges, MAX_SUMMARY_RANGES))
+        })
+
+
+def _pseudocode_lines(mode, operation='insert'):
+    """Pseudocode source for the operation (only called to build PSEUDOCODE)"""
     if operation == 'insert':
         if mode == 'chaining':
             return [
@@ -691,10 +870,68 @@ def get_pseudocode(mode, operation='insert'):
     return []
 
 
+PSEUDOCODE_MODES = ('chaining', 'linear', 'quadratic', 'double')
+
+# Pseudocode only depends on (mode, operation): build it once, immutable,
+# with a content hash that serves as ETag and as the version clients cache by
+PSEUDOCODE = MappingProxyType({
+    (mode, op): tuple(_pseudocode_lines(mode, op))
+    for mode in PSEUDOCODE_MODES for op in BATCH_OPERATIONS
+})
+PSEUDOCODE_VERSIONS = MappingProxyType({
+    name: hashlib.sha1(json.dumps(lines).encode('utf-8')).hexdigest()[:16]
+    for name, lines in PSEUDOCODE.items()
+})
+
+
+def get_pseudocode(mode, operation='insert'):
+    """Get pseudocode for the operation"""
+    return list(PSEUDOCODE.get((mode, operation), ()))
+
+
+def pseudocode_ref(mode, operation, data=None):
+    """
+    Point a response at the cached pseudocode instead of repeating it.
+    
+    Clients fetch /api/pseudocode/<mode>/<operation> once per version; a
+    request with 'pseudocode': true still gets the lines inline.
+    """
+    ref = {
+        'mode': mode,
+        'operation': operation,
+        'version': PSEUDOCODE_VERSIONS.get((mode, operation)),
+        'url': f'/api/pseudocode/{mode}/{operation}'
+    }
+    if data and data.get('pseudocode'):
+        ref['lines'] = get_pseudocode(mode, operation)
+    return ref
+
+
+@app.route('/api/pseudocode/<mode>/<operation>', methods=['GET'])
+def pseudocode(mode, operation):
+    """Serve pseudocode with a long-lived, revalidatable cache entry"""
+    version = PSEUDOCODE_VERSIONS.get((mode, operation))
+    if version is None:
+        return jsonify({'error': 'Unknown mode or operation'}), 404
+    
+    response = jsonify({
+        'mode': mode,
+        'operation': operation,
+        'version': version,
+        'pseudocode': get_pseudocode(mode, operation)
+    })
+    # One entity tag per representation (JSON, MessagePack, CBOR)
+    mimetype = negotiate(request.headers.get('Accept', ''))
+    response.set_etag(version if mimetype == JSON else f"{version}-{mimetype.rsplit('/', 1)[-1]}")
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
+
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({'status': 'healthy', 'tables': len(hash_tables)})
+    return jsonify({'status': 'healthy', 'tables': len(store)})
 
 
 @app.route('/')
@@ -708,9 +945,15 @@ def index():
             'POST /api/<table_id>/insert': 'Insert a key',
             'POST /api/<table_id>/search': 'Search for a key',
             'POST /api/<table_id>/delete': 'Delete a key',
+            'POST /api/<table_id>/batch': 'Run a list of insert/search/delete operations',
+            'GET|POST /api/<table_id>/<insert|search|delete>/stream': 'Run an operation, streaming steps as Server-Sent Events',
             'POST /api/<table_id>/resize': 'Resize the table',
             'POST /api/<table_id>/clear': 'Clear the table',
             'GET /api/<table_id>/state': 'Get table state',
+            'GET /api/pseudocode/<mode>/<operation>': 'Get pseudocode (cacheable, ETag)',
+            'GET /api/<table_id>/buckets': 'Get a window of buckets (?offset=&limit=)',
+            'GET /api/<table_id>/summary': 'Get occupancy per bucket range (?ranges=)',
+            'DELETE /api/<table_id>': 'Delete the table',
             'GET /api/health': 'Health check'
         }
     })
@@ -0,0 +1,225 @@
+"""
+Load test: Flask (WSGI) app vs ASGI app.
+
+Each client creates its own table and then loops over insert / search /
+delete requests while one extra client keeps resizing a large table. Reports
+requests/sec and p50/p99 latency of the light requests, which is where a
+resize blocking the worker shows up.
+
+By default both apps are driven in-process, without sockets: the Flask app
+from a thread pool (like a threaded WSGI server), the ASGI app from tasks on
+one event loop (like a single uvicorn worker). Pass --flask-url / --asgi-url
+to load running servers over HTTP instead, e.g.
+    flask --app index run --port 5000 --with-threads
+    uvicorn asgi:app --port 5001
+    python load_test.py --flask-url http://127.0.0.1:5000 --asgi-url http://127.0.0.1:5001
+
+Usage:
+    python load_test.py [--clients 32] [--requests 200] [--resize-size 200000]
+"""
+
+import argparse
+import asyncio
+import http.client
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import asgi
+import index
+
+LIGHT_TABLE_SIZE = 256
+
+
+def wsgi_caller():
+    """Call the Flask app directly through WSGI"""
+    def call(method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'load-test',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(payload)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(payload),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        status = []
+        chunks = index.app.wsgi_app(environ, lambda s, headers, exc_info=None: status.append(s))
+        data = b''.join(chunks)
+        return int(status[0].split()[0]), json.loads(data)
+    return call
+
+
+def asgi_caller():
+    """Call the ASGI app directly (coroutine)"""
+    async def call(method, path, body=None):
+        payload = json.dumps(body).encode() if body is not None else b''
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+                 'headers': [(b'content-type', b'application/json')]}
+        response = {}
+
+        async def receive():
+            return {'type': 'http.request', 'body': payload, 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            else:
+                response['body'] = message['body']
+
+        # Yield first, as reading the request from a socket would, so that
+        # concurrent clients interleave on the loop
+        await asyncio.sleep(0)
+        await asgi.app(scope, receive, send)
+        return response['status'], json.loads(response['body'])
+    return call
+
+
+def http_caller(base_url):
+    """Call a running server over HTTP, one keep-alive connection per thread"""
+    parts = urlsplit(base_url)
+    local = threading.local()
+
+    def call(method, path, body=None):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        payload = json.dumps(body) if body is not None else None
+        conn.request(method, path, payload, {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    return call
+
+
+def light_requests(client_id, table_id, count):
+    """The request sequence of one light client"""
+    base = client_id * 1_000_000
+    for i in range(count):
+        key = base + i // 2
+        if i % 2 == 0:
+            yield 'POST', f'/api/{table_id}/insert', {'key': key}
+        elif i % 10 == 9:
+            yield 'POST', f'/api/{table_id}/delete', {'key': key}
+        else:
+            yield 'POST', f'/api/{table_id}/search', {'key': key}
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def report(name, latencies, elapsed, resizes):
+    latencies.sort()
+    print(f"{name:>6}: {len(latencies) / elapsed:8.0f} req/s   "
+          f"p50 {percentile(latencies, 0.50) * 1000:7.2f} ms   "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms   "
+          f"({len(latencies)} requests, {resizes} resizes in {elapsed:.2f}s)")
+
+
+def run_threaded(name, call, clients, count, resize_size):
+    """Drive a synchronous caller from one thread per client"""
+    tables = [call('POST', '/api/create', {'size': LIGHT_TABLE_SIZE})[1]['table_id'] for _ in range(clients)]
+    big = call('POST', '/api/create', {'size': resize_size})[1]['table_id']
+    call('POST', f'/api/{big}/batch', {'ops': [{'op': 'insert', 'key': k} for k in range(10_000)]})
+    done = threading.Event()
+    resizes = 0
+
+    def light(client_id):
+        latencies = []
+        for method, path, body in light_requests(client_id, tables[client_id], count):
+            start = time.perf_counter()
+            status, _ = call(method, path, body)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, (path, status)
+        return latencies
+
+    def heavy():
+        nonlocal resizes
+        while not done.is_set():
+            status, _ = call('POST', f'/api/{big}/resize', {'new_size': resize_size + resizes % 2})
+            assert status == 200
+            resizes += 1
+
+    with ThreadPoolExecutor(max_workers=clients + 1) as pool:
+        resizer = pool.submit(heavy)
+        start = time.perf_counter()
+        results = list(pool.map(light, range(clients)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        resizer.result()
+
+    for table_id in tables + [big]:
+        call('DELETE', f'/api/{table_id}')
+    report(name, [l for latencies in results for l in latencies], elapsed, resizes)
+
+
+async def run_async(name, call, clients, count, resize_size):
+    """Drive an async caller from one task per client"""
+    tables = [(await call('POST', '/api/create', {'size': LIGHT_TABLE_SIZE}))[1]['table_id'] for _ in range(clients)]
+    big = (await call('POST', '/api/create', {'size': resize_size}))[1]['table_id']
+    await call('POST', f'/api/{big}/batch', {'ops': [{'op': 'insert', 'key': k} for k in range(10_000)]})
+    done = asyncio.Event()
+    resizes = 0
+
+    async def light(client_id):
+        latencies = []
+        for method, path, body in light_requests(client_id, tables[client_id], count):
+            start = time.perf_counter()
+            status, _ = await call(method, path, body)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, (path, status)
+        return latencies
+
+    async def heavy():
+        nonlocal resizes
+        while not done.is_set():
+            status, _ = await call('POST', f'/api/{big}/resize', {'new_size': resize_size + resizes % 2})
+            assert status == 200
+            resizes += 1
+
+    resizer = asyncio.create_task(heavy())
+    start = time.perf_counter()
+    results = await asyncio.gather(*(light(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await resizer
+
+    for table_id in tables + [big]:
+        await call('DELETE', f'/api/{table_id}')
+    report(name, [l for latencies in results for l in latencies], elapsed, resizes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=32, help='concurrent light clients')
+    parser.add_argument('--requests', type=int, default=200, help='requests per light client')
+    parser.add_argument('--resize-size', type=int, default=200_000, help='buckets in the table being resized')
+    parser.add_argument('--flask-url', help='load a running Flask server instead of calling it in-process')
+    parser.add_argument('--asgi-url', help='load a running ASGI server instead of calling it in-process')
+    args = parser.parse_args()
+
+    flask_call = http_caller(args.flask_url) if args.flask_url else wsgi_caller()
+    run_threaded('flask', flask_call, args.clients, args.requests, args.resize_size)
+
+    if args.asgi_url:
+        run_threaded('asgi', http_caller(args.asgi_url), args.clients, args.requests, args.resize_size)
+    else:
+        asyncio.run(run_async('asgi', asgi_caller(), args.clients, args.requests, args.resize_size))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
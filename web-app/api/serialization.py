@@ -0,0 +1,152 @@
+"""
+Response encoding for the Hash Table Simulator API
+Encodes payloads with the fastest JSON encoder available and, when the
+client's Accept header prefers it, as MessagePack or CBOR. Large bodies are
+gzip- or Brotli-compressed according to Accept-Encoding.
+
+orjson, msgpack, cbor2 and brotli are optional; without them every response
+is plain (or gzipped) JSON from the standard library.
+"""
+
+import gzip
+import json
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: application/msgpack responses
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # optional: application/cbor responses
+    cbor2 = None
+
+try:
+    import brotli
+except ImportError:  # optional: Content-Encoding: br
+    brotli = None
+
+JSON = 'application/json'
+MSGPACK = 'application/msgpack'
+CBOR = 'application/cbor'
+
+# Bodies smaller than this are sent uncompressed (about one TCP segment)
+COMPRESS_MIN_BYTES = 1400
+# Fast settings: state bodies are highly repetitive, so these already get
+# most of the size reduction at a fraction of the CPU cost of the defaults
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps_json(obj) -> bytes:
+    """Compact JSON bytes, via orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. integer keys beyond 64 bits; the json module copes
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+# Supported media types, in order of preference when the client is indifferent
+ENCODERS = {JSON: dumps_json}
+if msgpack is not None:
+    ENCODERS[MSGPACK] = msgpack.packb
+    ENCODERS['application/x-msgpack'] = msgpack.packb
+if cbor2 is not None:
+    ENCODERS[CBOR] = cbor2.dumps
+
+
+def negotiate(accept: str) -> str:
+    """
+    Pick the response media type for an Accept header value.
+
+    JSON unless the client ranks an available binary format higher; at equal
+    quality (including */*) JSON wins.
+    """
+    if not accept:
+        return JSON
+    return parse_accept_header(accept, MIMEAccept).best_match(list(ENCODERS), default=JSON)
+
+
+def encode(obj, mimetype: str = JSON):
+    """
+    Encode obj as mimetype and return (body, mimetype).
+
+    Falls back to JSON when the binary encoder cannot represent the payload
+    (MessagePack has no integers beyond 64 bits).
+    """
+    if mimetype != JSON:
+        try:
+            return ENCODERS[mimetype](obj), mimetype
+        except (OverflowError, TypeError, ValueError):
+            pass
+    return dumps_json(obj), JSON
+
+
+# Content codings, preferred first
+CODINGS = {'gzip': lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+if brotli is not None:
+    CODINGS = {'br': lambda body: brotli.compress(body, quality=BROTLI_QUALITY), **CODINGS}
+
+
+def compress(body: bytes, accept_encoding: str):
+    """
+    Compress body for an Accept-Encoding header value.
+
+    Returns (body, coding), with coding None when the body is small or the
+    client accepts none of the available codings.
+    """
+    if len(body) < COMPRESS_MIN_BYTES or not accept_encoding:
+        return body, None
+    coding = parse_accept_header(accept_encoding).best_match(list(CODINGS))
+    if coding is None:
+        return body, None
+    return CODINGS[coding](body), coding
+
+
+def compress_response(response, accept_encoding: str):
+    """Compress a buffered Flask response in place (after_request hook)"""
+    response.vary.add('Accept-Encoding')
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers):
+        return response
+    body, coding = compress(response.get_data(), accept_encoding)
+    if coding is not None:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = coding
+        # The bytes differ per coding; a weak tag still matches any of them
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+    return response
+
+
+class APIJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider: jsonify() responses go through encode(), in the
+    format negotiated from the current request's Accept header.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_json(obj).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        accept = request.headers.get('Accept', '') if has_request_context() else ''
+        body, mimetype = encode(obj, negotiate(accept))
+        response = self._app.response_class(body, mimetype=mimetype)
+        response.vary.add('Accept')
+        return response
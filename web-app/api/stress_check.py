@@ -0,0 +1,140 @@
+"""
+Concurrency stress check for the Flask API.
+
+Hammers one table from many threads with interleaved insert / search /
+delete / batch / stream requests (and creates tables in parallel), then
+checks that no update was lost: the final keys, count and version must be
+exactly what the successful operations imply. Runs against every table
+store backend, including a bounded store that spills tables to disk.
+
+Usage:
+    python stress_check.py [--threads 8] [--ops 200]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import index
+from table_store import EvictingTableStore, InProcessTableStore, RedisTableStore, SharedMemoryTableStore
+
+TABLE_SIZE = 512
+
+
+def worker(worker_id, table_id, ops):
+    """Insert ops keys owned by this worker, searching and deleting as it goes."""
+    client = index.app.test_client()
+    kept, mutations, requests = set(), 0, 0
+    base = worker_id * 1_000_000
+    for i in range(ops):
+        key = base + i
+        kind = i % 10
+        requests += 2 + (kind == 3)
+        if kind == 7:
+            # Batches mutate several keys under a single lock acquisition
+            batch = [{'op': 'insert', 'key': key}, {'op': 'search', 'key': key},
+                     {'op': 'delete', 'key': key}, {'op': 'insert', 'key': key}]
+            r = client.post(f'/api/{table_id}/batch', json={'ops': batch}).get_json()
+            assert [res.get('success', res.get('found')) for res in r['results']] == [True] * 4, r
+            mutations += r['applied']
+            kept.add(key)
+        elif kind == 9:
+            r = client.post(f'/api/{table_id}/insert/stream', json={'key': key})
+            result = r.data.decode().rsplit('event: result\ndata: ', 1)[-1]
+            assert json.loads(result)['success'], r.data[-200:]
+            mutations += 1
+            kept.add(key)
+        else:
+            r = client.post(f'/api/{table_id}/insert', json={'key': key}).get_json()
+            assert r['success'], r
+            mutations += 1
+            kept.add(key)
+        if kind == 3:
+            # Delete something inserted earlier by this worker
+            victim = base + i - 3
+            r = client.post(f'/api/{table_id}/delete', json={'key': victim}).get_json()
+            assert r['success'], r
+            mutations += 1
+            kept.discard(victim)
+        r = client.post(f'/api/{table_id}/search', json={'key': key}).get_json()
+        assert r['found'] == (key in kept), r
+    return kept, mutations, requests
+
+
+def read_keys(client, table_id, size):
+    """Collect every stored key through the paged /buckets endpoint."""
+    keys = []
+    for offset in range(0, size, index.MAX_BUCKET_PAGE):
+        page = client.get(f'/api/{table_id}/buckets?offset={offset}').get_json()
+        keys.extend(key for contents in page['buckets']['contents'] for key in contents)
+    return keys
+
+
+def create_tables(count):
+    client = index.app.test_client()
+    return [client.post('/api/create', json={'size': 8}).get_json()['table_id'] for _ in range(count)]
+
+
+def run(store_name, store, threads, ops):
+    index.store = store
+    client = index.app.test_client()
+    # A small chained table keeps full-state responses cheap while every
+    # request still contends for the same table
+    size = TABLE_SIZE
+    table_id = client.post('/api/create', json={'size': size, 'mode': 'chaining'}).get_json()['table_id']
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        workers = [pool.submit(worker, n, table_id, ops) for n in range(threads)]
+        creators = [pool.submit(create_tables, 25) for _ in range(4)]
+        results = [f.result() for f in workers]
+        created = [tid for f in creators for tid in f.result()]
+    elapsed = time.perf_counter() - start
+
+    expected = set().union(*(kept for kept, _, _ in results))
+    mutations = sum(m for _, m, _ in results)
+    requests = sum(n for _, _, n in results) + len(created)
+    state = client.get(f'/api/{table_id}/state').get_json()['state']
+    keys = read_keys(client, table_id, size)
+
+    problems = []
+    if state['count'] != len(expected):
+        problems.append(f"count {state['count']} != {len(expected)}")
+    if len(keys) != len(set(keys)) or set(keys) != expected:
+        problems.append(f"{len(set(keys) ^ expected)} keys differ, {len(keys) - len(set(keys))} duplicated")
+    if state['version'] != mutations:
+        problems.append(f"version {state['version']} != {mutations} mutations")
+    if len(set(created)) != len(created) or table_id in created:
+        problems.append("duplicate table ids")
+
+    if problems:
+        print(f"❌ {store_name}: " + "; ".join(problems))
+        return False
+    print(f"✅ {store_name}: {requests} requests from {threads} threads in {elapsed:.2f}s, "
+          f"{len(expected)} keys, version {mutations}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=200, help='operations per thread')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = [
+            ('memory', InProcessTableStore()),
+            # Parallel creates keep evicting the contended table to disk
+            ('memory, evicting to disk', EvictingTableStore(max_tables=2, spill_dir=directory + '/spill')),
+            ('shm', SharedMemoryTableStore(directory)),
+            ('redis (in-process stand-in)', RedisTableStore()),
+        ]
+        ok = all([run(name, store, args.threads, args.ops) for name, store in stores])
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
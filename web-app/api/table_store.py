@@ -0,0 +1,671 @@
+"""
+Pluggable table storage for the Flask API.
+
+The API used to keep tables in a module-level dict, which only works with a
+single long-lived worker. A TableStore hides where tables live so any worker
+can serve any table_id:
+
+- InProcessTableStore:    plain dict, single worker / local development
+- SharedMemoryTableStore: binary snapshots in a tmpfs directory (/dev/shm),
+                          shared by every worker on the host
+- RedisTableStore:        snapshots in a Redis-compatible server; LocalRedis
+                          is an in-process stand-in with the same interface
+
+Tables cross process boundaries as HashTable.to_bytes() snapshots, which load
+without rehashing.
+
+Callers hold store.lock(table_id, write=...) from get() until after put(), so
+threaded (or multi-process) workers never interleave inside one table: reads
+share the lock, writes are exclusive.
+
+Select a backend with the TABLE_STORE environment variable
+('memory', 'shm' or 'redis'); see create_store_from_env().
+"""
+
+import fnmatch
+import itertools
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+from hash_table import HashTable, SNAPSHOT_HEADER_SIZE
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+DEFAULT_MAX_TABLES = 1000
+DEFAULT_IDLE_TTL = 3600.0  # seconds
+
+# Redis locks expire on their own if the worker holding them dies
+REDIS_LOCK_TIMEOUT = 60.0  # seconds
+
+# Per-object overheads used by estimate_table_bytes (CPython, 64-bit)
+_TABLE_BASE_BYTES = 512
+_KEY_BYTES = 48
+_CHAINED_KEY_BYTES = 48 + 56
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader/writer lock.
+
+    Any number of readers may hold it at once; a writer holds it alone. Once
+    a writer is waiting, new readers queue behind it, so a steady stream of
+    searches cannot starve inserts.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if self._readers == 0:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+
+    def try_acquire_write(self) -> bool:
+        """Take the write lock only if nobody holds or is waiting for it."""
+        with self._cond:
+            if self._writer or self._readers or self._writers_waiting:
+                return False
+            self._writer = True
+            return True
+
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class TableLocks:
+    """One ReadWriteLock per table id, created on first use."""
+
+    def __init__(self):
+        self._locks = {}
+        self._mutex = threading.Lock()
+
+    def get(self, table_id: str) -> ReadWriteLock:
+        with self._mutex:
+            lock = self._locks.get(table_id)
+            if lock is None:
+                lock = self._locks[table_id] = ReadWriteLock()
+            return lock
+
+    def peek(self, table_id: str) -> Optional[ReadWriteLock]:
+        """The table's lock if one was ever created, without creating it."""
+        with self._mutex:
+            return self._locks.get(table_id)
+
+    def discard(self, table_id: str):
+        with self._mutex:
+            self._locks.pop(table_id, None)
+
+
+class TableStore:
+    """
+    Interface for table storage backends.
+
+    get() returns a HashTable the caller may mutate; call put() afterwards
+    to publish the new state to other workers. Wrap the whole get/put cycle
+    in lock() when requests can run concurrently.
+    """
+
+    def __init__(self):
+        self._table_locks = TableLocks()
+        # Changes whenever table ids may be handed out again (a new process
+        # for in-process stores), so (epoch, id, version) names one state
+        self.epoch = uuid.uuid4().hex[:8]
+
+    @contextmanager
+    def lock(self, table_id: str, write: bool = True):
+        """
+        Context manager guarding one table.
+
+        Readers (write=False) share it; a writer excludes everyone else. The
+        default implementation only coordinates threads of this process.
+        """
+        if table_id not in self:
+            # Nothing to guard; don't mint locks for arbitrary ids
+            yield
+            return
+        lock = self._table_locks.get(table_id)
+        with (lock.write() if write else lock.read()):
+            yield
+
+    def create(self, table: HashTable) -> str:
+        """Store a new table and return its freshly allocated id."""
+        table_id = self.allocate_id()
+        self.put(table_id, table)
+        return table_id
+
+    def allocate_id(self) -> str:
+        """Return a table id unique across all workers sharing the store."""
+        raise NotImplementedError
+
+    def get(self, table_id: str) -> Optional[HashTable]:
+        """Return the table, or None if it does not exist."""
+        raise NotImplementedError
+
+    def put(self, table_id: str, table: HashTable):
+        """Save the current state of a table."""
+        raise NotImplementedError
+
+    def version(self, table_id: str) -> Optional[int]:
+        """The table's mutation version, or None if it does not exist."""
+        table = self.get(table_id)
+        return table.version if table is not None else None
+
+    def delete(self, table_id: str) -> bool:
+        """Remove a table; returns False if it did not exist."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, table_id: str) -> bool:
+        return self.get(table_id) is not None
+
+
+class InProcessTableStore(TableStore):
+    """Tables kept as live objects in this process (the original behaviour)."""
+
+    def __init__(self):
+        super().__init__()
+        self._tables = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def allocate_id(self) -> str:
+        with self._lock:
+            return f"table_{next(self._ids)}"
+
+    def get(self, table_id):
+        return self._tables.get(table_id)
+
+    def put(self, table_id, table):
+        self._tables[table_id] = table
+
+    def delete(self, table_id):
+        self._table_locks.discard(table_id)
+        return self._tables.pop(table_id, None) is not None
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __contains__(self, table_id):
+        return table_id in self._tables
+
+
+class SharedMemoryTableStore(TableStore):
+    """
+    Tables stored as snapshot files in a shared directory.
+
+    Defaults to /dev/shm, which is RAM-backed on Linux, so reads and writes
+    never touch disk while still being visible to every worker process.
+    Writes go through a temp file and os.replace(), so readers never observe
+    a partially written snapshot.
+    """
+
+    SUFFIX = ".htsnap"
+
+    def __init__(self, directory: Optional[str] = None):
+        super().__init__()
+        if directory is None:
+            base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+            directory = os.path.join(base, "hashtable-store")
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self._counter_path = os.path.join(self.directory, "next_id")
+        # Shared by every worker using the directory; a wiped directory
+        # restarts ids and gets a new epoch with them
+        epoch_path = os.path.join(self.directory, "epoch")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.epoch)
+            os.link(tmp_path, epoch_path)  # atomic; fails if another worker won
+        except FileExistsError:
+            with open(epoch_path) as f:
+                self.epoch = f.read().strip()
+        finally:
+            os.unlink(tmp_path)
+
+    def _path(self, table_id: str, suffix: str = SUFFIX) -> str:
+        if os.sep in table_id or (os.altsep and os.altsep in table_id) or table_id.startswith('.'):
+            raise KeyError(table_id)
+        return os.path.join(self.directory, table_id + suffix)
+
+    @contextmanager
+    def lock(self, table_id, write=True):
+        """flock() on a per-table lock file, shared by all worker processes."""
+        if fcntl is None or table_id not in self:
+            with super().lock(table_id, write):
+                yield
+            return
+        # Every acquisition opens its own descriptor, so threads of one
+        # process exclude each other just like separate processes do
+        with open(self._path(table_id, ".lock"), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX if write else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def allocate_id(self) -> str:
+        if fcntl is None:
+            return f"table_{uuid.uuid4().hex}"
+        with open(self._counter_path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                current = int(f.read() or 0)
+                f.seek(0)
+                f.truncate()
+                f.write(str(current + 1))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return f"table_{current}"
+
+    def get(self, table_id):
+        try:
+            with open(self._path(table_id), 'rb') as f:
+                data = f.read()
+        except (FileNotFoundError, KeyError):
+            return None
+        return HashTable.from_bytes(data)
+
+    def version(self, table_id):
+        # Reads only the snapshot header
+        try:
+            with open(self._path(table_id), 'rb') as f:
+                header = f.read(SNAPSHOT_HEADER_SIZE)
+        except (FileNotFoundError, KeyError):
+            return None
+        return HashTable.snapshot_version(header)
+
+    def put(self, table_id, table):
+        path = self._path(table_id)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(table.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, table_id):
+        try:
+            os.remove(self._path(table_id))
+        except (FileNotFoundError, KeyError):
+            return False
+        try:
+            os.remove(self._path(table_id, ".lock"))
+        except FileNotFoundError:
+            pass
+        return True
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(self.SUFFIX))
+
+    def __contains__(self, table_id):
+        try:
+            return os.path.exists(self._path(table_id))
+        except KeyError:
+            return False
+
+
+class LocalRedis:
+    """
+    Minimal in-process stand-in for a Redis client.
+
+    Implements only the commands RedisTableStore uses (get, getrange, set,
+    delete, exists, incr, keys, lock) with redis-py's return conventions, so
+    the store can be exercised without a server.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+        self._locks = {}
+
+    def get(self, name):
+        return self._data.get(name)
+
+    def getrange(self, name, start, end):
+        # Redis ranges include the end offset
+        return self._data.get(name, b"")[start:end + 1]
+
+    def set(self, name, value, nx=False):
+        with self._lock:
+            if nx and name in self._data:
+                return None
+            self._data[name] = bytes(value) if not isinstance(value, (int, str)) else str(value).encode()
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(1 for name in names if self._data.pop(name, None) is not None)
+
+    def exists(self, *names):
+        return sum(1 for name in names if name in self._data)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            value = int(self._data.get(name, b"0")) + amount
+            self._data[name] = str(value).encode()
+            return value
+
+    def keys(self, pattern='*'):
+        return [name.encode() for name in list(self._data) if fnmatch.fnmatchcase(name, pattern)]
+
+    def lock(self, name, timeout=None):
+        # timeout (auto-expiry) only matters across processes; ignored here
+        with self._lock:
+            return self._locks.setdefault(name, threading.Lock())
+
+
+class RedisTableStore(TableStore):
+    """Tables stored as snapshots in a Redis-compatible key/value server."""
+
+    PREFIX = "hashtable:"
+
+    def __init__(self, client=None):
+        """
+        Args:
+            client: redis.Redis-like client; defaults to a LocalRedis stand-in
+        """
+        super().__init__()
+        self.client = client if client is not None else LocalRedis()
+        # First worker to start picks the epoch; the rest adopt it
+        self.client.set(self.PREFIX + "epoch", self.epoch, nx=True)
+        self.epoch = self.client.get(self.PREFIX + "epoch").decode()
+
+    def lock(self, table_id, write=True):
+        # Redis locks are exclusive; readers serialize too
+        return self.client.lock(self.PREFIX + "lock:" + table_id, timeout=REDIS_LOCK_TIMEOUT)
+
+    def allocate_id(self) -> str:
+        # INCR is atomic on the server, so ids are unique across workers
+        return f"table_{self.client.incr(self.PREFIX + 'next_id') - 1}"
+
+    def get(self, table_id):
+        data = self.client.get(self.PREFIX + table_id)
+        return HashTable.from_bytes(data) if data is not None else None
+
+    def version(self, table_id):
+        # Fetches only the snapshot header
+        header = self.client.getrange(self.PREFIX + table_id, 0, SNAPSHOT_HEADER_SIZE - 1)
+        return HashTable.snapshot_version(header) if header else None
+
+    def put(self, table_id, table):
+        self.client.set(self.PREFIX + table_id, table.to_bytes())
+
+    def delete(self, table_id):
+        return self.client.delete(self.PREFIX + table_id) > 0
+
+    def __len__(self):
+        return len(self.client.keys(self.PREFIX + "table_*"))
+
+    def __contains__(self, table_id):
+        return bool(self.client.exists(self.PREFIX + table_id))
+
+
+class EvictingTableStore(InProcessTableStore):
+    """
+    In-process store with bounded memory.
+
+    Tables are kept in LRU order. After every access, tables idle for longer
+    than ttl_seconds are evicted, then the least recently used ones until
+    max_tables, max_keys and max_bytes all hold. With spill_dir set, evicted
+    tables are written there as snapshots and reloaded transparently the next
+    time their id is requested; otherwise they are dropped.
+
+    Byte usage is an O(1) estimate per table (see estimate_table_bytes), kept
+    up to date on every get/put rather than measured.
+
+    A table whose lock() is held (or waited for) is never evicted, so a
+    request working on it cannot have it spilled mid-mutation; it becomes
+    eligible again once the lock is released.
+    """
+
+    def __init__(self, max_tables: Optional[int] = None, max_keys: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 spill_dir: Optional[str] = None, clock=time.monotonic):
+        super().__init__()
+        self.max_tables = max_tables
+        self.max_keys = max_keys
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_dir = spill_dir
+        self.clock = clock
+        self._tables = OrderedDict()   # table_id -> HashTable, least recent first
+        self._last_used = {}           # table_id -> clock() of last access
+        self._weights = {}             # table_id -> (keys, bytes)
+        self._total_keys = 0
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def _spill_path(self, table_id: str) -> str:
+        if os.sep in table_id or (os.altsep and os.altsep in table_id) or table_id.startswith('.'):
+            raise KeyError(table_id)
+        return os.path.join(self.spill_dir, table_id + ".htsnap")
+
+    def _touch(self, table_id: str, table: HashTable):
+        """Record an access and refresh the table's weight."""
+        self._tables[table_id] = table
+        self._tables.move_to_end(table_id)
+        self._last_used[table_id] = self.clock()
+        old_keys, old_bytes = self._weights.get(table_id, (0, 0))
+        keys, size_bytes = table.count, estimate_table_bytes(table)
+        self._weights[table_id] = (keys, size_bytes)
+        self._total_keys += keys - old_keys
+        self._total_bytes += size_bytes - old_bytes
+
+    def _forget(self, table_id: str) -> HashTable:
+        table = self._tables.pop(table_id)
+        del self._last_used[table_id]
+        keys, size_bytes = self._weights.pop(table_id)
+        self._total_keys -= keys
+        self._total_bytes -= size_bytes
+        return table
+
+    def _over_limit(self) -> bool:
+        return ((self.max_tables is not None and len(self._tables) > self.max_tables)
+                or (self.max_keys is not None and self._total_keys > self.max_keys)
+                or (self.max_bytes is not None and self._total_bytes > self.max_bytes))
+
+    def _evict(self, keep: Optional[str] = None):
+        """Expire idle tables, then evict LRU tables until within limits."""
+        now = self.clock()
+        victims = []
+        for table_id in self._tables:
+            if table_id == keep:
+                continue
+            if self.ttl_seconds is not None and now - self._last_used[table_id] > self.ttl_seconds:
+                victims.append(table_id)
+            else:
+                break  # LRU order: everything after this was used more recently
+        for table_id in victims:
+            self._evict_one(table_id)
+        if self._over_limit():
+            for table_id in [t for t in self._tables if t != keep]:
+                if self._evict_one(table_id) and not self._over_limit():
+                    break
+
+    def _evict_one(self, table_id: str) -> bool:
+        """Spill (or drop) one table; returns False if its lock is in use."""
+        lock = self._table_locks.peek(table_id)
+        if lock is not None and not lock.try_acquire_write():
+            return False
+        try:
+            table = self._forget(table_id)
+            self.evictions += 1
+            if self.spill_dir:
+                table.save(self._spill_path(table_id))
+            else:
+                # Dropped for good: its lock guards nothing any more
+                self._table_locks.discard(table_id)
+        finally:
+            if lock is not None:
+                lock.release_write()
+        return True
+
+    def _unspill(self, table_id: str):
+        """Remove table_id's spill file; returns True if there was one."""
+        try:
+            os.remove(self._spill_path(table_id))
+            return True
+        except (FileNotFoundError, KeyError):
+            return False
+
+    def get(self, table_id):
+        with self._lock:
+            table = self._tables.get(table_id)
+            if table is None and self.spill_dir:
+                try:
+                    path = self._spill_path(table_id)
+                    table = HashTable.load(path)
+                except (FileNotFoundError, KeyError):
+                    return None
+                os.remove(path)
+            if table is None:
+                return None
+            self._touch(table_id, table)
+            self._evict(keep=table_id)
+            return table
+
+    def put(self, table_id, table):
+        with self._lock:
+            self._touch(table_id, table)
+            if self.spill_dir:
+                # The live table supersedes any spilled copy
+                self._unspill(table_id)
+            self._evict(keep=table_id)
+
+    def delete(self, table_id):
+        self._table_locks.discard(table_id)
+        with self._lock:
+            removed = False
+            if table_id in self._tables:
+                self._forget(table_id)
+                removed = True
+            if self.spill_dir and self._unspill(table_id):
+                removed = True
+            return removed
+
+    def __contains__(self, table_id):
+        if table_id in self._tables:
+            return True
+        if not self.spill_dir:
+            return False
+        try:
+            return os.path.exists(self._spill_path(table_id))
+        except KeyError:
+            return False
+
+    def stats(self) -> dict:
+        """Current usage against the configured limits."""
+        with self._lock:
+            return {
+                'tables': len(self._tables),
+                'keys': self._total_keys,
+                'bytes': self._total_bytes,
+                'evictions': self.evictions,
+            }
+
+
+def estimate_table_bytes(table: HashTable) -> int:
+    """
+    Rough O(1) memory estimate for a table.
+
+    One pointer per slot plus a fixed per-key overhead (key object, and the
+    Node wrapper in chaining mode).
+    """
+    per_key = _CHAINED_KEY_BYTES if table.mode == 'chaining' else _KEY_BYTES
+    return _TABLE_BASE_BYTES + 8 * table.size + per_key * table.count
+
+
+def _env_number(name: str, cast):
+    value = os.environ.get(name)
+    return cast(value) if value not in (None, '') else None
+
+
+def create_store_from_env() -> TableStore:
+    """
+    Build the store selected by the environment.
+
+    TABLE_STORE:      'memory' (default), 'shm' or 'redis'
+    TABLE_MAX_TABLES, TABLE_MAX_KEYS, TABLE_MAX_BYTES, TABLE_IDLE_TTL,
+    TABLE_SPILL_DIR:  eviction limits for the 'memory' backend (by default
+                      at most DEFAULT_MAX_TABLES tables, evicted after
+                      DEFAULT_IDLE_TTL idle seconds, no spilling)
+    TABLE_STORE_DIR:  directory for the 'shm' backend
+    REDIS_URL:        server for the 'redis' backend (needs the redis
+                      package); without it the LocalRedis stand-in is used
+    """
+    kind = os.environ.get('TABLE_STORE', 'memory').lower()
+    if kind == 'memory':
+        return EvictingTableStore(
+            max_tables=_env_number('TABLE_MAX_TABLES', int) or DEFAULT_MAX_TABLES,
+            max_keys=_env_number('TABLE_MAX_KEYS', int),
+            max_bytes=_env_number('TABLE_MAX_BYTES', int),
+            ttl_seconds=_env_number('TABLE_IDLE_TTL', float) or DEFAULT_IDLE_TTL,
+            spill_dir=os.environ.get('TABLE_SPILL_DIR') or None,
+        )
+    if kind == 'shm':
+        return SharedMemoryTableStore(os.environ.get('TABLE_STORE_DIR'))
+    if kind == 'redis':
+        url = os.environ.get('REDIS_URL')
+        if not url:
+            return RedisTableStore()
+        import redis
+        return RedisTableStore(redis.Redis.from_url(url))
+    raise ValueError(f"Unknown TABLE_STORE {kind!r} (expected memory, shm or redis)")
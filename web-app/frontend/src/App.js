@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useCallback, useRef, useState } from 'react';
 import axios from 'axios';
 import ControlPanel from './components/ControlPanel';
 import HashTableVisualization from './components/HashTableVisualization';
@@ -10,10 +10,34 @@ import './App.css';
 // API base URL - uses deployed backend API
 const API_URL = process.env.REACT_APP_API_URL || 'https://hashing-api.vercel.app/api';
 
+// The API sends buckets as parallel arrays ({index: [], type: [], contents: []});
+// expand them into one object per bucket, which is what the components render
+const expandBuckets = (columns) => columns.index.map((index, i) => ({
+  index,
+  type: columns.type[i],
+  contents: columns.contents[i],
+}));
+
+const expandPayload = (data) => {
+  [data, data?.state, data?.delta].forEach((part) => {
+    if (part && part.buckets && !Array.isArray(part.buckets)) {
+      part.buckets = expandBuckets(part.buckets);
+    }
+  });
+  return data;
+};
+
+axios.interceptors.response.use((response) => {
+  expandPayload(response.data);
+  return response;
+});
+
 function App() {
   const [tableId, setTableId] = useState(null);
   const [tableState, setTableState] = useState(null);
   const [pseudocode, setPseudocode] = useState([]);
+  // Pseudocode lines by "mode/operation", tagged with the version they were fetched at
+  const pseudocodeCache = useRef({});
   const [steps, setSteps] = useState([]);
   const [currentStep, setCurrentStep] = useState(0);
   const [highlightedBucket, setHighlightedBucket] = useState(null);
@@ -30,9 +54,75 @@ function App() {
     return 'info';
   };
 
+  // Merge a versioned delta from the API into the current table state.
+  // Responses carry either a full `state` or a `delta` against our version.
+  const resolveState = (data) => {
+    if (data.state || !data.delta) return data.state;
+    const delta = data.delta;
+    // Large tables only hold a window of buckets starting at bucket_offset
+    const offset = tableState.bucket_offset || 0;
+    const buckets = [...tableState.buckets];
+    delta.buckets.forEach((bucket) => {
+      const pos = bucket.index - offset;
+      if (pos >= 0 && pos < buckets.length) buckets[pos] = bucket;
+    });
+    return {
+      ...tableState,
+      buckets,
+      version: delta.version,
+      count: delta.count,
+      load_factor: delta.load_factor,
+      collisions: delta.collisions,
+    };
+  };
+
+  // Fetch the window of buckets the visualizer is showing (large tables only)
+  const loadBucketWindow = useCallback(async (offset, limit) => {
+    if (!tableId) return;
+    try {
+      const response = await axios.get(`${API_URL}/${tableId}/buckets`, { params: { offset, limit } });
+      setTableState((prev) => (prev && prev.version === response.data.version
+        ? { ...prev, bucket_offset: response.data.offset, buckets: response.data.buckets }
+        : prev));
+    } catch (error) {
+      console.error('Error loading buckets:', error);
+    }
+  }, [tableId]);
+
+  // Responses only reference pseudocode by version; fetch each version once
+  const loadPseudocode = async (ref) => {
+    if (!ref) {
+      setPseudocode([]);
+      return;
+    }
+    const name = `${ref.mode}/${ref.operation}`;
+    const cached = pseudocodeCache.current[name];
+    if (ref.lines) {
+      pseudocodeCache.current[name] = { version: ref.version, lines: ref.lines };
+      setPseudocode(ref.lines);
+      return;
+    }
+    if (cached && cached.version === ref.version) {
+      setPseudocode(cached.lines);
+      return;
+    }
+    try {
+      const response = await axios.get(`${API_URL}/pseudocode/${name}`);
+      pseudocodeCache.current[name] = { version: response.data.version, lines: response.data.pseudocode };
+      setPseudocode(response.data.pseudocode);
+    } catch (error) {
+      console.error('Error loading pseudocode:', error);
+      setPseudocode([]);
+    }
+  };
+
   const createTable = async (size, mode) => {
     try {
       const response = await axios.post(`${API_URL}/create`, { size, mode });
+      // Release the previous table on the server (best effort)
+      if (tableId) {
+        axios.delete(`${API_URL}/${tableId}`).catch(() => {});
+      }
       setTableId(response.data.table_id);
       setTableState(response.data.state);
       setStatusMessage(response.data.message);
@@ -51,20 +141,26 @@ function App() {
       return;
     }
 
+    if (tableState && tableState.buckets.length < tableState.size) {
+      streamOperation('insert', key);
+      return;
+    }
+
     try {
-      const response = await axios.post(`${API_URL}/${tableId}/insert`, { key });
+      const response = await axios.post(`${API_URL}/${tableId}/insert`, { key, version: tableState?.version });
+      const nextState = resolveState(response.data);
       
       // Set pseudocode first
-      setPseudocode(response.data.pseudocode || []);
+      loadPseudocode(response.data.pseudocode_ref);
       setSteps(response.data.steps || []);
       setCurrentStep(0);
       
       // Animate through steps if available
       if (response.data.steps && response.data.steps.length > 0) {
-        animateSteps(response.data.steps, response.data.state, response.data.message);
+        animateSteps(response.data.steps, nextState, response.data.message);
       } else {
         // No animation, just update state
-        setTableState(response.data.state);
+        setTableState(nextState);
         setStatusMessage(response.data.message);
       }
     } catch (error) {
@@ -73,26 +169,53 @@ function App() {
     }
   };
 
+  // Bulk insert: one /batch request instead of one POST per key, no animation
+  const insertKeys = async (keys) => {
+    if (!tableId) {
+      setStatusMessage('Please create a table first!');
+      return;
+    }
+
+    try {
+      const ops = keys.map((key) => ({ op: 'insert', key }));
+      const response = await axios.post(`${API_URL}/${tableId}/batch`, { ops, version: tableState?.version });
+      setTableState(resolveState(response.data));
+      setSteps([]);
+      setPseudocode([]);
+      setCurrentStep(0);
+      setStatusMessage(`Inserted ${response.data.applied} of ${keys.length} keys`);
+    } catch (error) {
+      console.error('Error inserting keys:', error);
+      setStatusMessage('Error: ' + (error.response?.data?.error || error.message));
+    }
+  };
+
   const searchKey = async (key) => {
     if (!tableId) {
       setStatusMessage('Please create a table first!');
       return;
     }
 
+    if (tableState && tableState.buckets.length < tableState.size) {
+      streamOperation('search', key);
+      return;
+    }
+
     try {
-      const response = await axios.post(`${API_URL}/${tableId}/search`, { key });
+      const response = await axios.post(`${API_URL}/${tableId}/search`, { key, version: tableState?.version });
+      const nextState = resolveState(response.data);
       
       // Set pseudocode and steps first
-      setPseudocode(response.data.pseudocode || []);
+      loadPseudocode(response.data.pseudocode_ref);
       setSteps(response.data.steps || []);
       setCurrentStep(0);
       
       // Animate through steps if available
       if (response.data.steps && response.data.steps.length > 0) {
-        animateSteps(response.data.steps, response.data.state, response.data.message);
+        animateSteps(response.data.steps, nextState, response.data.message);
       } else {
         // No animation, just update state
-        setTableState(response.data.state);
+        setTableState(nextState);
         setStatusMessage(response.data.message);
         
         if (response.data.found) {
@@ -112,20 +235,26 @@ function App() {
       return;
     }
 
+    if (tableState && tableState.buckets.length < tableState.size) {
+      streamOperation('delete', key);
+      return;
+    }
+
     try {
-      const response = await axios.post(`${API_URL}/${tableId}/delete`, { key });
+      const response = await axios.post(`${API_URL}/${tableId}/delete`, { key, version: tableState?.version });
+      const nextState = resolveState(response.data);
       
       // Set pseudocode and steps first
-      setPseudocode(response.data.pseudocode || []);
+      loadPseudocode(response.data.pseudocode_ref);
       setSteps(response.data.steps || []);
       setCurrentStep(0);
       
       // Animate through steps if available
       if (response.data.steps && response.data.steps.length > 0) {
-        animateSteps(response.data.steps, response.data.state, response.data.message);
+        animateSteps(response.data.steps, nextState, response.data.message);
       } else {
         // No animation, just update state
-        setTableState(response.data.state);
+        setTableState(nextState);
         setStatusMessage(response.data.message);
         
         if (response.data.success && response.data.index >= 0) {
@@ -173,7 +302,46 @@ function App() {
     }
   };
 
-  const animateSteps = (stepsList, finalState, finalMessage) => {
+  // Large tables: stream steps over Server-Sent Events so the animation can
+  // start while a long probe sequence is still being generated
+  const streamOperation = (operation, key) => {
+    const stream = { done: false, finalState: tableState, finalMessage: '' };
+    const stepsList = [];
+    // A fresh id per operation: an automatic EventSource reconnect replays
+    // the result instead of inserting or deleting the key again
+    const requestId = window.crypto?.randomUUID?.() || `${Date.now()}-${Math.random()}`;
+    const params = new URLSearchParams({ key, request_id: requestId });
+    if (tableState?.version !== undefined) params.set('version', tableState.version);
+
+    setSteps(stepsList);
+    setCurrentStep(0);
+    const events = new EventSource(`${API_URL}/${tableId}/${operation}/stream?${params}`);
+    events.addEventListener('pseudocode', (e) => loadPseudocode(JSON.parse(e.data)));
+    // Appended in place; the animation re-renders the panels as it advances
+    events.addEventListener('step', (e) => stepsList.push(JSON.parse(e.data)));
+    events.addEventListener('result', (e) => {
+      const data = expandPayload(JSON.parse(e.data));
+      events.close();
+      stream.finalState = resolveState(data);
+      stream.finalMessage = data.message;
+      stream.done = true;
+    });
+    // Fires both for a dropped connection and for the API's 'error' event
+    events.onerror = (e) => {
+      events.close();
+      if (!stream.done) {
+        stream.finalMessage = e.data
+          ? 'Error: ' + JSON.parse(e.data).error
+          : 'Error: step stream interrupted';
+        stream.done = true;
+      }
+    };
+    animateSteps(stepsList, null, null, stream);
+  };
+
+  // `stream` (optional) marks stepsList as still growing; its finalState and
+  // finalMessage are used once it is done
+  const animateSteps = (stepsList, finalState, finalMessage, stream = null) => {
     // Reset to beginning
     setCurrentStep(-1);
     setHighlightedBucket(null);
@@ -243,12 +411,15 @@ function App() {
         
         stepIndex++;
         setTimeout(animate, animationSpeed);
+      } else if (stream && !stream.done) {
+        // Caught up with the stream - wait for more steps
+        setTimeout(animate, 50);
       } else {
         // Animation complete - update final state
-        setTableState(finalState);
+        setTableState(stream ? stream.finalState : finalState);
         setHighlightedBucket(null);
         setBucketAnimationState({});
-        setStatusMessage(finalMessage || 'Operation completed');
+        setStatusMessage((stream ? stream.finalMessage : finalMessage) || 'Operation completed');
       }
     };
     
@@ -272,6 +443,7 @@ function App() {
         <ControlPanel
           onCreateTable={createTable}
           onInsertKey={insertKey}
+          onInsertKeys={insertKeys}
           onSearchKey={searchKey}
           onDeleteKey={deleteKey}
           onResizeTable={resizeTable}
@@ -290,6 +462,7 @@ function App() {
             tableState={tableState}
             highlightedBucket={highlightedBucket}
             bucketAnimationState={bucketAnimationState}
+            onRequestWindow={loadBucketWindow}
           />
           <PseudocodePanel
             pseudocode={pseudocode}
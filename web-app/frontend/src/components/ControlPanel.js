@@ -1,8 +1,12 @@
 import React, { useState } from 'react';
 
+// Must match MAX_TABLE_SIZE in web-app/api/index.py
+const MAX_TABLE_SIZE = 5000000;
+
 function ControlPanel({
   onCreateTable,
   onInsertKey,
+  onInsertKeys,
   onSearchKey,
   onDeleteKey,
   onResizeTable,
@@ -18,8 +22,8 @@ function ControlPanel({
 
   const handleCreateTable = () => {
     const sizeNum = parseInt(size);
-    if (isNaN(sizeNum) || sizeNum < 1 || sizeNum > 100) {
-      alert('Table size must be between 1 and 100');
+    if (isNaN(sizeNum) || sizeNum < 1 || sizeNum > MAX_TABLE_SIZE) {
+      alert(`Table size must be between 1 and ${MAX_TABLE_SIZE}`);
       return;
     }
     onCreateTable(sizeNum, mode);
@@ -31,8 +35,13 @@ function ControlPanel({
       return;
     }
     
-    // Insert single key
-    onInsertKey(keyInput.trim());
+    // Comma-separated keys go to the API in one batch request
+    const keys = keyInput.split(',').map((k) => k.trim()).filter(Boolean);
+    if (keys.length > 1 && onInsertKeys) {
+      onInsertKeys(keys);
+    } else {
+      onInsertKey(keyInput.trim());
+    }
     setKeyInput('');
   };
 
@@ -56,8 +65,8 @@ function ControlPanel({
 
   const handleResize = () => {
     const newSizeNum = parseInt(newSize);
-    if (isNaN(newSizeNum) || newSizeNum < 1 || newSizeNum > 100) {
-      alert('New size must be between 1 and 100');
+    if (isNaN(newSizeNum) || newSizeNum < 1 || newSizeNum > MAX_TABLE_SIZE) {
+      alert(`New size must be between 1 and ${MAX_TABLE_SIZE}`);
       return;
     }
     onResizeTable(newSizeNum);
@@ -69,7 +78,7 @@ function ControlPanel({
       <div className="flex flex-wrap items-center gap-1.5">
         <div className="flex items-center gap-0.5">
           <span className="text-gray-600 text-[10px]">Size</span>
-          <input type="number" value={size} onChange={(e)=>setSize(e.target.value)} min="1" max="100"
+          <input type="number" value={size} onChange={(e)=>setSize(e.target.value)} min="1" max={MAX_TABLE_SIZE}
             className="w-14 px-1 py-0.5 text-[10px] border border-gray-300 rounded" />
         </div>
         <div className="flex items-center gap-0.5">
@@ -86,7 +95,7 @@ function ControlPanel({
 
         <div className="flex items-center gap-1.5 ml-auto">
           <input type="text" value={keyInput} onChange={(e)=>setKeyInput(e.target.value)}
-            placeholder="enter key" onKeyPress={(e)=> e.key==='Enter' && handleInsertKey()}
+            placeholder="key or 1,2,3" onKeyPress={(e)=> e.key==='Enter' && handleInsertKey()}
             className="w-52 px-1.5 py-0.5 text-[10px] border border-gray-300 rounded" />
           <button onClick={handleInsertKey} className="bg-green-600 hover:bg-green-700 text-white text-[10px] font-semibold py-1 px-2 rounded">➕ Insert</button>
           <button onClick={handleSearchKey} className="bg-blue-600 hover:bg-blue-700 text-white text-[10px] font-semibold py-1 px-2 rounded">🔍 Search</button>
@@ -100,7 +109,7 @@ function ControlPanel({
             onChange={(e)=>setAnimationSpeed(parseInt(e.target.value))} className="w-28" />
         </div>
         <div className="flex items-center gap-0.5">
-          <input type="number" value={newSize} onChange={(e)=>setNewSize(e.target.value)} min="1" max="100"
+          <input type="number" value={newSize} onChange={(e)=>setNewSize(e.target.value)} min="1" max={MAX_TABLE_SIZE}
             placeholder="New" className="w-14 px-1 py-0.5 text-[10px] border border-gray-300 rounded" />
           <button onClick={handleResize} className="bg-purple-600 hover:bg-purple-700 text-white text-[10px] font-semibold py-1 px-2 rounded">Resize</button>
         </div>
@@ -1,21 +1,91 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 
-function HashTableVisualization({ tableState, highlightedBucket, bucketAnimationState = {} }) {
+// Large tables only ship a window of buckets; the list below scrolls over a
+// virtual range and asks the API for the rows that come into view. Fully
+// loaded tables with too many rows to fit on screen scroll the same way.
+const PAGED_ROW_HEIGHT = 22;
+const PAGE_SIZE = 200;
+// Browsers cap element height (~33M px); beyond this the scrollbar maps
+// proportionally onto the bucket range instead of one row per 22px.
+const MAX_SCROLL_PX = 8000000;
+// Smallest row the fitted (non-scrolling) list may shrink to; tables whose
+// rows would have to be smaller use the virtual list instead.
+const MIN_ROW_HEIGHT = 8;
+
+// Height left for the fitted bucket list in the current window
+function fittedListHeight() {
+  // Reserve vertical space for header, control bar, toast, margins
+  const reserved = 240; // px, approximate total outside this list
+  const available = Math.max(200, window.innerHeight - reserved);
+  // Panel header inside this component ~34px
+  return Math.max(120, available - 34);
+}
+
+// Row height that fits n buckets without scrolling (minus the gap per row)
+function fittedRowHeight(n) {
+  return Math.floor(fittedListHeight() / Math.max(1, n)) - 1;
+}
+
+function HashTableVisualization({ tableState, highlightedBucket, bucketAnimationState = {}, onRequestWindow }) {
   // Calculate row height dynamically so the entire list fits without scrolling
   const [rowHeight, setRowHeight] = useState(18);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewportHeight, setViewportHeight] = useState(400);
+  const listRef = useRef(null);
   const n = tableState?.size || 10;
+  const offset = tableState?.bucket_offset || 0;
+  const loaded = tableState?.buckets?.length || 0;
+  const paged = !!tableState && loaded < tableState.size;
+  // Every bucket is loaded but too many to fit: scroll them virtually too
+  const [fits, setFits] = useState(() => fittedRowHeight(n) >= MIN_ROW_HEIGHT);
+  const virtual = paged || !fits;
+
+  // Virtual scroll geometry
+  const visibleRows = Math.ceil(viewportHeight / PAGED_ROW_HEIGHT) + 1;
+  const virtualHeight = Math.min(n * PAGED_ROW_HEIGHT, MAX_SCROLL_PX);
+  const maxScroll = Math.max(1, virtualHeight - viewportHeight);
+  const maxFirst = Math.max(0, n - visibleRows);
+  const firstIndex = Math.min(maxFirst, Math.round((scrollTop / maxScroll) * maxFirst));
+
+  const scrollToBucket = (index) => {
+    if (!listRef.current) return;
+    listRef.current.scrollTop = (Math.min(index, maxFirst) / Math.max(1, maxFirst)) * maxScroll;
+  };
+
+  // Request the visible window once it falls outside the loaded buckets
+  useEffect(() => {
+    if (!virtual || !onRequestWindow) return undefined;
+    const lastIndex = Math.min(n, firstIndex + visibleRows);
+    if (firstIndex >= offset && lastIndex <= offset + loaded) return undefined;
+    const timer = setTimeout(() => {
+      onRequestWindow(Math.max(0, firstIndex - Math.floor(PAGE_SIZE / 4)), PAGE_SIZE);
+    }, 120);
+    return () => clearTimeout(timer);
+  }, [virtual, firstIndex, visibleRows, offset, loaded, n, onRequestWindow]);
+
+  // Follow the animated bucket when it is off screen
+  useEffect(() => {
+    if (!virtual || highlightedBucket === null || highlightedBucket === undefined) return;
+    if (highlightedBucket < firstIndex || highlightedBucket >= firstIndex + visibleRows - 1) {
+      scrollToBucket(Math.max(0, highlightedBucket - Math.floor(visibleRows / 2)));
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [highlightedBucket, virtual]);
+
+  useEffect(() => {
+    if (!virtual || !listRef.current) return undefined;
+    const measure = () => setViewportHeight(listRef.current.clientHeight || 400);
+    measure();
+    window.addEventListener('resize', measure);
+    return () => window.removeEventListener('resize', measure);
+  }, [virtual]);
 
   useEffect(() => {
     const compute = () => {
-      // Reserve vertical space for header, control bar, toast, margins
-      const reserved = 240; // px, approximate total outside this list
-      const available = Math.max(200, window.innerHeight - reserved);
-      // Panel header inside this component ~34px
-      const listAvail = Math.max(120, available - 34);
-      const per = Math.floor(listAvail / Math.max(1, n)) - 1; // minus gap
-      // Clamp between 8 and 36px to fit up to 100 buckets
-      const rh = Math.max(8, Math.min(36, per));
-      setRowHeight(rh);
+      const per = fittedRowHeight(n);
+      // Clamp between 8 and 36px; below 8px the virtual list takes over
+      setFits(per >= MIN_ROW_HEIGHT);
+      setRowHeight(Math.max(MIN_ROW_HEIGHT, Math.min(36, per)));
     };
     compute();
     window.addEventListener('resize', compute);
@@ -109,6 +179,81 @@ function HashTableVisualization({ tableState, highlightedBucket, bucketAnimation
     );
   };
 
+  const renderRow = (bucket, index, height) => (
+    <div
+      key={index}
+      className="flex items-center gap-1.5 mb-0.5"
+      style={{ minHeight: `${height}px`, height: `${height}px` }}
+    >
+      {/* Index label */}
+      <div className={`flex-shrink-0 ${virtual ? 'w-16' : 'w-8'} text-right`}>
+        <span className={`${height <= 12 ? 'text-[8px]' : 'text-[10px]'} font-bold text-purple-700`}>[{index}]</span>
+      </div>
+      
+      {/* Arrow */}
+      <div className={`flex-shrink-0 text-gray-400 ${height <= 12 ? 'text-[8px]' : 'text-xs'}`}>→</div>
+      
+      {/* Bucket box */}
+      <div
+        className={`flex-1 flex items-center px-1.5 rounded border-2 transition-all ${bucket ? getBucketColor(bucket, index) : 'bg-gray-50 border-gray-200'}`}
+        style={{ minHeight: `${height}px`, height: `${height}px` }}
+      >
+        <div className={`${height <= 12 ? 'text-[8px]' : ''} w-full flex items-center`}>
+          {bucket ? renderBucketContents(bucket) : <span className="text-gray-300 text-[10px] font-mono">…</span>}
+        </div>
+      </div>
+    </div>
+  );
+
+  if (virtual) {
+    const rows = [];
+    for (let i = firstIndex; i < Math.min(n, firstIndex + visibleRows); i++) {
+      const pos = i - offset;
+      rows.push(renderRow(pos >= 0 && pos < loaded ? tableState.buckets[pos] : null, i, PAGED_ROW_HEIGHT));
+    }
+    const summary = tableState.summary || [];
+    return (
+      <div className="bg-white rounded-lg shadow-2xl p-2 h-full flex flex-col">
+        <div className="flex items-center justify-between mb-1 pb-1 border-b border-gray-200">
+          <h2 className="text-xs font-bold text-gray-800">{getModeIcon()} Hash Table</h2>
+          <div className="text-[9px] text-gray-600">
+            Size: {tableState.size} | Load: {tableState.load_factor.toFixed(2)} | Count: {tableState.count}
+          </div>
+        </div>
+
+        {/* Occupancy per bucket range - click to jump */}
+        {summary.length > 0 && (
+          <div className="flex h-3 mb-1 rounded overflow-hidden border border-gray-200">
+            {summary.map((range) => {
+              const fill = range.keys / Math.max(1, range.end - range.start);
+              return (
+                <div
+                  key={range.start}
+                  className="flex-1 cursor-pointer bg-blue-500"
+                  style={{ opacity: 0.1 + 0.9 * Math.min(1, fill) }}
+                  title={`[${range.start}, ${range.end}): ${range.keys} keys, ${range.tombstones} tombstones`}
+                  onClick={() => scrollToBucket(range.start)}
+                />
+              );
+            })}
+          </div>
+        )}
+
+        <div
+          ref={listRef}
+          className="flex-1 overflow-y-auto relative"
+          style={{ height: 'calc(100vh - 260px)' }}
+          onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+        >
+          <div style={{ height: `${virtualHeight}px` }} />
+          <div className="absolute left-0 right-0 pr-1" style={{ top: `${scrollTop}px` }}>
+            {rows}
+          </div>
+        </div>
+      </div>
+    );
+  }
+
   return (
     <div className="bg-white rounded-lg shadow-2xl p-2 h-full flex flex-col">
       <div className="flex items-center justify-between mb-1 pb-1 border-b border-gray-200">
@@ -121,29 +266,7 @@ function HashTableVisualization({ tableState, highlightedBucket, bucketAnimation
       {/* Vertical list of all buckets - fits without scrollbar */}
       <div className="flex-1 overflow-hidden" style={{ height: 'calc(100vh - 240px)' }}>
         <div className="pr-1">
-          {tableState.buckets.map((bucket) => (
-            <div
-              key={bucket.index}
-              className="flex items-center gap-1.5 mb-0.5"
-              style={{ minHeight: `${rowHeight}px`, height: `${rowHeight}px` }}
-            >
-              {/* Index label */}
-              <div className="flex-shrink-0 w-8 text-right">
-                <span className={`${rowHeight <= 12 ? 'text-[8px]' : 'text-[10px]'} font-bold text-purple-700`}>[{bucket.index}]</span>
-              </div>
-              
-              {/* Arrow */}
-              <div className={`flex-shrink-0 text-gray-400 ${rowHeight <= 12 ? 'text-[8px]' : 'text-xs'}`}>→</div>
-              
-              {/* Bucket box */}
-              <div
-                className={`flex-1 flex items-center px-1.5 rounded border-2 transition-all ${getBucketColor(bucket, bucket.index)}`}
-                style={{ minHeight: `${rowHeight}px`, height: `${rowHeight}px` }}
-              >
-                <div className={`${rowHeight <= 12 ? 'text-[8px]' : ''} w-full flex items-center`}>{renderBucketContents(bucket)}</div>
-              </div>
-            </div>
-          ))}
+          {tableState.buckets.map((bucket) => renderRow(bucket, bucket.index, rowHeight))}
         </div>
       </div>
     </div>